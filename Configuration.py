@@ -6,10 +6,13 @@ class Configuration(BaseConfiguration):
     hiveCommunityId: str = 'hive-174695'
     exceptAuthors: list = ['shaka', 'agmoore', 'mballesteros', 'quantumg', 'lilybee', 'lmac', 'detlev']
     ignorePostsCommentedBy: list = ['lmac', 'lilybee']
-    delayBetweenSendingHiveComments: float = 5.0  # Seconds
-    delayBetweenMutingHiveComments: float = 5.0  # Seconds
-    hiveApiUrl: str = 'https://api.deathwing.me'
+    delayBetweenSendingHiveComments: float = 3.0  # Seconds, Hive allows one comment per account every three seconds
+    delayBetweenMutingHiveComments: float = 3.0  # Seconds between mute transactions
+    maxMutesPerTransaction: int = 5
+    hiveOutboxPath: str = 'hiveOutbox.jsonl'  # Journal of replies and mutes that were not confirmed yet
+    hiveApiUrls: list = ['https://api.deathwing.me', 'https://api.hive.blog', 'https://api.openhive.network', 'https://anyx.io']
     hiveUser: str = 'lilybee'
+    hivePostEnrichmentWorkers: int = 8  # Parallel RPC calls while loading replies, votes and metadata of new posts
 
     sourceBlacklistAgentRules: dict = {
         'blacklist': [
@@ -46,8 +49,41 @@ class Configuration(BaseConfiguration):
     suspectHunterAgentRules: dict = {
         'downvoterIndicators': ['spaminator', 'theycallmedan', 'shaka', 'mballesteros', 'agmoore', 'quantumg']}
 
-    agentSupervisorSettings: dict = {'hiveCommunityId': 'hive-174695', 'hiveCommunityTags': ['letsmakeacollage', 'lmac', 'lil', 'hive-174695']}
+    # 'discussions' polls the newest posts per tag, 'blockStream' follows irreversible blocks.
+    hiveIngestionSettings: dict = {
+        'mode': 'discussions',
+        'minimumPostAgeInSeconds': 3600,
+        'blocksPerRequest': 50,
+        'maxBlocksPerCycle': 2400
+    }
+
+    # Report-only evaluation of past posts with main.py --backfill FROM TO. Every worker process holds its own Hive session.
+    backfillSettings: dict = {
+        'workers': 4,
+        'blocksPerSlice': 1200,
+        'reportPath': 'backfillReport.json'
+    }
+
+    # 'sqlite' upserts changed keys into a WAL database and migrates registry.json on first start, 'json' rewrites registry.json atomically.
+    registrySettings: dict = {
+        'backend': 'sqlite',
+        'path': 'registry.sqlite',
+        'legacyJsonPath': 'registry.json'
+    }
+
+    # Votes and replies of posts that are not paid out yet are re-fetched once they are older than the ttl.
+    postCacheSettings: dict = {
+        'path': 'postCache.sqlite',
+        'volatileTtlInSeconds': 1800
+    }
 
+    agentSupervisorSettings: dict = {
+        'hiveCommunityId': 'hive-174695',
+        'hiveCommunityTags': ['letsmakeacollage', 'lmac', 'lil', 'hive-174695'],
+        'evaluationWorkers': 8
+    }
+
+    # A level may add a 'discordWebhookUrl' to post through a channel webhook instead of the bot.
     violationReporterSettings: dict = {'settingsByLevel': {
         SuspiciousActivityLevel.WARNING: {'discordTargetChatroom': 0},
         SuspiciousActivityLevel.VIOLATION: {'discordTargetChatroom': 0},
@@ -63,6 +99,27 @@ class Configuration(BaseConfiguration):
         'sourceUrl': ''
     }
 
+    # Cycle summaries as JSON and Prometheus text. A port above zero also serves /metrics and /summary in daemon mode.
+    metricsSettings: dict = {
+        'jsonPath': 'metrics.json',
+        'prometheusPath': 'metrics.prom',
+        'port': 0
+    }
+
+    daemonSettings: dict = {
+        'cycleIntervalInSeconds': 900,
+        'cycleJitterInSeconds': 60,
+        'shutdownTimeoutInSeconds': 120,
+        # A failed cycle waits at least this long before the next one, doubled per consecutive failure up to the maximum.
+        'failureBackoffInSeconds': 30,
+        'maxFailureBackoffInSeconds': 3600
+    }
+
+    # 'rest' posts through the HTTP API without a gateway login, 'gateway' keeps a logged in discord.Client.
+    discordDeliverySettings: dict = {
+        'delivery': 'rest',
+        'apiBaseUrl': 'https://discord.com/api/v10'
+    }
     dispatcherDiscordNotificationChannel: int = 0
     blacklistedUserReportDiscordChannel: int = 0
 
@@ -16,5 +16,7 @@ class PolicyActionSupervisor:
         for suggestedAction in self._suggestedActions:
             suggestedAction.onActionRequest()
 
+        self._suggestedActions = []
+
     def suggestAction(self, action: PolicyAction):
         self._suggestedActions.append(action)
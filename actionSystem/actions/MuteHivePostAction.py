@@ -1,18 +1,20 @@
 from abc import ABC
 
 from actionSystem.ActionHandling import PolicyAction
-from services.HiveNetwork import HiveHandler, HiveComment
+from services.HiveNetwork import HiveHandler, HivePost
 
 
 class MuteHivePostAction(PolicyAction, ABC):
     _hiveHandler: HiveHandler
-    _post: HiveComment
+    _author: str
+    _permlink: str
     _reason: str
 
-    def __init__(self, post: HiveComment, reason: str):
+    def __init__(self, post: HivePost, reason: str):
         self._hiveHandler = HiveHandler()
-        self._post = post
+        self._author = post.author
+        self._permlink = post.permlink
         self._reason = reason
 
     def onActionRequest(self):
-        self._hiveHandler.enqueuePostToMuteInCommunity(self._post, self._reason)
\ No newline at end of file
+        self._hiveHandler.enqueuePostToMuteInCommunity(self._author, self._permlink, self._reason)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import argparse
+import json
+
+from benchmarkSystem import PipelineBenchmark
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.description = 'Runs the agent pipeline offline over synthetic or recorded posts and reports throughput, agent latencies and peak memory.'
+    parser.add_argument(
+        '-sizes', '--sizes',
+        type=str,
+        help='Comma separated numbers of posts to evaluate.',
+        required=False,
+        default='1000,10000,100000'
+    )
+    parser.add_argument(
+        '-fixture', '--fixture',
+        type=str,
+        help='Fixture recorded with main.py -recordRpc. Synthetic posts are generated without it.',
+        required=False
+    )
+    parser.add_argument(
+        '-workers', '--workers',
+        type=int,
+        help='Evaluation workers of the AgentSupervisor.',
+        required=False,
+        default=8
+    )
+    parser.add_argument(
+        '-seed', '--seed',
+        type=int,
+        help='Seed of the synthetic posts.',
+        required=False,
+        default=42
+    )
+    parser.add_argument(
+        '-json', '--json',
+        action='store_true',
+        help='Prints the results as JSON, e.g. to compare them against a baseline before deploying rule changes.'
+    )
+    args = parser.parse_args()
+
+    results = PipelineBenchmark.runAll([int(size) for size in args.sizes.split(',')], args.fixture, args.workers, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=4))
+    else:
+        for result in results:
+            print('{posts} posts: {seconds}s, {postsPerSecond} posts/s, peak memory {peakMemoryMb} MB'.format(**result))
+            for agentId, latencies in result['agents'].items():
+                print('    {agentId}: p50={p50Ms}ms p95={p95Ms}ms p99={p99Ms}ms'.format(agentId=agentId, **latencies))
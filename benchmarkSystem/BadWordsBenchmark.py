@@ -0,0 +1,87 @@
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from services.WordMatching import AhoCorasickMatcher
+
+try:
+    import nltk
+except ImportError:
+    nltk = None
+
+WORD_REGEX = re.compile(r"\w+|[^\w\s]")
+VOCABULARY = ['collage', 'round', 'image', 'contest', 'layers', 'hive', 'community', 'pixabay', 'source', 'thanks',
+              'colour', 'frame', 'background', 'gimp', 'photoshop', 'texture', 'blend', 'mask', 'nice', 'great']
+
+
+def _tokenize(text: str) -> List[str]:
+    # nltk.word_tokenize needs the punkt data; the regex tokenizer is a close stand-in when it is missing.
+    if nltk is not None:
+        try:
+            return nltk.word_tokenize(text)
+        except LookupError:
+            pass
+
+    return WORD_REGEX.findall(text)
+
+
+def _legacyFindBadWords(text: str, badWords: List[str]) -> List[str]:
+    words = _tokenize(text.lower())
+    return [badWord for badWord in badWords if badWord in words]
+
+
+def _createTerms(count: int, seed: int) -> List[str]:
+    randomizer = random.Random(seed)
+    terms = []
+    for index in range(count):
+        term = ''.join(randomizer.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(randomizer.randint(4, 10)))
+        terms.append(term if index % 10 else term + ' ' + randomizer.choice(VOCABULARY))
+
+    return terms
+
+
+def _createBody(terms: List[str], words: int, seed: int) -> str:
+    randomizer = random.Random(seed)
+    tokens = []
+    for _ in range(words):
+        tokens.append(randomizer.choice(terms) if randomizer.random() < 0.002 else randomizer.choice(VOCABULARY))
+
+    return ' '.join(tokens)
+
+
+def _measure(callback: Callable[[], List[str]]) -> float:
+    startTime = time.perf_counter()
+    callback()
+    return time.perf_counter() - startTime
+
+
+def run(termCounts: List[int], words: int) -> List[dict]:
+    results = []
+    for termCount in termCounts:
+        terms = _createTerms(termCount, termCount)
+        body = _createBody(terms, words, termCount)
+
+        startTime = time.perf_counter()
+        matcher = AhoCorasickMatcher(terms)
+        buildDuration = time.perf_counter() - startTime
+
+        results.append({
+            'terms': termCount,
+            'legacyMs': round(_measure(lambda: _legacyFindBadWords(body, terms)) * 1000, 1),
+            'automatonMs': round(_measure(lambda: matcher.findTerms(body)) * 1000, 1),
+            'buildMs': round(buildDuration * 1000, 1)
+        })
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.description = 'Compares the token list bad words lookup with the Aho-Corasick matcher.'
+    parser.add_argument('-words', type=int, help='Number of words in the synthetic post body.', required=False, default=5000)
+    args = parser.parse_args()
+
+    for result in run([16, 100, 1000, 5000], args.words):
+        print('{terms} terms: legacy={legacyMs}ms automaton={automatonMs}ms (build {buildMs}ms)'.format(**result))
@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.Discord import DiscordMessage
+from services.DiscordDelivery import DiscordDeliveryEngine, RestDiscordSender
+
+LEGACY_SECONDS_PER_MESSAGE: float = 5.0
+
+
+class _FakeDiscordApi(BaseHTTPRequestHandler):
+    # Mimics the per-channel message bucket of Discord: a few requests per window, 429 with retry_after beyond.
+    bucketSize: int = 5
+    bucketWindowInSeconds: float = 1.0
+    buckets: dict = {}
+    deliveredMessages: list = []
+    lock: threading.Lock = threading.Lock()
+
+    def do_POST(self):
+        channelId = self.path.split('/')[2]
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+
+        with _FakeDiscordApi.lock:
+            now = time.monotonic()
+            remaining, resetAt = _FakeDiscordApi.buckets.get(channelId, (_FakeDiscordApi.bucketSize, now + _FakeDiscordApi.bucketWindowInSeconds))
+            if now >= resetAt:
+                remaining, resetAt = _FakeDiscordApi.bucketSize, now + _FakeDiscordApi.bucketWindowInSeconds
+
+            if remaining <= 0:
+                self._respond(429, {'retry_after': resetAt - now, 'global': False}, 0, resetAt - now)
+                return
+
+            remaining -= 1
+            _FakeDiscordApi.buckets[channelId] = (remaining, resetAt)
+            _FakeDiscordApi.deliveredMessages.append((channelId, payload['content']))
+
+        self._respond(200, {'id': str(len(_FakeDiscordApi.deliveredMessages))}, remaining, resetAt - now)
+
+    def _respond(self, status: int, body: dict, remaining: int, resetAfter: float):
+        encodedBody = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encodedBody)))
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Reset-After', '{:.3f}'.format(resetAfter))
+        self.end_headers()
+        self.wfile.write(encodedBody)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(messages: int, channels: int) -> dict:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FakeDiscordApi)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    queuedMessages = [
+        DiscordMessage('Curatable post {index}\nhttps://peakd.com/@author{index}/post-{index}\n---'.format(index=index), index % channels)
+        for index in range(messages)
+    ]
+    engine = DiscordDeliveryEngine(RestDiscordSender('benchmarkToken', 'http://127.0.0.1:{port}'.format(port=server.server_port)))
+
+    startTime = time.perf_counter()
+    undelivered = asyncio.run(engine.deliver(queuedMessages))
+    duration = time.perf_counter() - startTime
+    server.shutdown()
+
+    return {
+        'messages': messages,
+        'channels': channels,
+        'requests': len(_FakeDiscordApi.deliveredMessages),
+        'undelivered': len(undelivered),
+        'legacySeconds': messages * LEGACY_SECONDS_PER_MESSAGE,
+        'engineSeconds': round(duration, 2)
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.description = 'Delivers queued notifications to a local fake Discord API and compares with the one-per-tick loop.'
+    parser.add_argument('-messages', type=int, help='Number of queued messages.', required=False, default=60)
+    parser.add_argument('-channels', type=int, help='Number of target channels.', required=False, default=3)
+    args = parser.parse_args()
+
+    print('{messages} messages to {channels} channels: {requests} requests, {undelivered} undelivered, '
+          'legacy={legacySeconds}s engine={engineSeconds}s'.format(**run(args.messages, args.channels)))
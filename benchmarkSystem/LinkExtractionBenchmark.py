@@ -0,0 +1,64 @@
+import argparse
+import re
+import time
+from typing import Callable, Dict, List
+
+from services.LinkExtraction import HiveLinkExtractor
+
+LEGACY_URL_REGEX = re.compile(r'((https?):((//)|(\\\\))+([\w\d:#@%/;$()~_?\+-=\\\.&](#!)?)*)', re.DOTALL)
+LEGACY_LIL_REGEX = re.compile(r'https\:\/\/(?:www\.)?lmac\.gallery\/lil-gallery-image\/\d+', re.DOTALL)
+LEGACY_CONTEST_REGEX = re.compile(r'(https:\/\/[a-zA-Z0-9_\-\.]+)?\/[a-zA-Z0-9_\-\.\/]*@(shaka|lmac)\/[a-zA-Z0-9_\-\.\/]*')
+
+
+def _legacyScan(text: str):
+    # The three separate scans the agents performed before the shared extractor.
+    LEGACY_URL_REGEX.findall(text)
+    LEGACY_LIL_REGEX.findall(text)
+    LEGACY_CONTEST_REGEX.findall(text)
+
+
+def _extractorScan(text: str):
+    HiveLinkExtractor.extract(text)
+
+
+def _createBodies(size: int) -> Dict[str, str]:
+    return {
+        'regularPost': ('![collage](https://files.peakd.com/file/a/b.jpg) Made for '
+                        'https://peakd.com/hive-174695/@shaka/lmac-round-5 using https://pixabay.com/photos/x-123/\n') * (size // 150 + 1),
+        'longUrlRun': 'https://' + 'a/#' * (size // 3),
+        'slashRun': 'https:' + '/' * size,
+        'pathRun': '/' + 'a.' * (size // 2) + '@',
+        'repeatedSchemes': 'http:/' * (size // 6),
+        'parenthesesRun': 'https://x.com/' + ')' * size
+    }
+
+
+def _measure(scan: Callable[[str], None], text: str) -> float:
+    startTime = time.perf_counter()
+    scan(text)
+    return time.perf_counter() - startTime
+
+
+def run(sizes: List[int]) -> List[dict]:
+    results = []
+    for size in sizes:
+        for name, body in _createBodies(size).items():
+            results.append({
+                'body': name,
+                'size': len(body),
+                'legacyMs': round(_measure(_legacyScan, body) * 1000, 2),
+                'extractorMs': round(_measure(_extractorScan, body) * 1000, 2)
+            })
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.description = 'Measures the legacy per-agent link regexes against the shared link extractor on adversarial bodies.'
+    parser.add_argument('-maxSize', type=int, help='Largest body size in characters.', required=False, default=40000)
+    args = parser.parse_args()
+
+    sizes = [size for size in (5000, 10000, 20000, 40000, 80000) if size <= args.maxSize]
+    for result in run(sizes):
+        print('{body} ({size} chars): legacy={legacyMs}ms extractor={extractorMs}ms'.format(**result))
@@ -0,0 +1,108 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+
+from services.HiveNodePool import HiveNodePool, NodePoolHiveRpcTransport
+from services.HiveRpcBatcher import HttpHiveRpcTransport, HiveRpcTransport
+
+
+class FakeHiveNode:
+    _server: ThreadingHTTPServer
+    _thread: threading.Thread
+
+    def __init__(self, delayInSeconds: float, failureRate: float):
+        delay = delayInSeconds
+        failures = failureRate
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                time.sleep(delay)
+                if random.random() < failures:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+
+                body = json.dumps([{'jsonrpc': '2.0', 'id': call['id'], 'result': []} for call in payload]).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        return 'http://127.0.0.1:{port}'.format(port=self._server.server_address[1])
+
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _measure(transport: HiveRpcTransport, calls: int) -> Tuple[List[float], int]:
+    latencies = []
+    errors = 0
+    payload = [{'jsonrpc': '2.0', 'id': 1, 'method': 'condenser_api.get_active_votes', 'params': ['a', 'b']}]
+    for _ in range(calls):
+        startTime = time.perf_counter()
+        try:
+            transport.send(payload)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - startTime)
+
+    return latencies, errors
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    orderedValues = sorted(values)
+    index = min(len(orderedValues) - 1, int(round(percentile / 100.0 * (len(orderedValues) - 1))))
+    return orderedValues[index]
+
+
+def run(calls: int) -> dict:
+    # The first node mimics the configured default node being slow and flaky.
+    fakeNodes = [
+        FakeHiveNode(0.15, 0.2),
+        FakeHiveNode(0.08, 0.0),
+        FakeHiveNode(0.01, 0.05),
+        FakeHiveNode(0.03, 0.0)
+    ]
+
+    try:
+        results = {}
+        for name, transport in (
+                ('singleNode', HttpHiveRpcTransport(fakeNodes[0].url, timeout=5.0)),
+                ('nodePool', NodePoolHiveRpcTransport(HiveNodePool([node.url for node in fakeNodes]), timeout=5.0))):
+            latencies, errors = _measure(transport, calls)
+            results[name] = {
+                'p50': round(_percentile(latencies, 50) * 1000, 2),
+                'p95': round(_percentile(latencies, 95) * 1000, 2),
+                'errors': errors
+            }
+    finally:
+        for node in fakeNodes:
+            node.shutdown()
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.description = 'Compares a single Hive node against the latency-aware node pool using local fake nodes.'
+    parser.add_argument('-calls', type=int, help='Number of RPC calls per transport.', required=False, default=200)
+    args = parser.parse_args()
+
+    for transportName, stats in run(args.calls).items():
+        print('{name}: p50={p50}ms p95={p95}ms errors={errors}'.format(name=transportName, **stats))
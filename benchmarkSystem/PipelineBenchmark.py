@@ -0,0 +1,231 @@
+import datetime
+import json
+import random
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from Configuration import Configuration
+from actionSystem.ActionHandling import PolicyActionSupervisor
+from monitoringSystem.MonitoringAgency import AgentSupervisor
+from monitoringSystem.agents import LMACBeneficiaryAgent, SourceBlacklistAgent, SuspectHunterAgent, \
+    LILBeneficiaryAgent, LILNoLILTableAgent, BadWordsAgent, ContestLinkAgent
+from reportingSystem.Reporting import ReportDispatcher
+from services.HiveNetwork import HivePost
+from services.HiveRpcBatcher import HiveRpcBatcher
+from services.Registry import RegistryHandler
+from services.RpcRecording import ReplayHiveRpcTransport
+
+# Everything that runs without network access. The curation agent needs the remote blacklist and is left out.
+BENCHMARK_AGENTS: dict = {
+    LMACBeneficiaryAgent.LMACBeneficiaryAgent: Configuration.lmacBeneficiaryAgentRules,
+    LILBeneficiaryAgent.LILBeneficiaryAgent: Configuration.lilBeneficiaryAgentRules,
+    SourceBlacklistAgent.SourceBlacklistAgent: Configuration.sourceBlacklistAgentRules,
+    SuspectHunterAgent.SuspectHunterAgent: Configuration.suspectHunterAgentRules,
+    BadWordsAgent.BadWordsAgent: Configuration.badWordsAgentRules,
+    ContestLinkAgent.ContestLinkAgent: Configuration.contestLinkAgentRules,
+    LILNoLILTableAgent.LILNoLILTableAgent: {}
+}
+
+SOURCES = ['https://pixabay.com/photos/{id}/', 'https://unsplash.com/photos/{id}', 'https://files.peakd.com/file/peakd-hive/{id}.jpg',
+           'https://pxhere.com/en/photo/{id}', 'https://www.canva.com/photos/{id}/', 'https://lmac.gallery/lil-gallery-image/{id}']
+TITLES = ['My collage for LMAC round {id}', 'LIL: image number {id}', 'Tutorial: blending layers #{id}', 'Sunday walk {id}']
+VOTERS = ['lmac', 'shaka', 'spaminator', 'theycallmedan', 'quantumg', 'curator', 'friend', 'reader']
+
+
+class PipelineBenchmarkPost:
+    _postJson: dict
+    _activeVotes: list
+    _replyAuthors: list
+
+    def __init__(self, postJson: dict, activeVotes: list, replyAuthors: list):
+        self._postJson = postJson
+        self._activeVotes = activeVotes
+        self._replyAuthors = replyAuthors
+
+    @property
+    def postJson(self) -> dict:
+        return self._postJson
+
+    def createHivePost(self, suffix: str) -> HivePost:
+        postJson = dict(self._postJson)
+        postJson['permlink'] = postJson['permlink'] + suffix
+
+        return HivePost.fromJson(postJson).withPrefetchedData(self._activeVotes, self._replyAuthors)
+
+
+def createSyntheticPosts(count: int, seed: int) -> List[PipelineBenchmarkPost]:
+    randomizer = random.Random(seed)
+    created = datetime.datetime(2022, 1, 1)
+    posts = []
+    for index in range(count):
+        title = randomizer.choice(TITLES).format(id=index)
+        lines = ["Let's make a collage round {round}".format(round=index % 200), '## Sources']
+        for _ in range(randomizer.randint(3, 20)):
+            lines.append('![source]({url})'.format(url=randomizer.choice(SOURCES).format(id=randomizer.randint(1, 10 ** 6))))
+            lines.append('Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * randomizer.randint(1, 6))
+        if randomizer.random() < 0.5:
+            lines.append('Contest: https://peakd.com/hive-174695/@shaka/lmac-round-{round}'.format(round=index % 200))
+        if title.startswith('LIL') and randomizer.random() < 0.7:
+            lines.append('<table class="lil"><tr><td>LIL</td></tr></table>')
+        if randomizer.random() < 0.02:
+            lines.append('what a scumbag move')
+
+        beneficiaries = []
+        if randomizer.random() < 0.8:
+            beneficiaries.append({'account': 'lmac', 'weight': randomizer.choice([1000, 2000, 2500])})
+        if randomizer.random() < 0.3:
+            beneficiaries.append({'account': 'lilybee', 'weight': 200})
+
+        posts.append(PipelineBenchmarkPost(
+            {
+                'author': 'author{index}'.format(index=index % 5000),
+                'permlink': 'synthetic-post-{index}'.format(index=index),
+                'category': 'hive-174695',
+                'parent_author': '',
+                'parent_permlink': 'hive-174695',
+                'depth': 0,
+                'title': title,
+                'body': '\n'.join(lines),
+                'json_metadata': json.dumps({'tags': randomizer.sample(['letsmakeacollage', 'lmac', 'lil', 'art', 'lmacschool'], 3)}),
+                'beneficiaries': beneficiaries,
+                'created': (created + datetime.timedelta(minutes=index)).strftime('%Y-%m-%dT%H:%M:%S'),
+                'last_update': (created + datetime.timedelta(minutes=index)).strftime('%Y-%m-%dT%H:%M:%S'),
+                'cashout_time': '1969-12-31T23:59:59'
+            },
+            [{'voter': voter, 'rshares': randomizer.choice([-1, 1]) * randomizer.randint(1, 10 ** 9)}
+             for voter in randomizer.sample(VOTERS, randomizer.randint(0, len(VOTERS)))],
+            []
+        ))
+
+    return posts
+
+
+def loadRecordedPosts(fixturePath: str) -> List[PipelineBenchmarkPost]:
+    # Root posts are taken from any recorded response, votes and replies are replayed like the HiveHandler loads them.
+    replayTransport = ReplayHiveRpcTransport.load(fixturePath)
+    with open(fixturePath, 'r') as f:
+        exchanges = json.load(f)['exchanges']
+
+    postJsons: Dict[str, dict] = {}
+    for exchange in exchanges:
+        for postJson in _findRootPosts(exchange['result']):
+            postJsons['{author}/{permlink}'.format(author=postJson['author'], permlink=postJson['permlink'])] = postJson
+
+    rpcBatcher = HiveRpcBatcher(replayTransport)
+    pendingCalls = [
+        (postJson, rpcBatcher.queueActiveVotes(postJson['author'], postJson['permlink']),
+         rpcBatcher.queueDiscussion(postJson['author'], postJson['permlink']))
+        for postJson in postJsons.values()
+    ]
+    rpcBatcher.flush()
+
+    posts = []
+    for postJson, votesCall, discussionCall in pendingCalls:
+        rootKey = '{author}/{permlink}'.format(author=postJson['author'], permlink=postJson['permlink'])
+        activeVotes = [] if votesCall.failed else votesCall.result
+        replyAuthors = [] if discussionCall.failed else [reply['author'] for key, reply in discussionCall.result.items() if key != rootKey]
+        posts.append(PipelineBenchmarkPost(postJson, activeVotes, replyAuthors))
+
+    return posts
+
+
+def _findRootPosts(result) -> List[dict]:
+    if isinstance(result, dict):
+        if {'author', 'permlink', 'body', 'json_metadata'} <= result.keys() and result.get('depth', 0) == 0:
+            return [result]
+        return [post for value in result.values() for post in _findRootPosts(value)]
+
+    if isinstance(result, list):
+        return [post for value in result for post in _findRootPosts(value)]
+
+    return []
+
+
+def _percentile(sortedValues: List[float], fraction: float) -> float:
+    if len(sortedValues) == 0:
+        return 0.0
+
+    return sortedValues[min(len(sortedValues) - 1, int(round(fraction * (len(sortedValues) - 1))))]
+
+
+def _createPosts(sourcePosts: List[PipelineBenchmarkPost], size: int) -> List[HivePost]:
+    return [
+        sourcePosts[index % len(sourcePosts)].createHivePost('' if index < len(sourcePosts) else '-{index}'.format(index=index))
+        for index in range(size)
+    ]
+
+
+def _createAgentSupervisor(evaluationWorkers: int) -> AgentSupervisor:
+    return AgentSupervisor(
+        Configuration.hiveCommunityId,
+        Configuration.agentSupervisorSettings['hiveCommunityTags'],
+        BENCHMARK_AGENTS,
+        PolicyActionSupervisor(),
+        ReportDispatcher({}, 0),
+        lambda task: None,
+        evaluationWorkers
+    )
+
+
+def _evaluate(agentSupervisor: AgentSupervisor, posts: List[HivePost]) -> float:
+    startTime = time.perf_counter()
+    for post in posts:
+        agentSupervisor.onHivePostLoaded(post)
+    agentSupervisor.evaluatePendingPosts()
+
+    return time.perf_counter() - startTime
+
+
+def run(sourcePosts: List[PipelineBenchmarkPost], size: int, evaluationWorkers: int) -> dict:
+    registryHandler = RegistryHandler()
+    registryHandler.setSimulationMode(True)
+
+    agentSupervisor = _createAgentSupervisor(evaluationWorkers)
+    latenciesByAgent: Dict[str, List[float]] = {}
+    for agent in agentSupervisor.agents:
+        latencies: List[float] = []
+        latenciesByAgent[agent.agentId] = latencies
+
+        def timedQuery(post, analysis, query=agent.onSuspicionQuery, latencies=latencies):
+            startTime = time.perf_counter()
+            result = query(post, analysis)
+            latencies.append(time.perf_counter() - startTime)
+            return result
+
+        agent.onSuspicionQuery = timedQuery
+
+    # tracemalloc slows down every allocation, so throughput and latencies are taken from a run without it
+    # and the peak memory from a second, untimed run over the same posts.
+    duration = _evaluate(agentSupervisor, _createPosts(sourcePosts, size))
+
+    tracemalloc.start()
+    _evaluate(_createAgentSupervisor(evaluationWorkers), _createPosts(sourcePosts, size))
+    currentMemory, peakMemory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    agentLatencies = {}
+    for agentId, latencies in latenciesByAgent.items():
+        latencies.sort()
+        agentLatencies[agentId] = {
+            'p50Ms': round(_percentile(latencies, 0.50) * 1000, 3),
+            'p95Ms': round(_percentile(latencies, 0.95) * 1000, 3),
+            'p99Ms': round(_percentile(latencies, 0.99) * 1000, 3)
+        }
+
+    return {
+        'posts': size,
+        'seconds': round(duration, 2),
+        'postsPerSecond': round(size / duration, 1) if duration > 0 else 0.0,
+        'peakMemoryMb': round(peakMemory / (1024 * 1024), 1),
+        'agents': agentLatencies
+    }
+
+
+def runAll(sizes: List[int], fixturePath: Optional[str], evaluationWorkers: int, seed: int = 42) -> List[dict]:
+    if fixturePath:
+        sourcePosts = loadRecordedPosts(fixturePath)
+    else:
+        sourcePosts = createSyntheticPosts(min(max(sizes), 10000), seed)
+
+    return [run(sourcePosts, size, evaluationWorkers) for size in sizes]
@@ -0,0 +1,88 @@
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from services.PatternMatching import MultiPatternMatcher
+
+URL_REGEX = re.compile(r'https?://[^\s<>"\'()\[\]]+')
+SAFE_SOURCES = ['pixabay.com', 'unsplash.com', 'pexels.com', 'files.peakd.com', 'images.ecency.com', 'lmac.gallery']
+
+
+def _createBlacklist(size: int) -> List[str]:
+    domains = ['stockdomain{index}.com'.format(index=index) for index in range(size)]
+    return [r'^(?:http|https)\:\/\/(?:\w*\.)?' + re.escape(domain) + r'\/\w.*$' for domain in domains]
+
+
+def _createCorpus(posts: int, blacklistSize: int, seed: int) -> List[str]:
+    randomizer = random.Random(seed)
+    bodies = []
+    for _ in range(posts):
+        lines = ['# My collage for this round', 'Sources used for this collage:']
+        for _ in range(randomizer.randint(3, 25)):
+            if randomizer.random() < 0.05:
+                domain = 'stockdomain{index}.com'.format(index=randomizer.randrange(blacklistSize))
+            else:
+                domain = randomizer.choice(SAFE_SOURCES)
+            lines.append('![image](https://{domain}/photo/{id}/collage-source.jpg)'.format(domain=domain, id=randomizer.randint(1, 10 ** 6)))
+            lines.append('Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * randomizer.randint(1, 5))
+        bodies.append('\n'.join(lines))
+
+    return bodies
+
+
+def _runLoopMatcher(urlsPerPost: List[List[str]], blacklist: List[str]) -> int:
+    found = 0
+    for urls in urlsPerPost:
+        for url in urls:
+            for blacklistRegex in blacklist:
+                if re.search(blacklistRegex, url):
+                    found += 1
+
+    return found
+
+
+def _runIndexedMatcher(urlsPerPost: List[List[str]], matcher: MultiPatternMatcher) -> int:
+    found = 0
+    for urls in urlsPerPost:
+        for url in urls:
+            if matcher.matches(url):
+                found += 1
+
+    return found
+
+
+def run(posts: int, blacklistSizes: List[int]) -> List[dict]:
+    results = []
+    for blacklistSize in blacklistSizes:
+        blacklist = _createBlacklist(blacklistSize)
+        urlsPerPost = [URL_REGEX.findall(body) for body in _createCorpus(posts, blacklistSize, blacklistSize)]
+
+        startTime = time.perf_counter()
+        loopFound = _runLoopMatcher(urlsPerPost, blacklist)
+        loopDuration = time.perf_counter() - startTime
+
+        startTime = time.perf_counter()
+        matcher = MultiPatternMatcher(blacklist)
+        indexedFound = _runIndexedMatcher(urlsPerPost, matcher)
+        indexedDuration = time.perf_counter() - startTime
+
+        results.append({
+            'patterns': blacklistSize,
+            'loopMs': round(loopDuration * 1000, 1),
+            'indexedMs': round(indexedDuration * 1000, 1),
+            'sameResult': loopFound == indexedFound
+        })
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.description = 'Compares per-pattern re.search loops with the domain-indexed blacklist matcher.'
+    parser.add_argument('-posts', type=int, help='Number of synthetic post bodies.', required=False, default=100)
+    args = parser.parse_args()
+
+    for result in run(args.posts, [17, 100, 250, 500]):
+        print('{patterns} patterns: loop={loopMs}ms indexed={indexedMs}ms sameResult={sameResult}'.format(**result))
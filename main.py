@@ -1,17 +1,29 @@
 import argparse
+import calendar
+import datetime
+import random
+import signal
+import threading
 import time
 
 from Configuration import Configuration
 from actionSystem.ActionHandling import PolicyActionSupervisor
 from monitoringSystem.agents import LMACBeneficiaryAgent, SourceBlacklistAgent, SuspectHunterAgent, \
     LILBeneficiaryAgent, ContestLinkAgent, LILNoLILTableAgent, UserBlacklistAgent, CuratablePostAgent
+from monitoringSystem.Backfill import BackfillSupervisor
 from monitoringSystem.MonitoringAgency import AgentSupervisor
 from reportingSystem.Reporting import ReportDispatcher
 from reportingSystem.reporters import LogReporter, DiscordReporters, HiveReporters
 from services.AspectLogging import LogAspect
 from services.Discord import DiscordDispatcher
+from services.HiveBroadcasting import HiveBroadcaster
 from services.HiveNetwork import HiveWallet, HiveHandler
-from services.Registry import RegistryHandler
+from services.HiveNodePool import NodePoolHiveRpcTransport
+from services.HiveRpcBatcher import HiveRpcError
+from services.Metrics import Metrics
+from services.PostCache import PostCache
+from services.Registry import RegistryHandler, RegistryBackend
+from services.RpcRecording import RpcRecorder, RecordingHiveRpcTransport
 
 EXITCODE_OK: int = 0
 EXITCODE_ERROR: int = 1
@@ -32,27 +44,61 @@ def _onAgentSupervisorProgress(reachedTask: str):
         logInfo('Processing: {task}'.format(task=reachedTask))
 
 
+def _createAgentsInfo() -> dict:
+    return {
+        LMACBeneficiaryAgent.LMACBeneficiaryAgent: Configuration.lmacBeneficiaryAgentRules,
+        LILBeneficiaryAgent.LILBeneficiaryAgent: Configuration.lilBeneficiaryAgentRules,
+        SourceBlacklistAgent.SourceBlacklistAgent: Configuration.sourceBlacklistAgentRules,
+        SuspectHunterAgent.SuspectHunterAgent: Configuration.suspectHunterAgentRules,
+        # BadWordsAgent.BadWordsAgent: Configuration.badWordsAgentRules,
+        # ContestLinkAgent.ContestLinkAgent: Configuration.contestLinkAgentRules,
+        LILNoLILTableAgent.LILNoLILTableAgent: {},
+        CuratablePostAgent.CuratablePostAgent: Configuration.curatablePostAgentRules
+    }
+
+
 def main(arguments: dict) -> int:
     simulate: bool = arguments['simulate']
 
+    if arguments['backfill']:
+        return _runBackfill(arguments['backfill'])
+
+    # Initialize RegistryHandler.
+    registryHandler = RegistryHandler()
+    registryHandler.setSimulationMode(simulate)
+    registryHandler.configureBackend(RegistryBackend.fromSettings(Configuration.registrySettings))
+
     # Unlock Hive wallet.
     hiveWallet = HiveWallet.unlock(
         Configuration.hiveWalletPassword,
         Configuration.hiveUser,
         Configuration.hiveCommunityId,
-        Configuration.hiveApiUrl
+        Configuration.hiveApiUrls
     )
     if not hiveWallet:
         logInfo('Error. Wrong wallet password.')
         return EXITCODE_ERROR
 
-    # Initialize RegistryHandler.
-    registryHandler = RegistryHandler()
-    registryHandler.setSimulationMode(simulate)
+    # Initialize PostCache singleton.
+    PostCache().open(Configuration.postCacheSettings['path'], Configuration.postCacheSettings['volatileTtlInSeconds'])
 
     # Initialize HiveHandler singleton.
     hiveHandler = HiveHandler()
-    hiveHandler.setup(hiveWallet, Configuration.ignorePostsCommentedBy, Configuration.exceptAuthors, simulate)
+    hiveHandler.setup(
+        hiveWallet,
+        Configuration.ignorePostsCommentedBy,
+        Configuration.exceptAuthors,
+        simulate,
+        Configuration.hivePostEnrichmentWorkers
+    )
+    hiveHandler.openOutbox(None if simulate else Configuration.hiveOutboxPath)
+    if Configuration.hiveIngestionSettings['mode'] == 'blockStream':
+        hiveHandler.enableBlockStream(
+            Configuration.hiveCommunityId,
+            Configuration.hiveIngestionSettings['minimumPostAgeInSeconds'],
+            Configuration.hiveIngestionSettings['blocksPerRequest'],
+            Configuration.hiveIngestionSettings['maxBlocksPerCycle']
+        )
 
     # Initialize ReportDispatcher.
     reportDispatcher = ReportDispatcher({
@@ -73,46 +119,187 @@ def main(arguments: dict) -> int:
     # Initialize AgentSupervisor
     agentSupervisor = AgentSupervisor(
         Configuration.agentSupervisorSettings['hiveCommunityId'],
-        Configuration.agentSupervisorSettings['hiveCommunityTags'], {
-            LMACBeneficiaryAgent.LMACBeneficiaryAgent: Configuration.lmacBeneficiaryAgentRules,
-            LILBeneficiaryAgent.LILBeneficiaryAgent: Configuration.lilBeneficiaryAgentRules,
-            SourceBlacklistAgent.SourceBlacklistAgent: Configuration.sourceBlacklistAgentRules,
-            SuspectHunterAgent.SuspectHunterAgent: Configuration.suspectHunterAgentRules,
-            # BadWordsAgent.BadWordsAgent: Configuration.badWordsAgentRules,
-            # ContestLinkAgent.ContestLinkAgent: Configuration.contestLinkAgentRules,
-            LILNoLILTableAgent.LILNoLILTableAgent: {},
-            CuratablePostAgent.CuratablePostAgent: Configuration.curatablePostAgentRules
-        },
+        Configuration.agentSupervisorSettings['hiveCommunityTags'],
+        _createAgentsInfo(),
         policyActionSupervisor,
         reportDispatcher,
-        _onAgentSupervisorProgress
+        _onAgentSupervisorProgress,
+        Configuration.agentSupervisorSettings['evaluationWorkers']
     )
 
     agentSupervisor.exceptAuthors = Configuration.exceptAuthors
 
+    discordDispatcher = DiscordDispatcher()
+    discordDispatcher.setSimulationMode(simulate)
+    discordDispatcher.configureDelivery(
+        Configuration.discordDeliverySettings['delivery'],
+        Configuration.discordDeliverySettings['apiBaseUrl']
+    )
+
+    if arguments['daemon']:
+        return _runDaemon(arguments, agentSupervisor, hiveHandler, registryHandler, discordDispatcher)
+
+    # Records every RPC response of this cycle as a fixture for the offline benchmark.
+    rpcRecorder = None
+    if arguments['recordRpc']:
+        rpcRecorder = RpcRecorder()
+        rpcRecorder.instrumentBeemRpc(hiveWallet.hive.rpc)
+        hiveHandler.setRpcTransport(RecordingHiveRpcTransport(NodePoolHiveRpcTransport(hiveWallet.nodePool), rpcRecorder))
+
+    cycleSucceeded = _runMonitoringCycle(agentSupervisor, hiveHandler, discordDispatcher, simulate)
+    if rpcRecorder is not None:
+        rpcRecorder.save(arguments['recordRpc'])
+    if not cycleSucceeded:
+        return EXITCODE_ERROR
+
+    hiveHandler.finish()
+    registryHandler.saveAll()
+
+    return EXITCODE_OK
+
+
+def _runMonitoringCycle(agentSupervisor: AgentSupervisor, hiveHandler: HiveHandler,
+                        discordDispatcher: DiscordDispatcher, simulate: bool) -> bool:
+    metrics = Metrics()
+    metrics.startCycle()
+
     # Start supervising
     try:
         agentSupervisor.startSearching()
     except IOError:
         logInfo('Could not load Hive posts.')
-        return EXITCODE_ERROR
+        _exportCycleMetrics()
+        return False
 
     agentSupervisor.finishMonitoringCycle()
 
-    discordDispatcher = DiscordDispatcher()
-    discordDispatcher.setSimulationMode(simulate)
-    discordDispatcher.runDiscordTasks(Configuration.discordToken)
+    with metrics.measurePhase('discordDelivery'):
+        discordDispatcher.runDiscordTasks(Configuration.discordToken)
 
-    while hiveHandler.processNextQueuedMessages():
-        if not simulate:
-            time.sleep(Configuration.delayBetweenSendingHiveComments)
+    # Everything found in this cycle was delivered and what is left to broadcast waits in the outbox,
+    # so the scan state is written before the paced broadcast instead of only at the end of the cycle.
+    RegistryHandler().checkpoint()
 
-    while hiveHandler.muteNextQueuedPosts():
-        if not simulate:
-            time.sleep(Configuration.delayBetweenMutingHiveComments)
+    with metrics.measurePhase('hiveBroadcast'):
+        broadcastStatistics = hiveHandler.broadcastQueuedOperations(HiveBroadcaster(
+            hiveHandler.getHiveWallet().hive,
+            hiveHandler.getHiveWallet().username,
+            Configuration.hiveCommunityId,
+            simulate,
+            Configuration.delayBetweenSendingHiveComments,
+            Configuration.delayBetweenMutingHiveComments,
+            Configuration.maxMutesPerTransaction
+        ))
+    logInfo(str(broadcastStatistics))
 
-    registryHandler.saveAll()
+    _exportCycleMetrics()
+
+    return True
+
+
+def _exportCycleMetrics():
+    summary = Metrics().finishCycle()
+    Metrics().export(Configuration.metricsSettings['jsonPath'], Configuration.metricsSettings['prometheusPath'])
+    logInfo('Monitoring cycle took {seconds:.1f} seconds.'.format(seconds=summary['cycleDurationInSeconds']))
+
+
+def _runBackfill(timeRange: list) -> int:
+    try:
+        fromTimestamp, toTimestamp = [_parseBackfillTime(value) for value in timeRange]
+    except ValueError:
+        logInfo('Error. Backfill times must look like 2022-01-31 or 2022-01-31T12:00:00.')
+        return EXITCODE_ERROR
+
+    if fromTimestamp >= toTimestamp:
+        logInfo('Error. The backfill range ends before it starts.')
+        return EXITCODE_ERROR
+
+    backfillSupervisor = BackfillSupervisor(
+        Configuration.agentSupervisorSettings['hiveCommunityId'],
+        _createAgentsInfo(),
+        Configuration.backfillSettings['workers'],
+        Configuration.backfillSettings['blocksPerSlice']
+    )
+    try:
+        summary = backfillSupervisor.run(fromTimestamp, toTimestamp, Configuration.backfillSettings['reportPath'])
+    except HiveRpcError as e:
+        logInfo('Error. The Hive API could not resolve the backfill range: {error}'.format(error=e))
+        return EXITCODE_ERROR
+
+    logInfo('Backfilled {posts} posts in {slices} slices with {reports} reports in {seconds:.1f} seconds.'.format(**summary))
+    if summary['failedSlices'] > 0:
+        logInfo('{failedSlices} slices failed and are listed in the report.'.format(**summary))
+        return EXITCODE_ERROR
+
+    return EXITCODE_OK
+
+
+def _parseBackfillTime(value: str) -> int:
+    for timeFormat in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
+        try:
+            return calendar.timegm(datetime.datetime.strptime(value, timeFormat).timetuple())
+        except ValueError:
+            pass
+
+    raise ValueError(value)
+
+
+def _runDaemon(arguments: dict, agentSupervisor: AgentSupervisor, hiveHandler: HiveHandler,
+               registryHandler: RegistryHandler, discordDispatcher: DiscordDispatcher) -> int:
+    interval: int = Configuration.daemonSettings['cycleIntervalInSeconds'] if arguments['interval'] is None else arguments['interval']
+    jitter: int = Configuration.daemonSettings['cycleJitterInSeconds'] if arguments['jitter'] is None else arguments['jitter']
+    shutdownRequested = threading.Event()
+
+    def _onShutdownSignal(signalNumber, frame):
+        logInfo('Shutdown requested. Finishing...')
+        shutdownRequested.set()
+
+    signal.signal(signal.SIGINT, _onShutdownSignal)
+    signal.signal(signal.SIGTERM, _onShutdownSignal)
+
+    discordDispatcher.startPersistentSession(Configuration.discordToken)
+    if Configuration.metricsSettings['port']:
+        Metrics().startHttpExporter(Configuration.metricsSettings['port'])
+
+    isFirstCycle = True
+    consecutiveFailures = 0
+    while not shutdownRequested.is_set():
+        cycleStart = time.time()
+        try:
+            # The subscribers were loaded on setup, later cycles pick up the community's new subscriptions.
+            if not isFirstCycle and not hiveHandler.syncSubscribers():
+                logInfo('Could not sync subscribers. Retrying in the next cycle.')
+            isFirstCycle = False
+
+            cycleSucceeded = _runMonitoringCycle(agentSupervisor, hiveHandler, discordDispatcher, arguments['simulate'])
+
+            # Checkpoint after every cycle so a killed daemon loses at most one cycle.
+            hiveHandler.finish()
+            registryHandler.saveAll()
+        except Exception as e:
+            # A single broken cycle must not end the daemon, the traceback goes to the log.
+            if verboseMode:
+                print('Monitoring cycle crashed: {error}'.format(error=e))
+            mainLogger.logger().exception('Monitoring cycle crashed.')
+            cycleSucceeded = False
+
+        delay = interval + random.uniform(-jitter, jitter) - (time.time() - cycleStart)
+        if cycleSucceeded:
+            consecutiveFailures = 0
+        else:
+            consecutiveFailures += 1
+            delay = max(delay, min(
+                Configuration.daemonSettings['maxFailureBackoffInSeconds'],
+                Configuration.daemonSettings['failureBackoffInSeconds'] * 2 ** (consecutiveFailures - 1)
+            ))
+            logInfo('Monitoring cycle failed {failures} times in a row. Retrying in the next cycle.'.format(failures=consecutiveFailures))
+
+        logInfo('Next monitoring cycle in {seconds} seconds.'.format(seconds=max(0, int(delay))))
+        shutdownRequested.wait(max(0.0, delay))
+
+    discordDispatcher.closePersistentSession(Configuration.daemonSettings['shutdownTimeoutInSeconds'])
     hiveHandler.finish()
+    registryHandler.saveAll()
 
     return EXITCODE_OK
 
@@ -132,6 +319,37 @@ if __name__ == '__main__':
         help='True for enabling the simulation mode. No messages will be sent, no action will be done.',
         required=False
     )
+    parser.add_argument(
+        '-daemon', '--daemon',
+        action='store_true',
+        help='Keeps running and starts a monitoring cycle every interval instead of exiting after one cycle.'
+    )
+    parser.add_argument(
+        '-backfill', '--backfill',
+        type=str,
+        nargs=2,
+        metavar=('FROM', 'TO'),
+        help='Evaluates the community posts created between two UTC times and only writes the reports to the backfill report file.',
+        required=False
+    )
+    parser.add_argument(
+        '-recordRpc', '--recordRpc',
+        type=str,
+        help='Records the RPC responses of a single monitoring cycle into the given fixture file for bench.py.',
+        required=False
+    )
+    parser.add_argument(
+        '-interval', '--interval',
+        type=int,
+        help='Seconds between two monitoring cycles in daemon mode.',
+        required=False
+    )
+    parser.add_argument(
+        '-jitter', '--jitter',
+        type=int,
+        help='Maximum random deviation in seconds applied to the daemon interval.',
+        required=False
+    )
     args = parser.parse_args()
     verboseMode = args.verbose
 
@@ -0,0 +1,237 @@
+import datetime
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import List, Optional
+
+from Configuration import Configuration
+from actionSystem.ActionHandling import PolicyActionSupervisor
+from monitoringSystem.MonitoringAgency import AgentSupervisor
+from reportingSystem.Reporting import ReportDispatcher, SuspiciousActivityReport
+from services.HiveBlockStream import HiveBlockStream
+from services.HiveNetwork import HiveWallet, HiveHandler
+from services.HiveNodePool import HiveNodePool, NodePoolHiveRpcTransport
+from services.HiveRpcBatcher import HiveRpcBatcher
+from services.PostCache import PostCache
+from services.Registry import RegistryHandler, RegistryBackend
+
+
+class BackfillSlice:
+    _index: int
+    _startBlockNum: int
+    _endBlockNum: int
+
+    def __init__(self, index: int, startBlockNum: int, endBlockNum: int):
+        self._index = index
+        self._startBlockNum = startBlockNum
+        self._endBlockNum = endBlockNum
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def startBlockNum(self) -> int:
+        return self._startBlockNum
+
+    @property
+    def endBlockNum(self) -> int:
+        return self._endBlockNum
+
+
+class BackfillWorker:
+    POST_CACHE_PATH: str = ':memory:'
+
+    _hiveCommunityId: str
+    _fromTimestamp: float
+    _toTimestamp: float
+    _hiveHandler: HiveHandler
+    _reportDispatcher: ReportDispatcher
+    _agentSupervisor: AgentSupervisor
+
+    def __init__(self, hiveCommunityId: str, agentsInfo: dict, fromTimestamp: float, toTimestamp: float):
+        self._hiveCommunityId = hiveCommunityId
+        self._fromTimestamp = fromTimestamp
+        self._toTimestamp = toTimestamp
+
+        # Workers only read the registry. Nothing they load is marked as monitored for the live cycles.
+        registryHandler = RegistryHandler()
+        registryHandler.setSimulationMode(True)
+        registryHandler.configureBackend(RegistryBackend.fromSettings(Configuration.registrySettings))
+
+        # Every worker keeps its own cache in memory instead of writing to the cache file of the live cycles.
+        PostCache().open(BackfillWorker.POST_CACHE_PATH, Configuration.postCacheSettings['volatileTtlInSeconds'])
+
+        # Reading needs no keys, so the wallet stays locked. Reports are not sent anywhere, so no subscribers are needed.
+        self._hiveHandler = HiveHandler()
+        self._hiveHandler.setup(
+            HiveWallet(Configuration.hiveUser, Configuration.hiveCommunityId, Configuration.hiveApiUrls),
+            Configuration.ignorePostsCommentedBy,
+            Configuration.exceptAuthors,
+            True,
+            Configuration.hivePostEnrichmentWorkers,
+            False
+        )
+
+        self._reportDispatcher = ReportDispatcher({}, Configuration.dispatcherDiscordNotificationChannel)
+        self._agentSupervisor = AgentSupervisor(
+            hiveCommunityId,
+            Configuration.agentSupervisorSettings['hiveCommunityTags'],
+            agentsInfo,
+            PolicyActionSupervisor(),
+            self._reportDispatcher,
+            lambda reachedTask: None,
+            Configuration.agentSupervisorSettings['evaluationWorkers']
+        )
+        self._agentSupervisor.exceptAuthors = Configuration.exceptAuthors
+
+    def evaluateSlice(self, backfillSlice: BackfillSlice) -> dict:
+        result = {
+            'index': backfillSlice.index,
+            'startBlockNum': backfillSlice.startBlockNum,
+            'endBlockNum': backfillSlice.endBlockNum,
+            'failed': False,
+            'error': None,
+            'posts': 0,
+            'reports': []
+        }
+
+        try:
+            if not self._hiveHandler.loadCommunityPostsFromBlocks(self._hiveCommunityId, backfillSlice.startBlockNum,
+                                                                  backfillSlice.endBlockNum, self._fromTimestamp, self._toTimestamp):
+                result['failed'] = True
+                result['error'] = 'Blocks or posts of the slice could not be loaded.'
+                return result
+
+            # Suggested policy actions are dropped with the supervisor's queue, backfill never mutes or comments.
+            result['posts'] = self._agentSupervisor.pendingPostsCount
+            self._agentSupervisor.evaluatePendingPosts()
+            result['reports'] = [BackfillWorker._reportToDict(report) for report in self._reportDispatcher.takeReports()]
+        except Exception as e:
+            # Reports of a failed slice are dropped, it is listed in the report and has to be backfilled again.
+            self._reportDispatcher.takeReports()
+            result['failed'] = True
+            result['error'] = str(e)
+            result['posts'] = 0
+            result['reports'] = []
+
+        return result
+
+    @staticmethod
+    def _reportToDict(report: SuspiciousActivityReport) -> dict:
+        return {
+            'author': report.author,
+            'permlink': report.permlink,
+            'agentId': report.agentId,
+            'activityLevel': report.activityLevel,
+            'description': report.description,
+            'meta': report.meta
+        }
+
+
+_backfillWorker: Optional[BackfillWorker] = None
+
+
+def _initializeBackfillWorker(hiveCommunityId: str, agentsInfo: dict, fromTimestamp: float, toTimestamp: float):
+    global _backfillWorker
+    _backfillWorker = BackfillWorker(hiveCommunityId, agentsInfo, fromTimestamp, toTimestamp)
+
+
+def _evaluateBackfillSlice(backfillSlice: BackfillSlice) -> dict:
+    return _backfillWorker.evaluateSlice(backfillSlice)
+
+
+class BackfillSupervisor:
+    DEFAULT_WORKERS: int = 4
+    DEFAULT_BLOCKS_PER_SLICE: int = 1200
+    BOUNDARY_MARGIN_IN_BLOCKS: int = 100
+
+    _hiveCommunityId: str
+    _agentsInfo: dict
+    _workers: int
+    _blocksPerSlice: int
+
+    def __init__(self, hiveCommunityId: str, agentsInfo: dict, workers: int = DEFAULT_WORKERS,
+                 blocksPerSlice: int = DEFAULT_BLOCKS_PER_SLICE):
+        self._hiveCommunityId = hiveCommunityId
+        self._agentsInfo = agentsInfo
+        self._workers = max(1, workers)
+        self._blocksPerSlice = max(1, blocksPerSlice)
+
+    def createSlices(self, startBlockNum: int, endBlockNum: int) -> List[BackfillSlice]:
+        return [
+            BackfillSlice(index, sliceStartBlockNum, min(endBlockNum, sliceStartBlockNum + self._blocksPerSlice - 1))
+            for index, sliceStartBlockNum in enumerate(range(startBlockNum, endBlockNum + 1, self._blocksPerSlice))
+        ]
+
+    def run(self, fromTimestamp: float, toTimestamp: float, reportPath: str) -> dict:
+        startedAt = time.time()
+
+        # The block search is only an estimate. The margin is filtered again by the creation time of every post.
+        hiveApiUrls = Configuration.hiveApiUrls if isinstance(Configuration.hiveApiUrls, list) else [Configuration.hiveApiUrls]
+        blockStream = HiveBlockStream(HiveRpcBatcher(NodePoolHiveRpcTransport(HiveNodePool(hiveApiUrls))), self._hiveCommunityId)
+        startBlockNum = max(1, blockStream.findBlockNum(fromTimestamp) - BackfillSupervisor.BOUNDARY_MARGIN_IN_BLOCKS)
+        endBlockNum = blockStream.findBlockNum(toTimestamp) + BackfillSupervisor.BOUNDARY_MARGIN_IN_BLOCKS
+        slices = self.createSlices(startBlockNum, endBlockNum)
+
+        # Spawned workers start with fresh singletons instead of inheriting the parent's connections.
+        with ProcessPoolExecutor(
+                max_workers=min(self._workers, len(slices)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_initializeBackfillWorker,
+                initargs=(self._hiveCommunityId, self._agentsInfo, fromTimestamp, toTimestamp)
+        ) as executor:
+            # Results are collected in slice order, so the merged reports are the same for every run over the same chain data.
+            futures = [executor.submit(_evaluateBackfillSlice, backfillSlice) for backfillSlice in slices]
+            sliceResults = [BackfillSupervisor._collectSliceResult(backfillSlice, future) for backfillSlice, future in zip(slices, futures)]
+
+        failedSlices = [
+            {'startBlockNum': sliceResult['startBlockNum'], 'endBlockNum': sliceResult['endBlockNum'], 'error': sliceResult['error']}
+            for sliceResult in sliceResults if sliceResult['failed']
+        ]
+        reports = [report for sliceResult in sliceResults for report in sliceResult['reports']]
+        postsCount = sum(sliceResult['posts'] for sliceResult in sliceResults)
+
+        BackfillSupervisor._writeReport(reportPath, {
+            'from': datetime.datetime.utcfromtimestamp(fromTimestamp).strftime('%Y-%m-%dT%H:%M:%S'),
+            'to': datetime.datetime.utcfromtimestamp(toTimestamp).strftime('%Y-%m-%dT%H:%M:%S'),
+            'startBlockNum': startBlockNum,
+            'endBlockNum': endBlockNum,
+            'posts': postsCount,
+            'failedSlices': failedSlices,
+            'reports': reports
+        })
+
+        return {
+            'slices': len(slices),
+            'failedSlices': len(failedSlices),
+            'posts': postsCount,
+            'reports': len(reports),
+            'seconds': time.time() - startedAt
+        }
+
+    @staticmethod
+    def _collectSliceResult(backfillSlice: BackfillSlice, future: Future) -> dict:
+        # A worker that could not start or died takes only its own slices down.
+        try:
+            return future.result()
+        except Exception as e:
+            return {
+                'index': backfillSlice.index,
+                'startBlockNum': backfillSlice.startBlockNum,
+                'endBlockNum': backfillSlice.endBlockNum,
+                'failed': True,
+                'error': str(e),
+                'posts': 0,
+                'reports': []
+            }
+
+    @staticmethod
+    def _writeReport(path: str, content: dict):
+        temporaryPath = '{path}.tmp'.format(path=path)
+        with open(temporaryPath, 'w') as f:
+            json.dump(content, f, indent=4, default=str)
+
+        os.replace(temporaryPath, path)
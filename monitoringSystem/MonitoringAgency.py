@@ -1,34 +1,60 @@
+import time
 from abc import ABC, abstractmethod
-from typing import Tuple, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Callable, Optional, List
 
 from actionSystem.ActionHandling import PolicyAction, PolicyActionSupervisor
-from services.HiveNetwork import HiveHandler, HiveComment
+from services.HiveNetwork import HiveHandler, HiveComment, HivePost
+from services.HiveTools import HivePostAnalysis
+from services.Metrics import Metrics
 from reportingSystem.Reporting import SuspiciousActivityReport, ReportDispatcher
 from services.Registry import RegistryHandler
+from services.SeenTracking import SeenSet
 
 
 class Agent(ABC):
+    CPU_BOUND: int = 0
+    IO_BOUND: int = 1
+
     _agentId: str
     _agentSupervisor: Optional['AgentSupervisor']
+    _executionKind: int
+    _phase: int
 
-    def __init__(self, agentId):
+    def __init__(self, agentId, executionKind: int = CPU_BOUND, phase: int = 0):
         self._agentId = agentId
         self._agentSupervisor = None
+        self._executionKind = executionKind
+        self._phase = phase
 
     def initialize(self, agentSupervisor: 'AgentSupervisor'):
         self._agentSupervisor = agentSupervisor
 
+    @property
+    def agentId(self) -> str:
+        return self._agentId
+
+    @property
+    def executionKind(self) -> int:
+        return self._executionKind
+
+    @property
+    def phase(self) -> int:
+        # Agents of a higher phase run after all agents of the lower phases finished for every post.
+        return self._phase
+
     @abstractmethod
     def onSetupRules(self, rules: dict):
         pass
 
     @abstractmethod
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
         pass
 
 
 class AgentSupervisor:
-    MAX_SAVED_ALREADY_PROCESSED_REPLIES: int = 150
+    MAX_SAVED_ALREADY_PROCESSED_REPLIES: int = 20000
+    ALREADY_PROCESSED_REPLIES_MAX_AGE_IN_SECONDS: int = 8 * 86400
 
     _agents: list
     _hiveCommunityId: str
@@ -36,11 +62,14 @@ class AgentSupervisor:
     _hiveHandler: HiveHandler
     _exceptAuthors: list
     _monitoredPostsCount: int
-    _objectedPosts: list
+    _objectedPosts: set
+    _alreadyProcessedReplies: SeenSet
+    _pendingPosts: List[HivePost]
+    _evaluationWorkers: int
 
     def __init__(self, hiveCommunityId: str, hiveCommunityTag, agentsInfo: dict,
                  policyActionSupervisor: PolicyActionSupervisor, reportDispatcher: ReportDispatcher,
-                 progressCallback: Callable[[str], None]):
+                 progressCallback: Callable[[str], None], evaluationWorkers: int = 1):
         self._agents = []
 
         for agentClass in agentsInfo.keys():
@@ -56,12 +85,27 @@ class AgentSupervisor:
         self._hiveHandler.addOnPostLoadedHandler(self.onHivePostLoaded)
         self._hiveHandler.addOnReplyLoadedHandler(self.onHiveReplyLoaded)
         self._registryHandler = RegistryHandler()
+        self._alreadyProcessedReplies = SeenSet.fromList(
+            self._registryHandler.getProperty('MonitoringAgency', 'alreadyProcessedReplies', []),
+            AgentSupervisor.MAX_SAVED_ALREADY_PROCESSED_REPLIES,
+            AgentSupervisor.ALREADY_PROCESSED_REPLIES_MAX_AGE_IN_SECONDS
+        )
         self._reports = []
         self._policyActionSupervisor = policyActionSupervisor
         self._reportDispatcher = reportDispatcher
         self._progressCallback = progressCallback
         self._exceptAuthors = []
-        self._objectedPosts = []
+        self._objectedPosts = set()
+        self._pendingPosts = []
+        self._evaluationWorkers = max(1, evaluationWorkers)
+
+    @property
+    def agents(self) -> List[Agent]:
+        return self._agents
+
+    @property
+    def pendingPostsCount(self) -> int:
+        return len(self._pendingPosts)
 
     @property
     def exceptAuthors(self) -> list:
@@ -71,15 +115,14 @@ class AgentSupervisor:
     def exceptAuthors(self, authors: list):
         self._exceptAuthors = authors
 
-    def _checkPostNotVoted(self, post: HiveComment):
+    def _checkPostNotVoted(self, post: HivePost):
         alreadyProcessedReplies = self._registryHandler.getProperty('MonitoringAgency', 'alreadyProcessedReplies', [])
 
     def onHiveReplyLoaded(self, reply: HiveComment):
         if reply.author in self.exceptAuthors:
             return
 
-        alreadyProcessedReplies = self._registryHandler.getProperty('MonitoringAgency', 'alreadyProcessedReplies', [])
-        if reply.authorperm in alreadyProcessedReplies:
+        if reply.authorperm in self._alreadyProcessedReplies:
             return
 
         if reply.time_elapsed().days > 7:
@@ -92,41 +135,115 @@ class AgentSupervisor:
                 replyUrl='https://peakd.com/{authorPerm}'.format(authorPerm=reply.authorperm)
             ))
 
-        alreadyProcessedReplies.append(reply.authorperm)
-        while len(alreadyProcessedReplies) > AgentSupervisor.MAX_SAVED_ALREADY_PROCESSED_REPLIES:
-            alreadyProcessedReplies.pop(0)
-
-        self._registryHandler.setProperty('MonitoringAgency', 'alreadyProcessedReplies', alreadyProcessedReplies)
+        self._alreadyProcessedReplies.add(reply.authorperm)
 
-    def onHivePostLoaded(self, post: HiveComment):
+    def onHivePostLoaded(self, post: HivePost):
         if post.author in self.exceptAuthors:
             return
 
         self._monitoredPostsCount += 1
-
-        for agent in self._agents:
-            suspiciousActivityReport, action = agent.onSuspicionQuery(post)
-
-            if suspiciousActivityReport is not None:
-                self._reportDispatcher.handOverReport(suspiciousActivityReport)
-                self._objectedPosts.append(post.authorperm)
-            if action is not None:
-                self._policyActionSupervisor.suggestAction(action)
+        self._pendingPosts.append(post)
+
+    def evaluatePendingPosts(self):
+        posts = self._pendingPosts
+        self._pendingPosts = []
+        analyses = [HivePostAnalysis(post) for post in posts]
+        results = {}
+
+        executor = None
+        if self._evaluationWorkers > 1 and any(agent.executionKind == Agent.IO_BOUND for agent in self._agents):
+            executor = ThreadPoolExecutor(max_workers=self._evaluationWorkers)
+        try:
+            for phase in sorted(set(agent.phase for agent in self._agents)):
+                self._evaluatePhase(phase, posts, analyses, results, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # Hand over in post order and configured agent order, independent of which worker finished first.
+        for postIndex in range(len(posts)):
+            for agentIndex in range(len(self._agents)):
+                suspiciousActivityReport, action = results[(postIndex, agentIndex)]
+
+                if suspiciousActivityReport is not None:
+                    self._reportDispatcher.handOverReport(suspiciousActivityReport)
+                if action is not None:
+                    self._policyActionSupervisor.suggestAction(action)
+
+    def _evaluatePhase(self, phase: int, posts: List[HivePost], analyses: List[HivePostAnalysis], results: dict,
+                       executor: Optional[ThreadPoolExecutor]):
+        phaseAgents = [(agentIndex, agent) for agentIndex, agent in enumerate(self._agents) if agent.phase == phase]
+        futures = []
+
+        if executor is not None:
+            # IO bound agents get one batch per worker, so their lookups still overlap.
+            chunkSize = max(1, -(-len(posts) // self._evaluationWorkers))
+            for agentIndex, agent in phaseAgents:
+                if agent.executionKind != Agent.IO_BOUND:
+                    continue
+                for firstPostIndex in range(0, len(posts), chunkSize):
+                    futures.append((agentIndex, firstPostIndex, executor.submit(
+                        self._querySuspicionBatch,
+                        agent,
+                        posts[firstPostIndex:firstPostIndex + chunkSize],
+                        analyses[firstPostIndex:firstPostIndex + chunkSize]
+                    )))
+
+        submittedAgentIndices = set(agentIndex for agentIndex, firstPostIndex, future in futures)
+        for agentIndex, agent in phaseAgents:
+            if agentIndex not in submittedAgentIndices:
+                for postIndex, result in enumerate(self._querySuspicionBatch(agent, posts, analyses)):
+                    results[(postIndex, agentIndex)] = result
+
+        for agentIndex, firstPostIndex, future in futures:
+            for postIndex, result in enumerate(future.result(), firstPostIndex):
+                results[(postIndex, agentIndex)] = result
+
+        for postIndex, post in enumerate(posts):
+            for agentIndex, agent in phaseAgents:
+                if results[(postIndex, agentIndex)][0] is not None:
+                    self._objectedPosts.add(post.authorperm)
+
+    @staticmethod
+    def _querySuspicionBatch(agent: Agent, posts: List[HivePost], analyses: List[HivePostAnalysis]) -> List[Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]]:
+        if len(posts) == 0:
+            return []
+
+        startedAt = time.perf_counter()
+        results = [agent.onSuspicionQuery(post, analysis) for post, analysis in zip(posts, analyses)]
+        Metrics().recordDuration('agent', {'agent': agent.agentId}, time.perf_counter() - startedAt, len(posts))
+
+        return results
 
     def startSearching(self):
+        self._monitoredPostsCount = 0
+        self._objectedPosts = set()
+
         self._reportProgress('Monitoring new Hive replies...')
-        if not self._hiveHandler.loadNewestAccountReplies(self._hiveHandler.getHiveWallet().username):
-            raise IOError('Hive connection error while trying to load latest replies.')
+        with Metrics().measurePhase('replyScan'):
+            if not self._hiveHandler.loadNewestAccountReplies(self._hiveHandler.getHiveWallet().username):
+                raise IOError('Hive connection error while trying to load latest replies.')
+        self._registryHandler.setProperty(
+            'MonitoringAgency',
+            'alreadyProcessedReplies',
+            self._alreadyProcessedReplies.toList()
+        )
         self._reportProgress('Monitoring new Hive posts...')
-        if not self._hiveHandler.loadNewestCommunityPosts(self._hiveCommunityId, self._hiveCommunityTag):
-            raise IOError('Hive connection error while trying to load latest posts.')
+        with Metrics().measurePhase('postScan'):
+            if not self._hiveHandler.loadNewestCommunityPosts(self._hiveCommunityId, self._hiveCommunityTag):
+                raise IOError('Hive connection error while trying to load latest posts.')
+        self._reportProgress('Evaluating {pendingPosts} posts...'.format(pendingPosts=len(self._pendingPosts)))
+        with Metrics().measurePhase('agentEvaluation'):
+            self.evaluatePendingPosts()
         self._reportProgress('Monitored {monitoredPosts} posts.'.format(monitoredPosts=self._monitoredPostsCount))
 
     def finishMonitoringCycle(self):
         self._reportProgress('Promoting reports...')
-        self._reportDispatcher.promoteReports()
+        with Metrics().measurePhase('reportPromotion'):
+            self._reportDispatcher.promoteReports()
         self._reportProgress('Processing actions...')
-        self._policyActionSupervisor.processActions()
+        with Metrics().measurePhase('policyActions'):
+            self._policyActionSupervisor.processActions()
         self._reportProgress('Finished monitoring!')
 
     def _reportProgress(self, reachedTheTask: str):
@@ -1,36 +1,30 @@
-import nltk
 from abc import ABC
 from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
+from services.WordMatching import AhoCorasickMatcher
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
 
 
 class BadWordsAgent(Agent, ABC):
-    _lilBeneficiaryWeight: int
+    _badWordsMatcher: AhoCorasickMatcher
 
     def __init__(self):
         super().__init__(self.__class__.__name__)
-        self._badWords = []
+        self._badWordsMatcher = AhoCorasickMatcher([])
 
     def onSetupRules(self, rules: dict):
-        self._badWords = rules['badWords']
+        self._badWordsMatcher = AhoCorasickMatcher(rules['badWords'])
 
-    def _findBadWords(self, text: str):
-        words = nltk.word_tokenize(text.lower())
-        foundBadWords = []
-        for badWord in self._badWords:
-            if badWord not in words:
-                continue
-            foundBadWords.append(badWord)
+    def _findBadWords(self, lowerText: str):
+        return self._badWordsMatcher.findTerms(lowerText)
 
-        return foundBadWords
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
-
-        badWordsFound = self._findBadWords(post.body)
+        badWordsFound = self._findBadWords(analysis.lowerBody)
 
         if len(badWordsFound) > 0:
             return SuspiciousActivityReport(
@@ -1,49 +1,39 @@
-import re
-
 from abc import ABC
 from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
 from services.AspectLogging import LogAspect
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
-from services.HiveTools import HivePostIdentifier
+from services.HiveTools import HivePostIdentifier, HivePostAnalysis
 
 
 class ContestLinkAgent(Agent, ABC):
-    _contestLinkRegex = r''
+    _moderators: list = []
     _mandatoryContestHashtag: str = ''
 
     def __init__(self):
         super().__init__('Contest Link Agent')
-        self._contestLinkRegex = r''
+        self._moderators = []
         self._mandatoryContestHashtag = ''
         self._logger = LogAspect('cla')
 
     def onSetupRules(self, rules: dict):
-        regexStr = r'(https:\/\/[a-zA-Z0-9_\-\.]+)?\/[a-zA-Z0-9_\-\.\/]*@({moderators})\/[a-zA-Z0-9_\-\.\/]*'.format(
-                moderators='|'.join(rules['moderators']))
-        self._contestLinkRegex = re.compile(
-                regexStr
-        )
+        self._moderators = [moderator.lower() for moderator in rules['moderators']]
         self._mandatoryContestHashtag = rules['mandatoryContestHashtag']
 
-    def _hasContestLink(self, text: str):
-        urlMatches = re.findall(self._contestLinkRegex, text)
-        for urlMatch in urlMatches:
-            return True
-
-        return False
+    def _hasContestLink(self, analysis: HivePostAnalysis):
+        return analysis.links.hasHiveReferenceTo(self._moderators)
 
-    def _isContestPost(self, post: HiveComment):
+    def _isContestPost(self, analysis: HivePostAnalysis):
 
-        return HivePostIdentifier.getPostType(post) == HivePostIdentifier.CONTEST_POST_TYPE
+        return analysis.postType == HivePostIdentifier.CONTEST_POST_TYPE
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
 
-        if self._isContestPost(post):
-            if not self._hasContestLink(post.body):
+        if self._isContestPost(analysis):
+            if not self._hasContestLink(analysis):
                 return SuspiciousActivityReport(
                     post.author,
                     post.permlink,
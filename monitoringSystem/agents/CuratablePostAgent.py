@@ -3,22 +3,23 @@ from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
 from services.Blacklisting import BlacklistHandler
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
-from services.HiveTools import HivePostIdentifier
+from services.HiveTools import HivePostAnalysis
 
 
 class CuratablePostAgent(Agent, ABC):
     _blacklistHandler: BlacklistHandler
 
     def __init__(self):
-        super().__init__(self.__class__.__name__)
+        # Runs after the objecting agents so wasPostAlreadyObjectedDuringCurrentSession is complete.
+        super().__init__(self.__class__.__name__, Agent.CPU_BOUND, 1)
 
     def onSetupRules(self, rules: dict):
         self._blacklistHandler = BlacklistHandler(rules['blacklistSourceUrl'])
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
         if self._blacklistHandler.isEmpty():
             return None, None
 
@@ -31,10 +32,10 @@ class CuratablePostAgent(Agent, ABC):
                 'https://peakd.com/{authorperm}'.format(
                     authorperm=post.authorperm
                 ),
-                {'postType': HivePostIdentifier.getPostType(post)}
+                {'postType': analysis.postType}
             ), None
 
-        if not self._blacklistHandler.isBlacklisted(post.author) and 'lmac' not in post.cachedVotes.keys():
+        if not self._blacklistHandler.isBlacklisted(post.author) and 'lmac' not in post.votes.keys():
             return SuspiciousActivityReport(
                 post.author,
                 post.permlink,
@@ -43,7 +44,7 @@ class CuratablePostAgent(Agent, ABC):
                 'https://peakd.com/{authorperm}'.format(
                     authorperm=post.authorperm
                 ),
-                {'postType': HivePostIdentifier.getPostType(post)}
+                {'postType': analysis.postType}
             ), None
 
         return None, None
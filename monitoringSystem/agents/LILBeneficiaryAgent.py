@@ -5,7 +5,8 @@ from typing import Tuple, Optional
 from actionSystem.ActionHandling import PolicyAction
 from actionSystem.actions.MuteHivePostAction import MuteHivePostAction
 from services import HiveTools
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
 
@@ -21,23 +22,24 @@ class LILBeneficiaryAgent(Agent, ABC):
     def onSetupRules(self, rules: dict):
         self._lilBeneficiaryWeight = rules['lilBeneficiaryWeight']
 
-    def _getAllLILUrls(self, text: str):
-        urlMatches = re.findall(self._urlRegex, text)
+    def _getAllLILUrls(self, analysis: HivePostAnalysis):
         urls = []
-        for urlMatch in urlMatches:
-            urls.append(urlMatch)
+        # Proxied images embed the gallery link behind the proxy prefix, so search the whole url.
+        for url in analysis.urls:
+            for urlMatch in self._urlRegex.finditer(url):
+                urls.append(urlMatch.group(0))
         return urls
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
 
-        if HiveTools.HivePostIdentifier.getPostType(post) != HiveTools.HivePostIdentifier.CONTEST_POST_TYPE:
+        if analysis.postType != HiveTools.HivePostIdentifier.CONTEST_POST_TYPE:
             return None, None
 
-        lilUrlsFound = self._getAllLILUrls(post.body)
+        lilUrlsFound = self._getAllLILUrls(analysis)
 
         # OLD SOLUTION:
-        # if len(lilUrlsFound) > 0 and self._lilBeneficiaryWeight not in post.cachedBeneficiaries.values():
-        if len(lilUrlsFound) > 0 and len(post.cachedBeneficiaries.values()) < 2:  # temporary solution
+        # if len(lilUrlsFound) > 0 and self._lilBeneficiaryWeight not in post.beneficiaries.values():
+        if len(lilUrlsFound) > 0 and len(post.beneficiaries.values()) < 2:  # temporary solution
             return SuspiciousActivityReport(
                 post.author,
                 post.permlink,
@@ -5,7 +5,8 @@ from typing import Tuple, Optional
 from actionSystem.ActionHandling import PolicyAction
 from actionSystem.actions.MuteHivePostAction import MuteHivePostAction
 from services import HiveTools
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
 
@@ -19,9 +20,9 @@ class LILNoLILTableAgent(Agent, ABC):
     def onSetupRules(self, rules: dict):
         pass
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
 
-        if HiveTools.HivePostIdentifier.getPostType(post) != HiveTools.HivePostIdentifier.NO_LIL_TABLE_LIL_POST_TYPE:
+        if analysis.postType != HiveTools.HivePostIdentifier.NO_LIL_TABLE_LIL_POST_TYPE:
             return None, None
 
         return SuspiciousActivityReport(
@@ -3,7 +3,8 @@ from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
 from services import HiveTools
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
 
@@ -21,17 +22,16 @@ class LMACBeneficiaryAgent(Agent, ABC):
         self._minimumBenefication = rules['minimumBenefication']
         self._requiredBeneficiary = rules['requiredBeneficiary']
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
-        if HiveTools.HivePostIdentifier.getPostType(post) != HiveTools.HivePostIdentifier.CONTEST_POST_TYPE and \
-                HiveTools.HivePostIdentifier.getPostType(post) != HiveTools.HivePostIdentifier.LIL_POST_TYPE:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+        postType = analysis.postType
+        if postType != HiveTools.HivePostIdentifier.CONTEST_POST_TYPE and \
+                postType != HiveTools.HivePostIdentifier.LIL_POST_TYPE:
             return None, None
 
         if post.author == 'shaka':
             return None, None
 
-        postType = HiveTools.HivePostIdentifier.getPostType(post)
-
-        if 'imac' in post.cachedBeneficiaries:
+        if 'imac' in post.beneficiaries:
             return SuspiciousActivityReport(
                 post.author,
                 post.permlink,
@@ -42,8 +42,8 @@ class LMACBeneficiaryAgent(Agent, ABC):
                 {'postType': postType}
             ), None  # REMOVED DUE TO EMERGENCY DECISION: MuteHivePostAction(post, 'lmac beneficiary set to low.')
 
-        if self._requiredBeneficiary in post.cachedBeneficiaries.keys():
-            if post.cachedBeneficiaries[self._requiredBeneficiary] < self._minimumBenefication:
+        if self._requiredBeneficiary in post.beneficiaries.keys():
+            if post.beneficiaries[self._requiredBeneficiary] < self._minimumBenefication:
                 return SuspiciousActivityReport(
                     post.author,
                     post.permlink,
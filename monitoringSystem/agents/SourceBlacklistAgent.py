@@ -1,50 +1,41 @@
-import re
 from abc import ABC
 from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
 from actionSystem.actions.MuteHivePostAction import MuteHivePostAction
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
-from services.HiveTools import HivePostIdentifier
+from services.HiveTools import HivePostIdentifier, HivePostAnalysis
+from services.PatternMatching import MultiPatternMatcher
 
 
 class SourceBlacklistAgent(Agent, ABC):
-    _blacklist: list
+    _blacklistMatcher: MultiPatternMatcher
 
     def __init__(self):
         super().__init__(self.__class__.__name__)
-        self._blacklist = []
-        self._urlRegex = re.compile(r'((https?):((//)|(\\\\))+([\w\d:#@%/;$()~_?\+-=\\\.&](#!)?)*)', re.DOTALL)
+        self._blacklistMatcher = MultiPatternMatcher([])
 
     def onSetupRules(self, rules: dict):
-        self._blacklist = rules['blacklist']
-
-    def _getAllUrls(self, text: str):
-        urlMatches = re.findall(self._urlRegex, text)
-        urls = []
-        for urlMatch in urlMatches:
-            urls.append(urlMatch[0])
-        return urls
+        self._blacklistMatcher = MultiPatternMatcher(rules['blacklist'])
 
     @staticmethod
-    def _isContestPost(post: HiveComment):
-        return HivePostIdentifier.getPostType(post) == HivePostIdentifier.CONTEST_POST_TYPE
+    def _isContestPost(analysis: HivePostAnalysis):
+        return analysis.postType == HivePostIdentifier.CONTEST_POST_TYPE
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
 
-        if not self._isContestPost(post):
+        if not self._isContestPost(analysis):
             return None, None
 
-        urls = self._getAllUrls(post.body)
+        urls = analysis.urls
         unwantedUrlsFound = []
         for url in urls:
-            for blacklistRegex in self._blacklist:
-                if not re.search(blacklistRegex, url):
-                    continue
+            if not self._blacklistMatcher.matches(url):
+                continue
 
-                unwantedUrlsFound.append(url)
+            unwantedUrlsFound.append(url)
 
         if len(unwantedUrlsFound) > 0:
             return SuspiciousActivityReport(
@@ -2,7 +2,8 @@ from abc import ABC
 from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
 
@@ -17,20 +18,20 @@ class SuspectHunterAgent(Agent, ABC):
     def onSetupRules(self, rules: dict):
         self._downvoterIndicators = rules['downvoterIndicators']
 
-    def _hasPostDownvoteIndicator(self, post: HiveComment):
+    def _hasPostDownvoteIndicator(self, post: HivePost):
 
         downvoters: list = []
 
         for downvoteIndicator in self._downvoterIndicators:
-            if downvoteIndicator not in post.cachedVotes.keys():
+            if downvoteIndicator not in post.votes.keys():
                 continue
 
-            if int(post.cachedVotes[downvoteIndicator]) < 0:
+            if int(post.votes[downvoteIndicator]) < 0:
                 downvoters.append(downvoteIndicator)
 
         return downvoters
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
 
         downvoters = self._hasPostDownvoteIndicator(post)
         if len(downvoters) > 0:
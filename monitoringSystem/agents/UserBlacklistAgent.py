@@ -5,7 +5,8 @@ from abc import ABC
 from typing import Tuple, Optional
 
 from actionSystem.ActionHandling import PolicyAction
-from services.HiveNetwork import HiveComment
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
 from monitoringSystem.MonitoringAgency import Agent
 from reportingSystem.Reporting import SuspiciousActivityReport, SuspiciousActivityLevel
 from services.Registry import RegistryHandler
@@ -26,7 +27,7 @@ class UserBlacklistAgent(Agent, ABC):
         self._sourceUrl = rules['sourceUrl']
         self._blacklist = self._loadBlacklist()
 
-    def onSuspicionQuery(self, post: HiveComment) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
+    def onSuspicionQuery(self, post: HivePost, analysis: HivePostAnalysis) -> Tuple[Optional[SuspiciousActivityReport], Optional[PolicyAction]]:
         if len(self._blacklist) == 0:
             return None, None
 
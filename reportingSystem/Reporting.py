@@ -82,6 +82,9 @@ class Reporter(ABC):
     def onStart(self, arguments: dict):
         pass
 
+    def onBeforeReportsPromoted(self, reports: list):
+        pass
+
 
 class ReportDispatcher:
     _reporters: list
@@ -110,6 +113,12 @@ class ReportDispatcher:
     def handOverReport(self, report: SuspiciousActivityReport):
         self._reports.append(report)
 
+    def takeReports(self) -> list:
+        reports = self._reports
+        self._reports = []
+
+        return reports
+
     def _unifyReports(self):
         unifiedReports = []
         hiveLinkKeyedReports = {}
@@ -143,6 +152,11 @@ class ReportDispatcher:
 
     def promoteReports(self):
         # self._unifyReports()
+        for reporter in self._reporters:
+            reporter.onBeforeReportsPromoted(self._reports)
+
         for report in self._reports:
             for reporter in self._reporters:
                 reporter.onNewReportAvailable(report)
+
+        self._reports = []
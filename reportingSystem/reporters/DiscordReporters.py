@@ -30,6 +30,10 @@ class ViolationReporter(Reporter):
     def onStart(self, arguments: dict):
         self._settingsByLevel = arguments['settingsByLevel']
 
+        for levelSettings in self._settingsByLevel.values():
+            if levelSettings.get('discordWebhookUrl'):
+                self._discordDispatcher.registerWebhook(levelSettings['discordTargetChatroom'], levelSettings['discordWebhookUrl'])
+
 
 class BlacklistedUserReporter(Reporter):
     _discordDispatcher: DiscordDispatcher
@@ -54,6 +58,9 @@ class BlacklistedUserReporter(Reporter):
     def onStart(self, arguments: dict):
         self._reportInDiscordChannelId = arguments['reportInDiscordChannelId']
 
+        if arguments.get('discordWebhookUrl'):
+            self._discordDispatcher.registerWebhook(self._reportInDiscordChannelId, arguments['discordWebhookUrl'])
+
 
 class CuratablePostReporter(Reporter):
     _discordDispatcher: DiscordDispatcher
@@ -62,9 +69,14 @@ class CuratablePostReporter(Reporter):
         self._discordDispatcher = DiscordDispatcher()
         self._reportInDiscordChannelId = 0
 
+    def onBeforeReportsPromoted(self, reports: list):
+        # Load the statistics of all authors at once instead of one after another while formatting.
+        HiveHandler().prefetchSubscriberInfos(
+            [report.author for report in reports if CuratablePostReporter._isCuratableReport(report)]
+        )
+
     def onNewReportAvailable(self, report: SuspiciousActivityReport):
-        if not (report.activityLevel == SuspiciousActivityLevel.NEW_CURATABLE_CONTRIBUTION
-                or report.activityLevel == SuspiciousActivityLevel.NEW_MAYBE_NOT_CURATABLE_CONTRIBUTION):
+        if not CuratablePostReporter._isCuratableReport(report):
             return
 
         additionalInfo: str = ''
@@ -87,6 +99,14 @@ class CuratablePostReporter(Reporter):
     def onStart(self, arguments: dict):
         self._reportInDiscordChannelId = arguments['reportInDiscordChannelId']
 
+        if arguments.get('discordWebhookUrl'):
+            self._discordDispatcher.registerWebhook(self._reportInDiscordChannelId, arguments['discordWebhookUrl'])
+
+    @staticmethod
+    def _isCuratableReport(report: SuspiciousActivityReport) -> bool:
+        return report.activityLevel == SuspiciousActivityLevel.NEW_CURATABLE_CONTRIBUTION \
+            or report.activityLevel == SuspiciousActivityLevel.NEW_MAYBE_NOT_CURATABLE_CONTRIBUTION
+
     @staticmethod
     def formatNotification(report: SuspiciousActivityReport, subscriberInfo: dict, additionalInfo: str) -> str:
 
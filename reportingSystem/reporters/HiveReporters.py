@@ -17,14 +17,17 @@ class LMACBeneficiaryHiveReporter(Reporter):
         if report.agentId != 'LMAC Beneficiary Agent':
             return
 
+        templateId = 'lmacSubmissionBeneficiary' if report.meta['postType'] == HiveTools.HivePostIdentifier.CONTEST_POST_TYPE else 'lilSubmissionBeneficiary'
+
         self._hiveHandler.enqueueMessage(
             report.author,
             report.permlink,
             self._templateEngine.createContent(
-                'lmacSubmissionBeneficiary' if report.meta['postType'] == HiveTools.HivePostIdentifier.CONTEST_POST_TYPE else 'lilSubmissionBeneficiary',
+                templateId,
                 author=report.author,
                 postSubject='LMAC contest' if report.meta['postType'] == HiveTools.HivePostIdentifier.CONTEST_POST_TYPE else '#LIL'
-            )
+            ),
+            templateId
         )
 
     def onStart(self, arguments: dict):
@@ -50,7 +53,8 @@ class LILBeneficiaryHiveReporter(Reporter):
                 'lilUseBeneficiary',
                 author=report.author,
                 postSubject='LMAC contest'
-            )
+            ),
+            'lilUseBeneficiary'
         )
 
     def onStart(self, arguments: dict):
@@ -76,7 +80,8 @@ class ContestLinkHiveReporter(Reporter):
                 'contestLinkMissing',
                 author=report.author,
                 postSubject='LMAC contest'
-            )
+            ),
+            'contestLinkMissing'
         )
 
     def onStart(self, arguments: dict):
@@ -102,7 +107,8 @@ class NOLILTableHiveReporter(Reporter):
                 'lilMissingLILTable',
                 author=report.author,
                 postSubject='LIL'
-            )
+            ),
+            'lilMissingLILTable'
         )
 
     def onStart(self, arguments: dict):
@@ -0,0 +1,114 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+from beem import Hive
+from beem.account import Account
+
+from services.Metrics import Metrics
+from services.Registry import RegistryHandler
+
+
+class AuthorStatistics:
+    DEFAULT_WORKERS: int = 8
+
+    _hive: Hive
+    _hiveFactory: Callable[[], Hive]
+    _idleHives: queue.Queue
+    _communityTag: str
+    _workers: int
+    _registryHandler: RegistryHandler
+    _statistics: Dict[str, dict]
+    _refreshedAuthors: Set[str]
+    _lock: threading.Lock
+
+    def __init__(self, hive: Hive, hiveFactory: Callable[[], Hive], communityTag: str, workers: int = DEFAULT_WORKERS):
+        self._hive = hive
+        self._hiveFactory = hiveFactory
+        self._idleHives = queue.Queue()
+        self._communityTag = communityTag
+        self._workers = max(1, workers)
+        self._registryHandler = RegistryHandler()
+        self._statistics = self._registryHandler.getProperty('AuthorStatistics', 'authors', {})
+        self._refreshedAuthors = set()
+        self._lock = threading.Lock()
+
+    def getStatistics(self, author: str) -> dict:
+        Metrics().recordCacheLookup('authorStatistics', author in self._refreshedAuthors)
+        if author not in self._refreshedAuthors:
+            self._refresh(author, self._hive)
+
+        with self._lock:
+            return self._statistics[author]
+
+    def prefetch(self, authors: Iterable[str]):
+        authors = [author for author in set(authors) if author not in self._refreshedAuthors]
+        if len(authors) == 0:
+            return
+
+        workers = min(self._workers, len(authors))
+        # beem Hive instances are not thread-safe, so every worker borrows one of its own. They are kept for later cycles.
+        while self._idleHives.qsize() < workers:
+            self._idleHives.put(self._hiveFactory())
+
+        with ThreadPoolExecutor(workers) as executor:
+            list(executor.map(self._refreshWithIdleHive, authors))
+
+    def finishCycle(self):
+        with self._lock:
+            self._registryHandler.setProperty('AuthorStatistics', 'authors', self._statistics)
+            self._refreshedAuthors = set()
+
+    def _refreshWithIdleHive(self, author: str):
+        hive = self._idleHives.get()
+        try:
+            self._refresh(author, hive)
+        finally:
+            self._idleHives.put(hive)
+
+    def _refresh(self, author: str, hive: Hive):
+        with self._lock:
+            statistics = dict(self._statistics.get(author, {
+                'posts': 0,
+                'comments': 0,
+                'newestPost': None,
+                'newestComment': None
+            }))
+
+        account = Account(author, blockchain_instance=hive)
+        statistics['posts'], statistics['newestPost'] = self._countNewEntries(
+            account.blog_history(),
+            statistics['posts'],
+            statistics['newestPost']
+        )
+        statistics['comments'], statistics['newestComment'] = self._countNewEntries(
+            account.comment_history(),
+            statistics['comments'],
+            statistics['newestComment']
+        )
+
+        with self._lock:
+            self._statistics[author] = statistics
+            self._refreshedAuthors.add(author)
+
+    def _countNewEntries(self, history: Iterable, count: int, newestKnownEntry: Optional[str]) -> Tuple[int, Optional[str]]:
+        # Histories are returned newest first, so everything up to the newest entry of the last walk is new.
+        newestEntry = None
+        for comment in history:
+            if comment.get('stats', {}).get('is_pinned', False):
+                # Pinned posts lead the history regardless of their age and were counted by the first walk.
+                if newestKnownEntry is None and comment.category == self._communityTag:
+                    count += 1
+                continue
+
+            if comment.authorperm == newestKnownEntry:
+                break
+
+            if newestEntry is None:
+                newestEntry = comment.authorperm
+
+            if comment.category == self._communityTag:
+                count += 1
+
+        return count, newestEntry if newestEntry is not None else newestKnownEntry
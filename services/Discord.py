@@ -1,9 +1,15 @@
-from typing import Any
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
 
 import discord as discord
 from discord import Intents
 from discord.ext import tasks
 
+from services.DiscordDelivery import DiscordDeliveryEngine, GatewayDiscordSender, RestDiscordSender, \
+    WebhookDiscordSender, DiscordSender, discordLogger
+
 
 class DiscordMessage:
     _message: str
@@ -31,11 +37,13 @@ class DiscordMessage:
 class DiscordMessageTransponder(discord.Client):
     _channelId: int
     _messages: list
+    _persistent: bool
 
     def __init__(self, *, intents: Intents, **options: Any):
         super().__init__(intents=intents, **options)
 
         self._messages = options['messages']
+        self._persistent = options.get('persistent', False)
         # start the task to run in the background
 
     async def on_ready(self):
@@ -43,17 +51,22 @@ class DiscordMessageTransponder(discord.Client):
         print('------')
         self._sendMessagesTask.start()
 
-    @tasks.loop(seconds=5)
+    @tasks.loop(seconds=1)
     async def _sendMessagesTask(self):
-        nextMessage: DiscordMessage = None
-        try:
-            nextMessage = self._messages.pop(0)
-        except IndexError:
-            await self.close()
+        if len(self._messages) == 0:
+            # A persistent transponder stays logged in and waits for the next monitoring cycle.
+            if not self._persistent:
+                await self.close()
             return
 
-        channel = self.get_channel(nextMessage.channelId)
-        await channel.send(nextMessage.message)
+        messages = self._messages[:]
+        del self._messages[:len(messages)]
+
+        undelivered = await DiscordDeliveryEngine(GatewayDiscordSender(self)).deliver(messages)
+        # Undelivered messages go back to the queue, a closing transponder leaves them for the next cycle.
+        self._messages.extend(DiscordMessage(content, channelId) for channelId, content in undelivered)
+        if len(undelivered) > 0 and not self._persistent:
+            await self.close()
 
     @_sendMessagesTask.before_loop
     async def _beforeSendMessagesTask(self):
@@ -61,10 +74,19 @@ class DiscordMessageTransponder(discord.Client):
 
 
 class DiscordDispatcher:
+    REST_DELIVERY: str = 'rest'
+    GATEWAY_DELIVERY: str = 'gateway'
+
     _instance = None
+    _delivery: str
+    _apiBaseUrl: str
+    _webhookUrls: Dict[int, str]
+    _webhookQueue: list
     _messageQueue: list
     _channelId: int
     _simulate: bool
+    _persistentTransponder: Optional[DiscordMessageTransponder]
+    _persistentThread: Optional[threading.Thread]
 
     def __new__(cls):
         if cls._instance is None:
@@ -72,27 +94,100 @@ class DiscordDispatcher:
             cls._messageQueue = []
             cls._simulate = False
             cls._channelId = 0
+            cls._persistentTransponder = None
+            cls._persistentThread = None
+            cls._delivery = DiscordDispatcher.REST_DELIVERY
+            cls._apiBaseUrl = RestDiscordSender.DEFAULT_API_BASE_URL
+            cls._webhookUrls = {}
+            cls._webhookQueue = []
 
         return cls._instance
 
+    def configureDelivery(self, delivery: str, apiBaseUrl: str = RestDiscordSender.DEFAULT_API_BASE_URL):
+        self._delivery = delivery
+        self._apiBaseUrl = apiBaseUrl
+
+    def registerWebhook(self, channelId: int, webhookUrl: str):
+        self._webhookUrls[channelId] = webhookUrl
+
     def enqueueMessage(self, message: str):
-        self._messageQueue.append(DiscordMessage(message, self._channelId))
+        # Webhook channels are kept apart so the gateway transponder never picks them up.
+        if self._channelId in self._webhookUrls.keys():
+            self._webhookQueue.append(DiscordMessage(message, self._channelId))
+        else:
+            self._messageQueue.append(DiscordMessage(message, self._channelId))
 
     def enterChatroom(self, channelId: int):
         self._channelId = channelId
 
     def runDiscordTasks(self, discordToken: str):
         if self._simulate:
-            print('Running discord tasks: {tasks}'.format(tasks=str(self._messageQueue)))
+            discordLogger.logger().info('Running discord tasks: {tasks}'.format(tasks=str(self._webhookQueue + self._messageQueue)))
+            self._webhookQueue.clear()
+            self._messageQueue.clear()
+            return
+
+        self._deliverQueuedMessages(self._webhookQueue, WebhookDiscordSender(self._webhookUrls))
+
+        if self._delivery == DiscordDispatcher.REST_DELIVERY:
+            self._deliverQueuedMessages(self._messageQueue, RestDiscordSender(discordToken, self._apiBaseUrl))
             return
 
+        # The gateway is only booted when messages for channels without a webhook remain.
         if len(self._messageQueue) == 0:
             return
 
+        # The persistent transponder shares the queue and drains it in the background.
+        if self._persistentThread is not None and self._persistentThread.is_alive():
+            return
+
         intents = discord.Intents.default()
 
         transponder = DiscordMessageTransponder(messages=self._messageQueue, intents=intents)
         transponder.run(discordToken)
 
+    @staticmethod
+    def _deliverQueuedMessages(queue: list, sender: DiscordSender):
+        if len(queue) == 0:
+            return
+
+        messages = queue[:]
+        del queue[:len(messages)]
+
+        undelivered = asyncio.run(DiscordDeliveryEngine(sender).deliver(messages))
+        queue.extend(DiscordMessage(content, channelId) for channelId, content in undelivered)
+
+    def startPersistentSession(self, discordToken: str):
+        # Only the gateway needs a long-lived login, REST deliveries are stateless.
+        if self._simulate or self._persistentThread is not None or self._delivery != DiscordDispatcher.GATEWAY_DELIVERY:
+            return
+
+        self._persistentTransponder = DiscordMessageTransponder(
+            messages=self._messageQueue,
+            intents=discord.Intents.default(),
+            persistent=True
+        )
+        self._persistentThread = threading.Thread(
+            target=self._persistentTransponder.run,
+            args=(discordToken,),
+            daemon=True
+        )
+        self._persistentThread.start()
+
+    def closePersistentSession(self, timeoutInSeconds: float):
+        if self._persistentThread is None:
+            return
+
+        deadline = time.time() + timeoutInSeconds
+        while len(self._messageQueue) > 0 and self._persistentThread.is_alive() and time.time() < deadline:
+            time.sleep(1.0)
+
+        if self._persistentThread.is_alive():
+            asyncio.run_coroutine_threadsafe(self._persistentTransponder.close(), self._persistentTransponder.loop)
+            self._persistentThread.join(max(1.0, deadline - time.time()))
+
+        self._persistentTransponder = None
+        self._persistentThread = None
+
     def setSimulationMode(self, simulate: bool):
         self._simulate = simulate
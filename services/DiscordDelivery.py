@@ -0,0 +1,194 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from services.AspectLogging import LogAspect
+
+discordLogger: LogAspect = LogAspect('Discord')
+
+
+class DiscordDeliveryError(IOError):
+    pass
+
+
+class DiscordSender(ABC):
+    async def open(self):
+        pass
+
+    async def close(self):
+        pass
+
+    @abstractmethod
+    async def send(self, channelId: int, content: str):
+        pass
+
+
+class RestDiscordSender(DiscordSender):
+    DEFAULT_API_BASE_URL: str = 'https://discord.com/api/v10'
+    MAX_ATTEMPTS: int = 5
+
+    _token: str
+    _apiBaseUrl: str
+    _session: Optional[aiohttp.ClientSession]
+    _routeLimits: Dict[int, Tuple[int, float]]
+    _globalResetAt: float
+
+    def __init__(self, token: str, apiBaseUrl: str = DEFAULT_API_BASE_URL):
+        self._token = token
+        self._apiBaseUrl = apiBaseUrl.rstrip('/')
+        self._session = None
+        self._routeLimits = {}
+        self._globalResetAt = 0.0
+
+    async def open(self):
+        if self._session is None:
+            self._session = aiohttp.ClientSession(headers=self._createHeaders())
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _createHeaders(self) -> dict:
+        return {'Authorization': 'Bot {token}'.format(token=self._token)}
+
+    def _getMessageUrl(self, channelId: int) -> str:
+        return '{baseUrl}/channels/{channelId}/messages'.format(baseUrl=self._apiBaseUrl, channelId=channelId)
+
+    async def send(self, channelId: int, content: str):
+        url = self._getMessageUrl(channelId)
+
+        for attempt in range(RestDiscordSender.MAX_ATTEMPTS):
+            await self._waitForRoute(channelId)
+
+            async with self._session.post(url, json={'content': content}) as response:
+                self._updateRouteLimit(channelId, response.headers)
+
+                if response.status == 429:
+                    retryInformation = await response.json()
+                    retryAt = time.monotonic() + float(retryInformation.get('retry_after', 1.0))
+                    if retryInformation.get('global', False):
+                        self._globalResetAt = retryAt
+                    else:
+                        self._routeLimits[channelId] = (0, retryAt)
+                    continue
+
+                if response.status >= 400:
+                    raise DiscordDeliveryError('Discord rejected a message for channel {channelId}: HTTP {status}'.format(
+                        channelId=channelId,
+                        status=response.status
+                    ))
+
+                return
+
+        raise DiscordDeliveryError('Discord kept rate limiting channel {channelId}.'.format(channelId=channelId))
+
+    async def _waitForRoute(self, channelId: int):
+        remaining, resetAt = self._routeLimits.get(channelId, (1, 0.0))
+        waitUntil = max(self._globalResetAt, resetAt if remaining <= 0 else 0.0)
+        delay = waitUntil - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _updateRouteLimit(self, channelId: int, headers):
+        # Message routes are limited per channel, Discord announces the state of the bucket with every response.
+        if 'X-RateLimit-Remaining' not in headers or 'X-RateLimit-Reset-After' not in headers:
+            return
+
+        self._routeLimits[channelId] = (
+            int(headers['X-RateLimit-Remaining']),
+            time.monotonic() + float(headers['X-RateLimit-Reset-After'])
+        )
+
+
+class WebhookDiscordSender(RestDiscordSender):
+    _webhookUrls: Dict[int, str]
+
+    def __init__(self, webhookUrls: Dict[int, str]):
+        super().__init__('')
+        self._webhookUrls = webhookUrls
+
+    def _createHeaders(self) -> dict:
+        # The webhook url carries its own token, no bot login is involved.
+        return {}
+
+    def _getMessageUrl(self, channelId: int) -> str:
+        return self._webhookUrls[channelId]
+
+
+class GatewayDiscordSender(DiscordSender):
+    _client: object
+
+    def __init__(self, client):
+        self._client = client
+
+    async def send(self, channelId: int, content: str):
+        # discord.py applies the route rate limits of its own HTTP client.
+        channel = self._client.get_channel(channelId)
+        if channel is None:
+            raise DiscordDeliveryError('Unknown Discord channel {channelId}.'.format(channelId=channelId))
+
+        await channel.send(content)
+
+
+class DiscordDeliveryEngine:
+    MAX_MESSAGE_LENGTH: int = 2000
+
+    _sender: DiscordSender
+
+    def __init__(self, sender: DiscordSender):
+        self._sender = sender
+
+    @staticmethod
+    def coalesce(messages: list, maxLength: int = MAX_MESSAGE_LENGTH) -> Dict[int, List[str]]:
+        # Join consecutive messages of the same channel, splitting oversized ones at line breaks.
+        contentsByChannel: Dict[int, List[str]] = {}
+        for message in messages:
+            contents = contentsByChannel.setdefault(message.channelId, [])
+            for part in DiscordDeliveryEngine._split(message.message, maxLength):
+                if len(contents) > 0 and len(contents[-1]) + 1 + len(part) <= maxLength:
+                    contents[-1] = '{previous}\n{part}'.format(previous=contents[-1], part=part)
+                else:
+                    contents.append(part)
+
+        return contentsByChannel
+
+    async def deliver(self, messages: list) -> List[Tuple[int, str]]:
+        contentsByChannel = DiscordDeliveryEngine.coalesce(messages)
+
+        await self._sender.open()
+        try:
+            # Channels have independent rate limits, so they are served concurrently but in order within a channel.
+            undelivered = await asyncio.gather(*[
+                self._deliverToChannel(channelId, contents) for channelId, contents in contentsByChannel.items()
+            ])
+        finally:
+            await self._sender.close()
+
+        return [entry for channelEntries in undelivered for entry in channelEntries]
+
+    async def _deliverToChannel(self, channelId: int, contents: List[str]) -> List[Tuple[int, str]]:
+        for index, content in enumerate(contents):
+            try:
+                await self._sender.send(channelId, content)
+            except (DiscordDeliveryError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+                discordLogger.logger().warning('Discord delivery to channel {channelId} failed: {error}'.format(channelId=channelId, error=error))
+                return [(channelId, remainingContent) for remainingContent in contents[index:]]
+
+        return []
+
+    @staticmethod
+    def _split(text: str, maxLength: int) -> List[str]:
+        parts = []
+        while len(text) > maxLength:
+            cut = text.rfind('\n', 0, maxLength)
+            if cut <= 0:
+                cut = maxLength
+            parts.append(text[:cut])
+            text = text[cut:].lstrip('\n')
+        parts.append(text)
+
+        return parts
@@ -0,0 +1,183 @@
+import calendar
+import datetime
+import heapq
+import math
+import time
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Tuple
+
+from services.HiveRpcBatcher import HiveRpcBatcher
+
+
+class HiveBlockStream:
+    BLOCK_INTERVAL_IN_SECONDS: int = 3
+    DEFAULT_BLOCKS_PER_REQUEST: int = 50
+    DEFAULT_MAX_BLOCKS_PER_POLL: int = 2400
+    MAX_BLOCK_SEARCH_STEPS: int = 8
+
+    _rpcBatcher: HiveRpcBatcher
+    _hiveCommunityId: str
+    _minimumAgeInSeconds: int
+    _blocksPerRequest: int
+    _maxBlocksPerPoll: int
+    _followIrreversible: bool
+    _nextBlockNum: Optional[int]
+    _schedule: List[Tuple[float, str, str]]
+    _scheduledPosts: set
+    _clock: Callable[[], float]
+
+    def __init__(self, rpcBatcher: HiveRpcBatcher, hiveCommunityId: str, minimumAgeInSeconds: int = 3600,
+                 blocksPerRequest: int = DEFAULT_BLOCKS_PER_REQUEST, maxBlocksPerPoll: int = DEFAULT_MAX_BLOCKS_PER_POLL,
+                 followIrreversible: bool = True, clock: Callable[[], float] = time.time):
+        self._rpcBatcher = rpcBatcher
+        self._hiveCommunityId = hiveCommunityId
+        self._minimumAgeInSeconds = minimumAgeInSeconds
+        self._blocksPerRequest = max(1, blocksPerRequest)
+        self._maxBlocksPerPoll = max(1, maxBlocksPerPoll)
+        self._followIrreversible = followIrreversible
+        self._nextBlockNum = None
+        self._schedule = []
+        self._scheduledPosts = set()
+        self._clock = clock
+
+    @property
+    def nextBlockNum(self) -> Optional[int]:
+        return self._nextBlockNum
+
+    @property
+    def scheduledPostsCount(self) -> int:
+        return len(self._schedule)
+
+    def exportState(self) -> dict:
+        return {
+            'nextBlockNum': self._nextBlockNum,
+            'schedule': [[dueAt, author, permlink] for dueAt, author, permlink in sorted(self._schedule)]
+        }
+
+    def restoreState(self, state: dict):
+        self._nextBlockNum = state.get('nextBlockNum')
+        self._schedule = []
+        self._scheduledPosts = set()
+        for dueAt, author, permlink in state.get('schedule', []):
+            self._schedulePost(dueAt, author, permlink)
+
+    def poll(self) -> List[Tuple[str, str]]:
+        self.readNewBlocks()
+        return self.popDuePosts()
+
+    def readNewBlocks(self):
+        lastBlockNum = self._getLastBlockNum()
+        if self._nextBlockNum is None:
+            # Start far enough back that posts which reach the minimum age right now are not missed.
+            self._nextBlockNum = max(1, lastBlockNum - math.ceil(self._minimumAgeInSeconds / HiveBlockStream.BLOCK_INTERVAL_IN_SECONDS))
+
+        endBlockNum = min(lastBlockNum, self._nextBlockNum + self._maxBlocksPerPoll - 1)
+        if endBlockNum < self._nextBlockNum:
+            return
+
+        self.ingestBlocks(self._fetchBlocks(self._nextBlockNum, endBlockNum))
+        self._nextBlockNum = endBlockNum + 1
+
+    def ingestBlocks(self, blocks: List[dict]):
+        for blockTime, author, permlink in self._extractCommunityPosts(blocks):
+            self._schedulePost(blockTime + self._minimumAgeInSeconds, author, permlink)
+
+    def readCommunityPosts(self, startBlockNum: int, endBlockNum: int, executor: Optional[Executor] = None) -> List[Tuple[float, str, str]]:
+        # Reads a fixed block range without touching the schedule. Only the first sighting of a post is returned.
+        sightings = []
+        seenPosts = set()
+        for chunkStartBlockNum in range(startBlockNum, endBlockNum + 1, self._maxBlocksPerPoll):
+            blocks = self._fetchBlocks(chunkStartBlockNum, min(endBlockNum, chunkStartBlockNum + self._maxBlocksPerPoll - 1), executor)
+            for blockTime, author, permlink in self._extractCommunityPosts(blocks):
+                if (author, permlink) in seenPosts:
+                    continue
+
+                seenPosts.add((author, permlink))
+                sightings.append((blockTime, author, permlink))
+
+        return sightings
+
+    def findBlockNum(self, timestamp: float) -> int:
+        # Missed slots make the three second estimate drift, so it is corrected against the headers it lands on.
+        properties = self._rpcBatcher.call('condenser_api.get_dynamic_global_properties', [])
+        headBlockNum = int(properties['head_block_number'])
+        blockNum = headBlockNum
+        blockTime = HiveBlockStream._parseTimestamp(properties['time'])
+
+        for step in range(HiveBlockStream.MAX_BLOCK_SEARCH_STEPS):
+            offset = int((timestamp - blockTime) / HiveBlockStream.BLOCK_INTERVAL_IN_SECONDS)
+            if offset == 0:
+                break
+
+            blockNum = max(1, min(headBlockNum, blockNum + offset))
+            header = self._rpcBatcher.call('block_api.get_block_header', {'block_num': blockNum})
+            blockTime = HiveBlockStream._parseTimestamp(header['header']['timestamp'])
+
+        return blockNum
+
+    def _extractCommunityPosts(self, blocks: List[dict]) -> List[Tuple[float, str, str]]:
+        communityPosts = []
+        for block in blocks:
+            blockTime = HiveBlockStream._parseTimestamp(block['timestamp'])
+            for transaction in block.get('transactions', []):
+                for operation in transaction.get('operations', []):
+                    if operation.get('type') != 'comment_operation':
+                        continue
+
+                    value = operation['value']
+                    if value['parent_author'] != '' or value['parent_permlink'] != self._hiveCommunityId:
+                        continue
+
+                    communityPosts.append((blockTime, value['author'], value['permlink']))
+
+        return communityPosts
+
+    @staticmethod
+    def _parseTimestamp(timestamp: str) -> float:
+        return calendar.timegm(datetime.datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S').timetuple())
+
+    def popDuePosts(self) -> List[Tuple[str, str]]:
+        now = self._clock()
+        duePosts = []
+        while len(self._schedule) > 0 and self._schedule[0][0] <= now:
+            dueAt, author, permlink = heapq.heappop(self._schedule)
+            self._scheduledPosts.discard((author, permlink))
+            duePosts.append((author, permlink))
+
+        return duePosts
+
+    def retryPosts(self, authorPermlinks: List[Tuple[str, str]]):
+        # Posts that could not be loaded after they were due are due again on the next poll.
+        now = self._clock()
+        for author, permlink in authorPermlinks:
+            self._schedulePost(now, author, permlink)
+
+    def _schedulePost(self, dueAt: float, author: str, permlink: str):
+        # Edits emit another comment operation; the first sighting decides when the post is due.
+        if (author, permlink) in self._scheduledPosts:
+            return
+
+        self._scheduledPosts.add((author, permlink))
+        heapq.heappush(self._schedule, (dueAt, author, permlink))
+
+    def _getLastBlockNum(self) -> int:
+        properties = self._rpcBatcher.call('condenser_api.get_dynamic_global_properties', [])
+        if self._followIrreversible:
+            return int(properties['last_irreversible_block_num'])
+
+        return int(properties['head_block_number'])
+
+    def _fetchBlocks(self, startBlockNum: int, endBlockNum: int, executor: Optional[Executor] = None) -> List[dict]:
+        calls = []
+        for blockNum in range(startBlockNum, endBlockNum + 1, self._blocksPerRequest):
+            calls.append(self._rpcBatcher.queue('block_api.get_block_range', {
+                'starting_block_num': blockNum,
+                'count': min(self._blocksPerRequest, endBlockNum - blockNum + 1)
+            }))
+        self._rpcBatcher.flush(executor)
+
+        blocks = []
+        for call in calls:
+            blocks.extend(call.result['blocks'])
+
+        return blocks
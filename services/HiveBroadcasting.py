@@ -0,0 +1,268 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from beem import Hive
+from beem.transactionbuilder import TransactionBuilder
+from beem.utils import derive_permlink
+from beembase import operations
+
+from services.AspectLogging import LogAspect
+
+broadcastLogger: LogAspect = LogAspect('HiveBroadcasting')
+
+
+class TokenBucket:
+    _tokensPerSecond: float
+    _capacity: float
+    _tokens: float
+    _updatedAt: float
+    _clock: Callable[[], float]
+    _sleep: Callable[[float], None]
+    _lock: threading.Lock
+
+    def __init__(self, tokensPerSecond: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._tokensPerSecond = tokensPerSecond
+        self._capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updatedAt = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        waitedSeconds = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updatedAt) * self._tokensPerSecond)
+                self._updatedAt = now
+
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waitedSeconds
+
+                delay = (tokens - self._tokens) / self._tokensPerSecond
+
+            self._sleep(delay)
+            waitedSeconds += delay
+
+
+class VirtualClock:
+    _now: float
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._now = 0.0
+        self._lock = threading.Lock()
+
+    def time(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        with self._lock:
+            self._now += seconds
+
+
+class BroadcastStatistics:
+    _operations: int
+    _transactions: int
+    _failures: int
+    _durationInSeconds: float
+
+    def __init__(self, operations: int = 0, transactions: int = 0, failures: int = 0, durationInSeconds: float = 0.0):
+        self._operations = operations
+        self._transactions = transactions
+        self._failures = failures
+        self._durationInSeconds = durationInSeconds
+
+    @property
+    def operations(self) -> int:
+        return self._operations
+
+    @property
+    def transactions(self) -> int:
+        return self._transactions
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def durationInSeconds(self) -> float:
+        return self._durationInSeconds
+
+    @property
+    def operationsPerSecond(self) -> float:
+        if self._durationInSeconds <= 0:
+            return float(self._operations)
+
+        return self._operations / self._durationInSeconds
+
+    def merge(self, other: 'BroadcastStatistics', durationInSeconds: float) -> 'BroadcastStatistics':
+        return BroadcastStatistics(
+            self._operations + other.operations,
+            self._transactions + other.transactions,
+            self._failures + other.failures,
+            durationInSeconds
+        )
+
+    def __str__(self):
+        return 'Broadcast {operations} operations in {transactions} transactions ({failures} failed) within {duration:.1f}s, {rate:.2f} ops/s'.format(
+            operations=self._operations,
+            transactions=self._transactions,
+            failures=self._failures,
+            duration=self._durationInSeconds,
+            rate=self.operationsPerSecond
+        )
+
+
+class HiveBroadcaster:
+    # Hive accepts one comment per author every three seconds, so comments travel alone. Community
+    # mutes are custom_json operations that may share a transaction.
+    DEFAULT_COMMENT_INTERVAL_IN_SECONDS: float = 3.0
+    DEFAULT_MUTE_TRANSACTION_INTERVAL_IN_SECONDS: float = 3.0
+    DEFAULT_MAX_MUTES_PER_TRANSACTION: int = 5
+
+    _hive: Hive
+    _username: str
+    _hiveCommunityId: str
+    _simulate: bool
+    _commentIntervalInSeconds: float
+    _muteTransactionIntervalInSeconds: float
+    _maxMutesPerTransaction: int
+    _broadcastLock: threading.Lock
+
+    def __init__(self, hive: Hive, username: str, hiveCommunityId: str, simulate: bool,
+                 commentIntervalInSeconds: float = DEFAULT_COMMENT_INTERVAL_IN_SECONDS,
+                 muteTransactionIntervalInSeconds: float = DEFAULT_MUTE_TRANSACTION_INTERVAL_IN_SECONDS,
+                 maxMutesPerTransaction: int = DEFAULT_MAX_MUTES_PER_TRANSACTION):
+        self._hive = hive
+        self._username = username
+        self._hiveCommunityId = hiveCommunityId
+        self._simulate = simulate
+        self._commentIntervalInSeconds = commentIntervalInSeconds
+        self._muteTransactionIntervalInSeconds = muteTransactionIntervalInSeconds
+        self._maxMutesPerTransaction = max(1, maxMutesPerTransaction)
+        self._broadcastLock = threading.Lock()
+
+    def broadcast(self, messages: list, postsToMute: list,
+                  onOperationBroadcast: Optional[Callable[[object, bool], None]] = None) -> BroadcastStatistics:
+        # In simulate mode each lane runs on a virtual clock, which yields the schedule without waiting for it.
+        commentClock = VirtualClock() if self._simulate else None
+        muteClock = VirtualClock() if self._simulate else None
+        startedAt = time.monotonic()
+
+        with ThreadPoolExecutor(2) as executor:
+            commentLane = executor.submit(
+                self._broadcastComments,
+                messages,
+                self._createBucket(self._commentIntervalInSeconds, commentClock),
+                onOperationBroadcast
+            )
+            muteLane = executor.submit(
+                self._broadcastMutes,
+                postsToMute,
+                self._createBucket(self._muteTransactionIntervalInSeconds, muteClock),
+                onOperationBroadcast
+            )
+            commentStatistics = commentLane.result()
+            muteStatistics = muteLane.result()
+
+        if self._simulate:
+            durationInSeconds = max(commentClock.time(), muteClock.time())
+        else:
+            durationInSeconds = time.monotonic() - startedAt
+
+        return commentStatistics.merge(muteStatistics, durationInSeconds)
+
+    @staticmethod
+    def _createBucket(intervalInSeconds: float, clock: Optional[VirtualClock]) -> TokenBucket:
+        # One token per interval, without a burst. A zero interval leaves the lane unpaced.
+        tokensPerSecond = 1.0 / intervalInSeconds if intervalInSeconds > 0 else float('inf')
+        if clock is None:
+            return TokenBucket(tokensPerSecond)
+
+        return TokenBucket(tokensPerSecond, clock=clock.time, sleep=clock.sleep)
+
+    def _broadcastComments(self, messages: list, bucket: TokenBucket,
+                           onOperationBroadcast: Optional[Callable[[object, bool], None]]) -> BroadcastStatistics:
+        failures = 0
+        for message in messages:
+            bucket.acquire()
+            operation = self.createReplyOperation(message.toAuthor, message.toPermlink, message.message)
+
+            if self._simulate:
+                broadcastLogger.logger().info('Send hive post: ' + str(message))
+                succeeded = True
+            else:
+                succeeded = self._broadcastTransaction([operation])
+
+            if not succeeded:
+                failures += 1
+            if onOperationBroadcast is not None:
+                onOperationBroadcast(message, succeeded)
+
+        return BroadcastStatistics(len(messages), len(messages), failures)
+
+    def _broadcastMutes(self, postsToMute: list, bucket: TokenBucket,
+                        onOperationBroadcast: Optional[Callable[[object, bool], None]]) -> BroadcastStatistics:
+        failures = 0
+        transactions = 0
+        for offset in range(0, len(postsToMute), self._maxMutesPerTransaction):
+            batch = postsToMute[offset:offset + self._maxMutesPerTransaction]
+            bucket.acquire()
+            transactions += 1
+            muteOperations = [self.createMuteOperation(postToMute.author, postToMute.permlink, postToMute.reason) for postToMute in batch]
+
+            if self._simulate:
+                for postToMute in batch:
+                    broadcastLogger.logger().info('Mute hive post: {author}/{permlink}'.format(author=postToMute.author, permlink=postToMute.permlink))
+                succeeded = True
+            else:
+                succeeded = self._broadcastTransaction(muteOperations)
+
+            if not succeeded:
+                failures += len(batch)
+            if onOperationBroadcast is not None:
+                for postToMute in batch:
+                    onOperationBroadcast(postToMute, succeeded)
+
+        return BroadcastStatistics(len(postsToMute), transactions, failures)
+
+    def createReplyOperation(self, toAuthor: str, toPermlink: str, message: str) -> operations.Comment:
+        # Built from the parent's author and permlink alone, the parent post is never fetched.
+        return operations.Comment(**{
+            'parent_author': toAuthor,
+            'parent_permlink': toPermlink,
+            'author': self._username,
+            'permlink': derive_permlink('', parent_permlink=toPermlink, parent_author=toAuthor),
+            'title': '',
+            'body': message,
+            'json_metadata': {}
+        })
+
+    def createMuteOperation(self, author: str, permlink: str, reason: str) -> operations.Custom_json:
+        return operations.Custom_json(**{
+            'json': ['mutePost', {'community': self._hiveCommunityId, 'account': author, 'permlink': permlink, 'notes': reason}],
+            'required_auths': [],
+            'required_posting_auths': [self._username],
+            'id': 'community'
+        })
+
+    def _broadcastTransaction(self, transactionOperations: list) -> bool:
+        # Both lanes share one beem instance, which is not thread-safe. Only the pacing runs in parallel.
+        try:
+            with self._broadcastLock:
+                transaction = TransactionBuilder(blockchain_instance=self._hive)
+                transaction.appendOps(transactionOperations)
+                transaction.appendSigner(self._username, 'posting')
+                transaction.sign()
+                transaction.broadcast()
+        except Exception as error:
+            broadcastLogger.logger().warning('Hive broadcast failed: {error}'.format(error=error))
+            return False
+
+        return True
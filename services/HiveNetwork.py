@@ -1,18 +1,32 @@
+import calendar
 import datetime
+import hashlib
 import json
 import re
-from typing import Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, List, Tuple, Union
 
 import beemstorage
-import pytz
 from beem import Hive
 from beem.account import Account
 from beem.comment import Comment
 from beem.community import Community
-from beem.discussions import Discussions_by_created, Query
 from beem.exceptions import OfflineHasNoRPCException, AccountDoesNotExistsException
-
+from beemapi.exceptions import NumRetriesReached
+
+from services.AuthorStatistics import AuthorStatistics
+from services.HiveBlockStream import HiveBlockStream
+from services.HiveBroadcasting import HiveBroadcaster, BroadcastStatistics
+from services.HiveNodePool import HiveNodePool, NodePoolHiveRpcTransport
+from services.HiveOutbox import HiveOutbox, HiveOutboxEntry
+from services.HiveRpcBatcher import HiveRpcBatcher, HiveRpcTransport, HiveRpcError
+from services.Metrics import Metrics, MeteredHiveRpcTransport
+from services.PostCache import PostCache, PostCacheEntry
 from services.Registry import RegistryHandler
+from services.SeenTracking import SeenSet
 
 
 class HiveWallet:
@@ -20,6 +34,8 @@ class HiveWallet:
     _hiveCommunity: Community
     _username: str
     _communityTag: str
+    _nodePool: HiveNodePool
+    _failoverLock: threading.Lock
 
     @staticmethod
     def create(walletPassword: str, postingKey: str) -> bool:
@@ -35,8 +51,8 @@ class HiveWallet:
         return True
 
     @staticmethod
-    def unlock(walletPassword: str, username: str, community: str, hiveApiUrl: str):
-        hiveWallet = HiveWallet(username, community, hiveApiUrl)
+    def unlock(walletPassword: str, username: str, community: str, hiveApiUrls: Union[str, List[str]]):
+        hiveWallet = HiveWallet(username, community, hiveApiUrls)
         try:
             hiveWallet.hive.wallet.unlock(walletPassword)
         except beemstorage.exceptions.WalletLocked:
@@ -44,8 +60,14 @@ class HiveWallet:
 
         return hiveWallet
 
-    def __init__(self, username, community, hiveApiUrl: str):
-        self._hive = Hive(hiveApiUrl)
+    def __init__(self, username, community, hiveApiUrls: Union[str, List[str]]):
+        if isinstance(hiveApiUrls, str):
+            hiveApiUrls = [hiveApiUrls]
+
+        self._nodePool = HiveNodePool(hiveApiUrls)
+        self._nodePool.importStatistics(RegistryHandler().getProperty('HiveNodePool', 'nodeStatistics', []))
+        self._failoverLock = threading.Lock()
+        self._hive = self.createHive()
         self._hiveCommunity = Community(community, blockchain_instance=self._hive)
         self._username = username
         self._subscribers = {}
@@ -63,13 +85,28 @@ class HiveWallet:
     def username(self):
         return self._username
 
-    def submitComment(self, toAuthor: str, toPermlink: str, message: str) -> bool:
-        comment = Comment('@{author}/{permlink}'.format(author=toAuthor, permlink=toPermlink), blockchain_instance=self._hive)
-        comment.reply(message, author=self._username)
-        return True
+    @property
+    def hiveApiUrl(self) -> str:
+        return self._nodePool.bestNode().url
+
+    @property
+    def nodePool(self) -> HiveNodePool:
+        return self._nodePool
 
-    def muteInCommunity(self, comment: Comment, reason: str):
-        self._hiveCommunity.mute_post(comment.author, comment.permlink, reason, self._username)
+    def createHive(self) -> Hive:
+        hive = Hive(node=self._nodePool.urls)
+        if hive.rpc is not None:
+            Metrics().instrumentBeemRpc(hive.rpc)
+
+        return hive
+
+    def switchToNextNode(self):
+        with self._failoverLock:
+            self._nodePool.reportFailure(self._hive.rpc.url)
+            self._hive.rpc.next()
+
+    def saveNodeStatistics(self):
+        RegistryHandler().setProperty('HiveNodePool', 'nodeStatistics', self._nodePool.exportStatistics())
 
     def getCommunity(self):
         return self._hiveCommunity
@@ -77,108 +114,278 @@ class HiveWallet:
 
 class QueuedHiveMessage:
     _toAuthor: str
-    _topPermlink: str
+    _toPermlink: str
     _message: str
+    _idempotencyKey: str
 
-    def __init__(self, toPermlink: str, toAuthor: str, message: str):
+    def __init__(self, toPermlink: str, toAuthor: str, message: str, idempotencyKey: str = ''):
         self._toAuthor = toAuthor
         self._toPermlink = toPermlink
         self._message = message
+        self._idempotencyKey = idempotencyKey
 
-    def submit(self, wallet: HiveWallet):
-        wallet.submitComment(self._toAuthor, self._toPermlink, self._message)
+    @property
+    def toAuthor(self) -> str:
+        return self._toAuthor
+
+    @property
+    def toPermlink(self) -> str:
+        return self._toPermlink
+
+    @property
+    def message(self) -> str:
+        return self._message
+
+    @property
+    def idempotencyKey(self) -> str:
+        return self._idempotencyKey
 
     def __str__(self):
         return 'Author: {author}\nPermlink: {permlink}\n\n{message}'.format(author=self._toAuthor, permlink=self._toPermlink, message=self._message)
 
 
 class HiveComment(Comment):
-    _cachedBeneficiaries: dict
-    _cachedTags: list
-    _cachedVotes: dict
-
     @staticmethod
     def convert(post: Comment) -> 'HiveComment':
         post.__class__ = HiveComment
-        post._cachedVotes = {}
-        post._cachedTags = []
-        post._cachedBeneficiaries = {}
         return post
 
     @property
-    def cachedVotes(self) -> dict:
-        if not self._cachedVotes:
-            votes = self.get_votes(True)
-            self._cachedVotes = {}
-            for vote in votes:
-                self._cachedVotes[vote['voter']] = vote['rshares']
+    def authorperm(self) -> str:
+        return '{author}/{permlink}'.format(author=self.author, permlink=self.permlink)
+
+
+class HivePost:
+    PAYOUT_WINDOW_IN_SECONDS: int = 7 * 86400
+    TIME_FORMAT: str = '%Y-%m-%dT%H:%M:%S'
+
+    # Only what agents, caches and cursors read is kept. Posts are built straight from RPC JSON and never changed.
+    __slots__ = ('_author', '_permlink', '_category', '_title', '_body', '_bodyDigest', '_tags', '_beneficiaries',
+                 '_votes', '_replyAuthors', '_createdTimestamp', '_lastUpdate', '_cashoutTimestamp', '_isPinned')
+
+    _author: str
+    _permlink: str
+    _category: str
+    _title: str
+    _body: str
+    _bodyDigest: str
+    _tags: Tuple[str, ...]
+    _beneficiaries: Mapping[str, int]
+    _votes: Optional[Mapping[str, int]]
+    _replyAuthors: Optional[Tuple[str, ...]]
+    _createdTimestamp: int
+    _lastUpdate: str
+    _cashoutTimestamp: int
+    _isPinned: bool
+
+    def __init__(self, author: str, permlink: str, category: str, title: str, body: str, tags: Iterable[str],
+                 beneficiaries: Dict[str, int], createdTimestamp: int, lastUpdate: str = '', cashoutTimestamp: Optional[int] = None,
+                 isPinned: bool = False, votes: Optional[Dict[str, int]] = None, replyAuthors: Optional[Iterable[str]] = None):
+        values = {
+            '_author': author,
+            '_permlink': permlink,
+            '_category': category,
+            '_title': title,
+            '_body': body,
+            '_bodyDigest': hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest(),
+            '_tags': tuple(tags),
+            '_beneficiaries': MappingProxyType(dict(beneficiaries)),
+            '_votes': None if votes is None else MappingProxyType(dict(votes)),
+            '_replyAuthors': None if replyAuthors is None else tuple(replyAuthors),
+            '_createdTimestamp': createdTimestamp,
+            '_lastUpdate': lastUpdate,
+            '_cashoutTimestamp': createdTimestamp + HivePost.PAYOUT_WINDOW_IN_SECONDS if cashoutTimestamp is None else cashoutTimestamp,
+            '_isPinned': isPinned
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('HivePost is immutable, {name} cannot be set.'.format(name=name))
 
-        return self._cachedVotes
+    @staticmethod
+    def fromJson(postJson: dict) -> 'HivePost':
+        jsonMetadata = postJson.get('json_metadata') or {}
+        if isinstance(jsonMetadata, str):
+            try:
+                jsonMetadata = json.loads(jsonMetadata)
+            except ValueError:
+                jsonMetadata = {}
+        tags = jsonMetadata.get('tags', []) if isinstance(jsonMetadata, dict) else []
+
+        # Paid out posts report the epoch as cashout time, their payout happened seven days after creation.
+        cashoutTime = HivePost._parseTime(postJson.get('cashout_time', ''))
+        cashoutTimestamp = calendar.timegm(cashoutTime.timetuple()) if cashoutTime is not None and cashoutTime.year >= 2000 else None
+
+        return HivePost(
+            postJson['author'],
+            postJson['permlink'],
+            postJson.get('category', ''),
+            postJson.get('title', ''),
+            postJson.get('body', ''),
+            [str(tag).lower() for tag in tags] if isinstance(tags, list) else [],
+            {beneficiary['account']: beneficiary['weight'] for beneficiary in postJson.get('beneficiaries', [])},
+            calendar.timegm(HivePost._parseTime(postJson['created']).timetuple()),
+            str(postJson.get('last_update', '')),
+            cashoutTimestamp,
+            bool((postJson.get('stats') or {}).get('is_pinned', False))
+        )
+
+    @staticmethod
+    def _parseTime(value: str) -> Optional[datetime.datetime]:
+        try:
+            return datetime.datetime.strptime(value, HivePost.TIME_FORMAT)
+        except (TypeError, ValueError):
+            return None
+
+    def withPrefetchedData(self, activeVotes: list, replyAuthors: list) -> 'HivePost':
+        return HivePost(
+            self._author,
+            self._permlink,
+            self._category,
+            self._title,
+            self._body,
+            self._tags,
+            self._beneficiaries,
+            self._createdTimestamp,
+            self._lastUpdate,
+            self._cashoutTimestamp,
+            self._isPinned,
+            {vote['voter']: vote['rshares'] for vote in activeVotes},
+            replyAuthors
+        )
+
+    @property
+    def author(self) -> str:
+        return self._author
+
+    @property
+    def permlink(self) -> str:
+        return self._permlink
+
+    @property
+    def authorperm(self) -> str:
+        return '{author}/{permlink}'.format(author=self._author, permlink=self._permlink)
+
+    @property
+    def category(self) -> str:
+        return self._category
+
+    @property
+    def title(self) -> str:
+        return self._title
 
     @property
-    def cachedBeneficiaries(self) -> dict:
-        if not self._cachedBeneficiaries:
-            jsonData = self.json()
+    def body(self) -> str:
+        return self._body
 
-            if 'beneficiaries' not in jsonData.keys():
-                return {}
+    @property
+    def bodyDigest(self) -> str:
+        return self._bodyDigest
 
-            self._cachedBeneficiaries = {}
-            for beneficiary in jsonData['beneficiaries']:
-                self._cachedBeneficiaries[beneficiary['account']] = beneficiary['weight']
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        return self._tags
 
-        return self._cachedBeneficiaries
+    @property
+    def beneficiaries(self) -> Mapping[str, int]:
+        return self._beneficiaries
 
     @property
-    def cachedTags(self) -> list:
-        if not self._cachedTags:
-            jsonData = json.loads(self.json()['json_metadata'])
+    def isEnriched(self) -> bool:
+        return self._votes is not None and self._replyAuthors is not None
 
-            self._cachedTags = jsonData['tags'] if 'tags' in jsonData.keys() else []
-            self._cachedTags = [x.lower() for x in self._cachedTags]
+    @property
+    def votes(self) -> Mapping[str, int]:
+        # Votes and replies are only known once the HiveHandler enriched the post.
+        return self._votes if self._votes is not None else MappingProxyType({})
 
-        return self._cachedTags
+    @property
+    def replyAuthors(self) -> Tuple[str, ...]:
+        return self._replyAuthors if self._replyAuthors is not None else ()
 
     @property
-    def ageInSeconds(self):
-        return (datetime.datetime.utcnow().replace(tzinfo=pytz.UTC) - self['created']).seconds
+    def createdTimestamp(self) -> int:
+        return self._createdTimestamp
 
     @property
-    def ageInDays(self):
-        return (datetime.datetime.utcnow().replace(tzinfo=pytz.UTC) - self['created']).days
+    def lastUpdate(self) -> str:
+        return self._lastUpdate
+
+    @property
+    def cashoutTimestamp(self) -> int:
+        return self._cashoutTimestamp
+
+    @property
+    def isPinned(self) -> bool:
+        return self._isPinned
+
+    @property
+    def ageInSeconds(self) -> int:
+        return int(time.time()) - self._createdTimestamp
+
+    @property
+    def ageInDays(self) -> int:
+        return self.ageInSeconds // 86400
+
+    def lookupCache(self) -> Optional[PostCacheEntry]:
+        return PostCache().lookup(self.authorperm, self._lastUpdate, self._cashoutTimestamp)
 
 
 class QueuedPostToMute:
-    _hiveComment: HiveComment
+    _author: str
+    _permlink: str
     _reason: str
+    _idempotencyKey: str
 
-    def __init__(self, comment: HiveComment, reason: str):
-        self._hiveComment = comment
+    def __init__(self, author: str, permlink: str, reason: str, idempotencyKey: str = ''):
+        self._author = author
+        self._permlink = permlink
         self._reason = reason
+        self._idempotencyKey = idempotencyKey
 
     @property
-    def comment(self) -> HiveComment:
-        return self._hiveComment
+    def author(self) -> str:
+        return self._author
+
+    @property
+    def permlink(self) -> str:
+        return self._permlink
 
     @property
     def reason(self) -> str:
         return self._reason
 
+    @property
+    def idempotencyKey(self) -> str:
+        return self._idempotencyKey
+
 
 class HiveHandler:
-    MAX_ALREADY_MONITORED_POSTS_TO_REMEMBER: int = 350
+    MAX_ALREADY_MONITORED_POSTS_TO_REMEMBER: int = 20000
+    ALREADY_MONITORED_POSTS_MAX_AGE_IN_SECONDS: int = 8 * 86400
+    DEFAULT_ENRICHMENT_WORKERS: int = 8
+    POSTS_PER_PAGE: int = 100
+    MAX_PAGES_PER_TAG: int = 20
+    MAXIMUM_POST_AGE_IN_DAYS: int = 7
+    ENRICHMENT_ATTEMPTS: int = 3
+    SUBSCRIBER_RETENTION_IN_MONTHS: int = 4
 
     _instance = None
     _hiveWallet: HiveWallet
     _onPostLoadedHandlers: list
     _onReplyLoadedHandlers: list
-    _queuedMessages: list
-    _muteQueue: list
+    _outbox: HiveOutbox
     _registryHandler: RegistryHandler
     _simulate: bool
-    _alreadyMonitoredPosts: list
+    _alreadyMonitoredPosts: SeenSet
     _ignorePostsCommentedBy: list
     _exceptAuthors: list
+    _enrichmentWorkers: int
+    _rpcBatcher: Optional[HiveRpcBatcher]
+    _tagCursors: Dict[str, dict]
+    _blockStream: Optional[HiveBlockStream]
+    _authorStatistics: Optional[AuthorStatistics]
 
     _subscribers: Dict
 
@@ -188,31 +395,59 @@ class HiveHandler:
             cls._hiveWallet = None
             cls._onPostLoadedHandlers = []
             cls._onReplyLoadedHandlers = []
-            cls._queuedMessages = []
-            cls._muteQueue = []
+            cls._outbox = HiveOutbox()
             cls._registryHandler = RegistryHandler()
-            cls._alreadyMonitoredPosts = cls._registryHandler.getProperty('HiveHandler', 'alreadyMonitoredPosts', [])
+            cls._alreadyMonitoredPosts = SeenSet.fromList(
+                cls._registryHandler.getProperty('HiveHandler', 'alreadyMonitoredPosts', []),
+                HiveHandler.MAX_ALREADY_MONITORED_POSTS_TO_REMEMBER,
+                HiveHandler.ALREADY_MONITORED_POSTS_MAX_AGE_IN_SECONDS
+            )
             cls._simulate = False
             cls._ignorePostsCommentedBy = []
             cls._exceptAuthors = []
             cls._subscribers = {}
+            cls._authorStatistics = None
+            cls._enrichmentWorkers = HiveHandler.DEFAULT_ENRICHMENT_WORKERS
+            cls._rpcBatcher = None
+            cls._tagCursors = cls._registryHandler.getProperty('HiveHandler', 'tagCursors', {})
+            cls._blockStream = None
 
         return cls._instance
 
     def getHiveWallet(self):
         return self._hiveWallet
 
-    def setup(self, hiveWallet: HiveWallet, ignorePostsCommentedBy: list, exceptAuthors: list, simulate: bool):
+    def setup(self, hiveWallet: HiveWallet, ignorePostsCommentedBy: list, exceptAuthors: list, simulate: bool,
+              enrichmentWorkers: int = DEFAULT_ENRICHMENT_WORKERS, loadSubscribers: bool = True):
         self._hiveWallet = hiveWallet
         self._simulate = simulate
         self._ignorePostsCommentedBy = ignorePostsCommentedBy
         self._exceptAuthors = exceptAuthors
-        self._loadSubscribers()
+        self._enrichmentWorkers = max(1, enrichmentWorkers)
+        self._rpcBatcher = HiveRpcBatcher(MeteredHiveRpcTransport(NodePoolHiveRpcTransport(hiveWallet.nodePool)))
+        self._authorStatistics = AuthorStatistics(hiveWallet.hive, hiveWallet.createHive, hiveWallet.communityTag, self._enrichmentWorkers)
+        if loadSubscribers:
+            self._loadSubscribers()
+
+    def setRpcTransport(self, transport: HiveRpcTransport):
+        self._rpcBatcher.transport = MeteredHiveRpcTransport(transport)
+
+    def enableBlockStream(self, hiveCommunityId: str, minimumAgeInSeconds: int = 3600,
+                          blocksPerRequest: int = HiveBlockStream.DEFAULT_BLOCKS_PER_REQUEST,
+                          maxBlocksPerPoll: int = HiveBlockStream.DEFAULT_MAX_BLOCKS_PER_POLL):
+        self._blockStream = HiveBlockStream(
+            self._rpcBatcher,
+            hiveCommunityId,
+            minimumAgeInSeconds,
+            blocksPerRequest,
+            maxBlocksPerPoll
+        )
+        self._blockStream.restoreState(self._registryHandler.getProperty('HiveBlockStream', 'state', {}))
 
     def addOnPostLoadedHandler(self, handlerCallback):
         self._onPostLoadedHandlers.append(handlerCallback)
 
-    def _callOnPostLoadedHandlers(self, post: HiveComment):
+    def _callOnPostLoadedHandlers(self, post: HivePost):
         for handler in self._onPostLoadedHandlers:
             handler(post)
 
@@ -223,10 +458,23 @@ class HiveHandler:
         for handler in self._onReplyLoadedHandlers:
             handler(post)
 
+    def _callWithFailover(self, callback, *args):
+        attempts = len(self._hiveWallet.nodePool.nodes)
+        for attempt in range(attempts):
+            try:
+                return callback(*args)
+            except (OfflineHasNoRPCException, NumRetriesReached):
+                if attempt == attempts - 1:
+                    raise
+                self._hiveWallet.switchToNextNode()
+
+    def _loadAccountReplies(self, accountName: str) -> list:
+        account = Account(accountName, blockchain_instance=self._hiveWallet.hive)
+        return list(account.reply_history())
+
     def loadNewestAccountReplies(self, accountName: str):
         try:
-            account = Account(accountName, blockchain_instance=self._hiveWallet.hive)
-            history = account.reply_history()
+            history = self._callWithFailover(self._loadAccountReplies, accountName)
             for reply in history:
                 if reply.author in self._exceptAuthors:
                     continue
@@ -240,95 +488,359 @@ class HiveHandler:
         return True
 
     def loadNewestCommunityPosts(self, hiveCommunityId: str, communityTags: list, minimumAgeInSeconds: int = 3600) -> bool:
-        posts = []
-        for communityTag in communityTags:
-            q = Query(limit=100, tag=communityTag)
+        if self._blockStream is not None:
+            return self._loadStreamedCommunityPosts(hiveCommunityId)
+
+        with ThreadPoolExecutor(max_workers=self._enrichmentWorkers) as executor:
             try:
-                for post in Discussions_by_created(q, blockchain_instance=self._hiveWallet.hive):
+                postsByTag = self._loadCommunityTagPosts(communityTags, executor)
+            except HiveRpcError as e:
+                return False
+
+            duePostsByTag = {
+                communityTag: [post for post in postsByTag[communityTag] if post.ageInSeconds >= minimumAgeInSeconds]
+                for communityTag in communityTags
+            }
+
+            posts = []
+            postLinks = set()
+            for communityTag in communityTags:
+                for post in duePostsByTag[communityTag]:
                     postLink: str = '@{author}/{permlink}'.format(author=post.author, permlink=post.permlink)
-                    post: HiveComment = HiveComment.convert(post)
 
                     if post.category != hiveCommunityId:
                         continue
-                    if self._wasPostAlreadyMonitored(postLink):
+                    if self._wasPostAlreadyMonitored(postLink) or postLink in postLinks:
                         continue
 
-                    if post.ageInSeconds < minimumAgeInSeconds:
+                    if post.ageInDays > HiveHandler.MAXIMUM_POST_AGE_IN_DAYS:
                         continue
 
-                    if post.ageInDays > 7:
-                        continue
-
-                    self._markPostAsMonitored(postLink)
+                    postLinks.add(postLink)
                     posts.append(post)
-            except OfflineHasNoRPCException as e:
-                return False
 
-        for post in posts:
-            if self._shouldThisPostBeIgnored(post):
+            evaluatedPosts, failedPosts = self._enrichPosts(posts, executor)
+
+        # A post that could not be enriched holds back the cursors of its tags, so the next cycle pages over it again.
+        failedPostLinks = {'@{authorperm}'.format(authorperm=post.authorperm) for post in failedPosts}
+        for communityTag in communityTags:
+            duePostLinks = {'@{authorperm}'.format(authorperm=post.authorperm) for post in duePostsByTag[communityTag]}
+            if not duePostLinks.isdisjoint(failedPostLinks):
                 continue
+
+            for post in duePostsByTag[communityTag]:
+                self._advanceTagCursor(communityTag, post)
+
+        for postLink in postLinks - failedPostLinks:
+            self._markPostAsMonitored(postLink)
+
+        self._registryHandler.setProperty('HiveHandler', 'tagCursors', self._tagCursors)
+        self._registryHandler.setProperty('HiveHandler', 'alreadyMonitoredPosts', self._alreadyMonitoredPosts.toList())
+
+        for post in evaluatedPosts:
+            self._callOnPostLoadedHandlers(post)
+
+        return True
+
+    def _loadStreamedCommunityPosts(self, hiveCommunityId: str) -> bool:
+        # Posts leave the block stream exactly when they reach the minimum age.
+        try:
+            duePosts = self._blockStream.poll()
+        except HiveRpcError as e:
+            return False
+
+        with ThreadPoolExecutor(max_workers=self._enrichmentWorkers) as executor:
+            fetchedPosts, unfetchedPosts = self._fetchPosts(duePosts, executor)
+            self._blockStream.retryPosts(unfetchedPosts)
+
+            posts = []
+            for post in fetchedPosts:
+                postLink: str = '@{author}/{permlink}'.format(author=post.author, permlink=post.permlink)
+
+                if post.category != hiveCommunityId:
+                    continue
+                if self._wasPostAlreadyMonitored(postLink):
+                    continue
+                if post.ageInDays > HiveHandler.MAXIMUM_POST_AGE_IN_DAYS:
+                    continue
+
+                posts.append(post)
+
+            evaluatedPosts, failedPosts = self._enrichPosts(posts, executor)
+
+        failedPostLinks = {post.authorperm for post in failedPosts}
+        self._blockStream.retryPosts([(post.author, post.permlink) for post in failedPosts])
+        for post in posts:
+            if post.authorperm not in failedPostLinks:
+                self._markPostAsMonitored('@{authorperm}'.format(authorperm=post.authorperm))
+
+        self._registryHandler.setProperty('HiveBlockStream', 'state', self._blockStream.exportState())
+        self._registryHandler.setProperty('HiveHandler', 'alreadyMonitoredPosts', self._alreadyMonitoredPosts.toList())
+
+        for post in evaluatedPosts:
             self._callOnPostLoadedHandlers(post)
 
         return True
 
-    def _shouldThisPostBeIgnored(self, post) -> bool:
-        comments: list = post.get_all_replies(post)
-        for comment in comments:
-            if comment.author in self._ignorePostsCommentedBy:
+    def loadCommunityPostsFromBlocks(self, hiveCommunityId: str, startBlockNum: int, endBlockNum: int,
+                                     fromTimestamp: float, toTimestamp: float) -> bool:
+        # Backfill reads a fixed block range and evaluates its posts regardless of their age or of earlier cycles.
+        blockStream = HiveBlockStream(self._rpcBatcher, hiveCommunityId, 0)
+        with ThreadPoolExecutor(max_workers=self._enrichmentWorkers) as executor:
+            try:
+                sightings = blockStream.readCommunityPosts(startBlockNum, endBlockNum, executor)
+            except HiveRpcError as e:
+                return False
+
+            sightingTimes = {(author, permlink): blockTime for blockTime, author, permlink in sightings}
+            fetchedPosts, unfetchedPosts = self._fetchPosts(list(sightingTimes.keys()), executor)
+            if len(unfetchedPosts) > 0:
+                return False
+
+            posts = []
+            for post in fetchedPosts:
+                if post.category != hiveCommunityId:
+                    continue
+                # Edits repeat the comment operation, so a post only belongs to the range it was created in.
+                if abs(post.createdTimestamp - sightingTimes[(post.author, post.permlink)]) >= HiveBlockStream.BLOCK_INTERVAL_IN_SECONDS:
+                    continue
+                if post.createdTimestamp < fromTimestamp or post.createdTimestamp >= toTimestamp:
+                    continue
+
+                posts.append(post)
+
+            # Replies of the watchdog itself are what the audit looks at, so only the excepted authors are left out.
+            evaluatedPosts, failedPosts = self._enrichPosts(posts, executor, False)
+            if len(failedPosts) > 0:
+                return False
+
+        for post in evaluatedPosts:
+            self._callOnPostLoadedHandlers(post)
+
+        return True
+
+    def _fetchPosts(self, authorPermlinks: List[Tuple[str, str]], executor: ThreadPoolExecutor) -> Tuple[List[HivePost], List[Tuple[str, str]]]:
+        contentCalls = [self._rpcBatcher.queue('condenser_api.get_content', [author, permlink]) for author, permlink in authorPermlinks]
+        self._rpcBatcher.flush(executor)
+
+        # Deleted posts come back without an author and are dropped, failed calls are handed back to be retried.
+        posts = []
+        failedPosts = []
+        for authorPermlink, contentCall in zip(authorPermlinks, contentCalls):
+            if contentCall.failed:
+                failedPosts.append(authorPermlink)
+                continue
+            if not contentCall.result or not contentCall.result.get('author'):
+                continue
+
+            posts.append(HivePost.fromJson(contentCall.result))
+
+        return posts, failedPosts
+
+    def _loadCommunityTagPosts(self, communityTags: list, executor: ThreadPoolExecutor) -> Dict[str, List[HivePost]]:
+        # Pages backwards from the newest post until the tag cursor of the previous run is reached.
+        # The pages of all tags that still need one are requested in the same batch.
+        postsByTag = {communityTag: [] for communityTag in communityTags}
+        pageStarts = {communityTag: None for communityTag in communityTags}
+
+        for page in range(HiveHandler.MAX_PAGES_PER_TAG):
+            if len(pageStarts) == 0:
+                break
+
+            pageCalls = {}
+            for communityTag, pageStart in pageStarts.items():
+                query = {'tag': communityTag, 'limit': HiveHandler.POSTS_PER_PAGE}
+                if pageStart is not None:
+                    query['start_author'], query['start_permlink'] = pageStart
+                pageCalls[communityTag] = self._rpcBatcher.queue('condenser_api.get_discussions_by_created', [query])
+            self._rpcBatcher.flush(executor)
+
+            nextPageStarts = {}
+            for communityTag, pageCall in pageCalls.items():
+                pagePosts = [HivePost.fromJson(postJson) for postJson in pageCall.result]
+                pageStart = pageStarts[communityTag]
+                if pageStart is not None and len(pagePosts) > 0 and (pagePosts[0].author, pagePosts[0].permlink) == pageStart:
+                    pagePosts = pagePosts[1:]
+
+                cursor = self._tagCursors.get(communityTag)
+                reachedCursor = False
+                for post in pagePosts:
+                    if self._isPostCoveredByCursor(post, cursor):
+                        reachedCursor = True
+                        break
+                    postsByTag[communityTag].append(post)
+
+                # Without a cursor there is no known end, so only the newest page is read.
+                if reachedCursor or cursor is None or len(pagePosts) < HiveHandler.POSTS_PER_PAGE - 1:
+                    continue
+                if pagePosts[-1].ageInDays > HiveHandler.MAXIMUM_POST_AGE_IN_DAYS:
+                    continue
+
+                nextPageStarts[communityTag] = (pagePosts[-1].author, pagePosts[-1].permlink)
+            pageStarts = nextPageStarts
+
+        return postsByTag
+
+    @staticmethod
+    def _isPostCoveredByCursor(post: HivePost, cursor: Optional[dict]) -> bool:
+        if cursor is None:
+            return False
+
+        if post.isPinned:
+            return False
+        if post.author == cursor['author'] and post.permlink == cursor['permlink']:
+            return True
+
+        return post.createdTimestamp < cursor['created']
+
+    def _advanceTagCursor(self, communityTag: str, post: HivePost):
+        cursor = self._tagCursors.get(communityTag)
+        if post.isPinned or (cursor is not None and post.createdTimestamp <= cursor['created']):
+            return
+
+        self._tagCursors[communityTag] = {
+            'created': post.createdTimestamp,
+            'author': post.author,
+            'permlink': post.permlink
+        }
+
+    def _enrichPosts(self, posts: List[HivePost], executor: ThreadPoolExecutor,
+                     applyIgnoreList: bool = True) -> Tuple[List[HivePost], List[HivePost]]:
+        # Cheap checks first, then fetch replies and votes of all uncached posts as batched JSON-RPC calls.
+        posts = [
+            post for post in posts
+            if post.author not in self._exceptAuthors and not (applyIgnoreList and self._wasIgnoredBefore(post))
+        ]
+
+        enrichedPosts = {}
+        uncachedPosts = []
+        for post in posts:
+            cacheEntry = post.lookupCache()
+            if cacheEntry is not None and cacheEntry.activeVotes is not None and cacheEntry.replyAuthors is not None:
+                enrichedPosts[post.authorperm] = post.withPrefetchedData(cacheEntry.activeVotes, cacheEntry.replyAuthors)
+            else:
+                uncachedPosts.append(post)
+
+        # The node pool moves on to the next node after a failed batch, so failed posts are simply asked for again.
+        for attempt in range(HiveHandler.ENRICHMENT_ATTEMPTS):
+            if len(uncachedPosts) == 0:
+                break
+
+            pendingCalls = []
+            for post in uncachedPosts:
+                pendingCalls.append((
+                    self._rpcBatcher.queueActiveVotes(post.author, post.permlink),
+                    self._rpcBatcher.queueDiscussion(post.author, post.permlink)
+                ))
+            self._rpcBatcher.flush(executor)
+
+            failedPosts = []
+            cacheEntries = []
+            for post, (votesCall, discussionCall) in zip(uncachedPosts, pendingCalls):
+                if votesCall.failed or discussionCall.failed:
+                    failedPosts.append(post)
+                    continue
+
+                replyAuthors = [reply['author'] for key, reply in discussionCall.result.items() if key != post.authorperm]
+                activeVotes = [{'voter': vote['voter'], 'rshares': vote['rshares']} for vote in votesCall.result]
+                enrichedPosts[post.authorperm] = post.withPrefetchedData(activeVotes, replyAuthors)
+                cacheEntries.append((post.authorperm, post.lastUpdate, activeVotes, replyAuthors))
+            PostCache().storeMany(cacheEntries)
+            uncachedPosts = failedPosts
+
+        # Posts whose votes and replies could not be loaded are handed back instead of being evaluated without them.
+        return [
+            enrichedPosts[post.authorperm] for post in posts
+            if post.authorperm in enrichedPosts and not (applyIgnoreList and self._shouldThisPostBeIgnored(enrichedPosts[post.authorperm]))
+        ], uncachedPosts
+
+    def _wasIgnoredBefore(self, post: HivePost) -> bool:
+        # A reply by an ignoring account stays on chain, so a cached hit never has to be re-fetched.
+        for replyAuthor in PostCache().lookupReplyAuthorsIgnoringAge(post.authorperm):
+            if replyAuthor in self._ignorePostsCommentedBy:
                 return True
 
-        if post.author in self._exceptAuthors:
+        return False
+
+    def _shouldThisPostBeIgnored(self, post: HivePost) -> bool:
+        if post.author in self._exceptAuthors or self._wasIgnoredBefore(post):
             return True
 
+        for replyAuthor in post.replyAuthors:
+            if replyAuthor in self._ignorePostsCommentedBy:
+                return True
+
         return False
 
     def _wasPostAlreadyMonitored(self, postLink: str) -> bool:
         return postLink in self._alreadyMonitoredPosts
 
     def _markPostAsMonitored(self, postLink: str):
-        self._alreadyMonitoredPosts.append(postLink)
-        while len(self._alreadyMonitoredPosts) > HiveHandler.MAX_ALREADY_MONITORED_POSTS_TO_REMEMBER:
-            self._alreadyMonitoredPosts.pop(0)
+        self._alreadyMonitoredPosts.add(postLink)
 
-        self._registryHandler.setProperty('HiveHandler', 'alreadyMonitoredPosts', self._alreadyMonitoredPosts)
+    def openOutbox(self, path: Optional[str]):
+        self._outbox = HiveOutbox(path)
 
-    def enqueuePostToMuteInCommunity(self, hiveComment: HiveComment, reason: str):
+    def enqueuePostToMuteInCommunity(self, author: str, permlink: str, reason: str):
+        self._outbox.enqueue(HiveOutboxEntry.MUTE, author, permlink, '', reason)
 
-        self._muteQueue.append(QueuedPostToMute(hiveComment, reason))
+    def enqueueMessage(self, author: str, permlink: str, message: str, templateId: str = ''):
+        self._outbox.enqueue(HiveOutboxEntry.COMMENT, author, permlink, templateId, message)
 
-    def enqueueMessage(self, author: str, permlink: str, message: str):
-        hiveMessage = QueuedHiveMessage(permlink, author, message)
-        self._queuedMessages.append(hiveMessage)
+    def broadcastQueuedOperations(self, broadcaster: HiveBroadcaster) -> BroadcastStatistics:
+        entries = self._outbox.takeDueEntries()
+        entries = self._skipAlreadyDeliveredComments(entries)
 
-    def processNextQueuedMessages(self) -> bool:
-        if len(self._queuedMessages) == 0:
-            return False
-        hiveMessage: QueuedHiveMessage = self._queuedMessages.pop()
-        if not hiveMessage:
-            return False
+        messages = [
+            QueuedHiveMessage(entry.permlink, entry.author, entry.content, entry.key)
+            for entry in entries if entry.kind == HiveOutboxEntry.COMMENT
+        ]
+        postsToMute = [
+            QueuedPostToMute(entry.author, entry.permlink, entry.content, entry.key)
+            for entry in entries if entry.kind == HiveOutboxEntry.MUTE
+        ]
 
-        if self._simulate:
-            print('Send hive post: ' + str(hiveMessage))
-        else:
-            hiveMessage.submit(self._hiveWallet)
+        return broadcaster.broadcast(messages, postsToMute, self._onOperationBroadcast)
 
-        return True
+    def _onOperationBroadcast(self, queuedOperation: Union[QueuedHiveMessage, QueuedPostToMute], succeeded: bool):
+        if succeeded:
+            self._outbox.markDone(queuedOperation.idempotencyKey)
+        else:
+            self._outbox.markFailed(queuedOperation.idempotencyKey)
+
+    def _skipAlreadyDeliveredComments(self, entries: List[HiveOutboxEntry]) -> List[HiveOutboxEntry]:
+        # A reply may have reached the chain although its broadcast timed out or the process died afterwards.
+        commentEntries = [entry for entry in entries if entry.kind == HiveOutboxEntry.COMMENT and entry.previouslyAttempted]
+        if len(commentEntries) == 0:
+            return entries
+
+        pendingCalls = [self._rpcBatcher.queueContentReplies(entry.author, entry.permlink) for entry in commentEntries]
+        self._rpcBatcher.flush()
+
+        deliveredKeys = set()
+        uncheckedKeys = set()
+        for entry, repliesCall in zip(commentEntries, pendingCalls):
+            # Without knowing whether the last attempt landed, the entry waits for the next cycle instead of risking a duplicate.
+            if repliesCall.failed:
+                uncheckedKeys.add(entry.key)
+                continue
 
-    def muteNextQueuedPosts(self) -> bool:
-        if len(self._muteQueue) == 0:
-            return False
-        queuedPostToMute: QueuedPostToMute = self._muteQueue.pop()
-        if not queuedPostToMute:
-            return False
+            for reply in repliesCall.result:
+                if reply['author'] == self._hiveWallet.username and reply['body'].strip() == entry.content.strip():
+                    deliveredKeys.add(entry.key)
+                    break
 
-        if self._simulate:
-            print('Mute hive post: {author}/{permlink}'.format(author=queuedPostToMute.comment.author, permlink=queuedPostToMute.comment.permlink))
-        else:
-            self._hiveWallet.muteInCommunity(queuedPostToMute.comment, queuedPostToMute.reason)
+        for key in deliveredKeys:
+            self._outbox.markDone(key)
+        for key in uncheckedKeys:
+            self._outbox.release(key)
 
-        return True
+        return [entry for entry in entries if entry.key not in deliveredKeys and entry.key not in uncheckedKeys]
 
     def finish(self):
+        self._hiveWallet.saveNodeStatistics()
+        self._authorStatistics.finishCycle()
+
         # Save subscribers
         jsonSubscribersObject = json.dumps(self._subscribers, indent=4)
         with open("subscribers.json", "w") as outfile:
@@ -339,75 +851,99 @@ class HiveHandler:
         with open("subscribers.json", "r") as subscribersJsonFile:
             self._subscribers = json.load(subscribersJsonFile)
 
+        for subscriberInfo in self._subscribers.values():
+            if 'joinedTimestamp' not in subscriberInfo.keys():
+                subscriberInfo['joinedTimestamp'] = HiveHandler._parseActivityTimestamp(subscriberInfo['joined'])
+
+        self._syncSubscriberActivities()
+
+    def syncSubscribers(self) -> bool:
+        try:
+            self._syncSubscriberActivities()
+        except Exception as e:
+            return False
+
+        return True
+
+    def _syncSubscriberActivities(self):
+        # Activities arrive newest first. Stop at the newest one of the last sync, or once they are too old to be kept.
+        newestKnownId = self._registryHandler.getProperty('HiveHandler', 'subscriberActivityCursor', 0)
+        retentionCutoff = HiveHandler._getSubscriberRetentionCutoff()
+        newestFoundId = newestKnownId
         lastFoundId = 0
         usernameExtractionRegex = re.compile(r'^@([a-z0-9_\-\.]+).*$', re.RegexFlag.DOTALL)
 
-        while True:
+        reachedKnownActivities = False
+        while not reachedKnownActivities:
             activities = self._hiveWallet.getCommunity().get_activities(
                 limit=100,
                 last_id=None if lastFoundId == 0 else lastFoundId
             )
             if activities is None or len(activities) == 0:
                 break
-            else:
-                lastFoundId = activities[-1]['id']
-                for activity in activities:
 
-                    if activity['type'] != 'subscribe':
-                        continue
+            lastFoundId = activities[-1]['id']
+            for activity in activities:
+                if activity['id'] <= newestKnownId:
+                    reachedKnownActivities = True
+                    break
 
-                    match = usernameExtractionRegex.search(activity['msg'])
-                    if not match:
-                        continue
+                newestFoundId = max(newestFoundId, activity['id'])
+                joinedTimestamp = HiveHandler._parseActivityTimestamp(activity['date'])
+                if joinedTimestamp < retentionCutoff:
+                    reachedKnownActivities = True
+                    break
 
-                    username = str(match[1])
-                    if username in self._subscribers.keys():
-                        continue
+                if activity['type'] != 'subscribe':
+                    continue
+
+                match = usernameExtractionRegex.search(activity['msg'])
+                if not match:
+                    continue
+
+                username = str(match[1])
+                if username in self._subscribers.keys():
+                    continue
+
+                self._subscribers[username] = {
+                    'joined': activity['date'],
+                    'joinedTimestamp': joinedTimestamp,
+                    'rejoined': False,
+                    'posts': -1,
+                    'comments': -1,
+                    'averageTrailVote': -1
+                }
 
-                    self._subscribers[username] = {
-                        'joined': activity['date'],
-                        'rejoined': False,
-                        'posts': -1,
-                        'comments': -1,
-                        'averageTrailVote': -1
-                    }
+        self._registryHandler.setProperty('HiveHandler', 'subscriberActivityCursor', newestFoundId)
 
         # Clean-up
         for subscriber in list(self._subscribers.keys()):
-            now = datetime.datetime.now()
-            joinDate = datetime.datetime.strptime(self._subscribers[subscriber]['joined'], '%Y-%m-%dT%H:%M:%S')
-            numMonths = (now.year - joinDate.year) * 12 + (now.month - joinDate.month)
-
-            if numMonths > 4:
+            if self._subscribers[subscriber]['joinedTimestamp'] < retentionCutoff:
                 del self._subscribers[subscriber]
 
+    @staticmethod
+    def _parseActivityTimestamp(date: str) -> int:
+        return calendar.timegm(time.strptime(date, '%Y-%m-%dT%H:%M:%S'))
+
+    @staticmethod
+    def _getSubscriberRetentionCutoff() -> int:
+        # Subscribers are kept until more than four calendar months passed since the month they joined.
+        now = datetime.datetime.utcnow()
+        monthIndex = now.year * 12 + now.month - 1 - HiveHandler.SUBSCRIBER_RETENTION_IN_MONTHS
+
+        return calendar.timegm((monthIndex // 12, monthIndex % 12 + 1, 1, 0, 0, 0, 0, 0, 0))
+
     def getSubscriberInfo(self, subscriberName) -> Optional[Dict]:
         if subscriberName not in self._subscribers.keys():
             return None
 
+        authorStatistics = self._authorStatistics.getStatistics(subscriberName)
         subscriberInfo = self._subscribers[subscriberName]
-        subscriberInfo['posts'] = self._countAuthorPostsInCommunity(subscriberName)
-        subscriberInfo['comments'] = self._countAuthorCommentsInCommunity(subscriberName)
+        subscriberInfo['posts'] = authorStatistics['posts']
+        subscriberInfo['comments'] = authorStatistics['comments']
         self._subscribers[subscriberName] = subscriberInfo
 
         return subscriberInfo
 
-    def _countAuthorPostsInCommunity(self, subscriberName: str) -> int:
-        comments = 0
-
-        account = Account(subscriberName, blockchain_instance=self._hiveWallet.hive)
-        for comment in account.blog_history():
-            if comment.category == self._hiveWallet.communityTag:
-                comments += 1
-
-        return comments
-
-    def _countAuthorCommentsInCommunity(self, subscriberName: str) -> int:
-        comments = 0
-
-        account = Account(subscriberName, blockchain_instance=self._hiveWallet.hive)
-        for comment in account.comment_history():
-            if comment.category == self._hiveWallet.communityTag:
-                comments += 1
-
-        return comments
+    def prefetchSubscriberInfos(self, subscriberNames: List[str]):
+        self._authorStatistics.prefetch([name for name in subscriberNames if name in self._subscribers.keys()])
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from services.HiveRpcBatcher import HiveRpcTransport, HttpHiveRpcTransport
+from services.Metrics import Metrics
+
+
+class HiveNodePoolExhausted(IOError):
+    pass
+
+
+class HiveNode:
+    _url: str
+    _ewmaLatency: float
+    _errorScore: float
+    _unhealthyUntil: float
+
+    def __init__(self, url: str, ewmaLatency: float = 0.0, errorScore: float = 0.0):
+        self._url = url
+        self._ewmaLatency = ewmaLatency
+        self._errorScore = errorScore
+        self._unhealthyUntil = 0.0
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    @property
+    def ewmaLatency(self) -> float:
+        return self._ewmaLatency
+
+    @property
+    def errorScore(self) -> float:
+        return self._errorScore
+
+    @property
+    def score(self) -> float:
+        return self._ewmaLatency * (1.0 + self._errorScore)
+
+    def isHealthy(self, now: float) -> bool:
+        return self._unhealthyUntil <= now
+
+    def recordSuccess(self, latency: float, alpha: float, errorDecay: float):
+        if self._ewmaLatency == 0.0:
+            self._ewmaLatency = latency
+        else:
+            self._ewmaLatency = alpha * latency + (1.0 - alpha) * self._ewmaLatency
+        self._errorScore *= errorDecay
+
+    def recordFailure(self, now: float, errorThreshold: float, cooldownInSeconds: float):
+        self._errorScore += 1.0
+        if self._errorScore >= errorThreshold:
+            self._unhealthyUntil = now + cooldownInSeconds
+
+    def toDict(self) -> dict:
+        return {'url': self._url, 'ewmaLatency': self._ewmaLatency, 'errorScore': self._errorScore}
+
+
+class HiveNodePool:
+    DEFAULT_EWMA_ALPHA: float = 0.3
+    DEFAULT_ERROR_DECAY: float = 0.5
+    DEFAULT_ERROR_THRESHOLD: float = 2.0
+    DEFAULT_COOLDOWN_IN_SECONDS: float = 60.0
+
+    _nodes: List[HiveNode]
+    _lock: threading.Lock
+    _clock: Callable[[], float]
+
+    def __init__(self, urls: List[str], alpha: float = DEFAULT_EWMA_ALPHA, errorDecay: float = DEFAULT_ERROR_DECAY,
+                 errorThreshold: float = DEFAULT_ERROR_THRESHOLD, cooldownInSeconds: float = DEFAULT_COOLDOWN_IN_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self._nodes = [HiveNode(url) for url in urls]
+        self._alpha = alpha
+        self._errorDecay = errorDecay
+        self._errorThreshold = errorThreshold
+        self._cooldownInSeconds = cooldownInSeconds
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def nodes(self) -> List[HiveNode]:
+        return list(self._nodes)
+
+    @property
+    def urls(self) -> List[str]:
+        return [node.url for node in self.rankedNodes()]
+
+    def rankedNodes(self) -> List[HiveNode]:
+        now = self._clock()
+        with self._lock:
+            healthy = [node for node in self._nodes if node.isHealthy(now)]
+            unhealthy = [node for node in self._nodes if not node.isHealthy(now)]
+
+        # Unhealthy nodes stay at the end so a pool whose nodes all failed can still recover.
+        return sorted(healthy, key=lambda node: node.score) + sorted(unhealthy, key=lambda node: node.score)
+
+    def bestNode(self) -> Optional[HiveNode]:
+        rankedNodes = self.rankedNodes()
+        return rankedNodes[0] if len(rankedNodes) > 0 else None
+
+    def reportSuccess(self, url: str, latency: float):
+        node = self._findNode(url)
+        if node is None:
+            return
+        with self._lock:
+            node.recordSuccess(latency, self._alpha, self._errorDecay)
+        Metrics().recordDuration('rpc_node', {'node': url}, latency)
+
+    def reportFailure(self, url: str):
+        node = self._findNode(url)
+        if node is None:
+            return
+        with self._lock:
+            node.recordFailure(self._clock(), self._errorThreshold, self._cooldownInSeconds)
+        Metrics().increment('rpc_node_failures_total', {'node': url})
+
+    def execute(self, callback: Callable[[str], Any]) -> Any:
+        lastError = None
+        for node in self.rankedNodes():
+            startTime = self._clock()
+            try:
+                result = callback(node.url)
+            except Exception as e:
+                self.reportFailure(node.url)
+                lastError = e
+                continue
+
+            self.reportSuccess(node.url, self._clock() - startTime)
+            return result
+
+        raise HiveNodePoolExhausted('All Hive nodes failed. Last error: {error}'.format(error=lastError))
+
+    def exportStatistics(self) -> list:
+        with self._lock:
+            return [node.toDict() for node in self._nodes]
+
+    def importStatistics(self, statistics: list):
+        with self._lock:
+            for nodeInfo in statistics:
+                for index, node in enumerate(self._nodes):
+                    if node.url == nodeInfo['url']:
+                        self._nodes[index] = HiveNode(node.url, nodeInfo['ewmaLatency'], nodeInfo['errorScore'])
+
+    def _findNode(self, url: str) -> Optional[HiveNode]:
+        for node in self._nodes:
+            if node.url == url:
+                return node
+
+        return None
+
+
+class NodePoolHiveRpcTransport(HiveRpcTransport):
+    _nodePool: HiveNodePool
+    _timeout: float
+
+    def __init__(self, nodePool: HiveNodePool, timeout: float = 30.0):
+        self._nodePool = nodePool
+        self._timeout = timeout
+
+    def send(self, payload: list) -> list:
+        return self._nodePool.execute(lambda url: HttpHiveRpcTransport(url, self._timeout).send(payload))
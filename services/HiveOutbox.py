@@ -0,0 +1,248 @@
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from services.AspectLogging import LogAspect
+from services.SeenTracking import SeenSet
+
+outboxLogger: LogAspect = LogAspect('HiveOutbox')
+
+
+class HiveOutboxEntry:
+    COMMENT: str = 'comment'
+    MUTE: str = 'mute'
+
+    PENDING: str = 'pending'
+    INFLIGHT: str = 'inflight'
+
+    key: str
+    kind: str
+    author: str
+    permlink: str
+    templateId: str
+    content: str
+    attempts: int
+    nextAttemptAt: float
+    state: str
+    previouslyAttempted: bool
+
+    def __init__(self, kind: str, author: str, permlink: str, templateId: str, content: str, attempts: int = 0,
+                 nextAttemptAt: float = 0.0, state: str = PENDING):
+        self.key = HiveOutboxEntry.createKey(kind, author, permlink, templateId)
+        self.kind = kind
+        self.author = author
+        self.permlink = permlink
+        self.templateId = templateId
+        self.content = content
+        self.attempts = attempts
+        self.nextAttemptAt = nextAttemptAt
+        self.state = state
+        # Only known while the entry is taken. An earlier attempt may have reached the chain without being confirmed.
+        self.previouslyAttempted = False
+
+    @staticmethod
+    def createKey(kind: str, author: str, permlink: str, templateId: str) -> str:
+        return '{kind}:@{author}/{permlink}:{templateId}'.format(kind=kind, author=author, permlink=permlink, templateId=templateId)
+
+    @staticmethod
+    def fromDict(data: dict) -> 'HiveOutboxEntry':
+        return HiveOutboxEntry(
+            data['kind'],
+            data['author'],
+            data['permlink'],
+            data['templateId'],
+            data['content'],
+            data.get('attempts', 0),
+            data.get('nextAttemptAt', 0.0),
+            data.get('state', HiveOutboxEntry.PENDING)
+        )
+
+    def toDict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'author': self.author,
+            'permlink': self.permlink,
+            'templateId': self.templateId,
+            'content': self.content,
+            'attempts': self.attempts,
+            'nextAttemptAt': self.nextAttemptAt,
+            'state': self.state
+        }
+
+
+class HiveOutbox:
+    MAX_ATTEMPTS: int = 8
+    BASE_RETRY_DELAY_IN_SECONDS: float = 60.0
+    MAX_RETRY_DELAY_IN_SECONDS: float = 6 * 3600.0
+    MAX_COMPLETED_KEYS_TO_REMEMBER: int = 20000
+    COMPLETED_KEYS_MAX_AGE_IN_SECONDS: int = 8 * 86400
+    COMPACTION_THRESHOLD_IN_RECORDS: int = 5000
+
+    _path: Optional[str]
+    _entries: Dict[str, HiveOutboxEntry]
+    _completedKeys: SeenSet
+    _recordsSinceCompaction: int
+    _lock: threading.RLock
+    _clock: Callable[[], float]
+
+    def __init__(self, path: Optional[str] = None, clock: Callable[[], float] = time.time):
+        # Without a path the outbox only lives in memory, e.g. in simulate mode.
+        self._path = path
+        self._entries = {}
+        self._lock = threading.RLock()
+        self._clock = clock
+        self._recordsSinceCompaction = 0
+
+        completedKeys = self._replayJournal()
+        self._completedKeys = SeenSet.fromList(
+            completedKeys,
+            HiveOutbox.MAX_COMPLETED_KEYS_TO_REMEMBER,
+            HiveOutbox.COMPLETED_KEYS_MAX_AGE_IN_SECONDS,
+            clock
+        )
+        self.compact()
+
+    @property
+    def openEntriesCount(self) -> int:
+        return len(self._entries)
+
+    def enqueue(self, kind: str, author: str, permlink: str, templateId: str, content: str) -> bool:
+        entry = HiveOutboxEntry(kind, author, permlink, templateId, content)
+
+        with self._lock:
+            if entry.key in self._entries or entry.key in self._completedKeys:
+                return False
+
+            self._entries[entry.key] = entry
+            self._appendRecord({'op': 'enqueue', 'entry': entry.toDict()})
+
+        return True
+
+    def takeDueEntries(self) -> List[HiveOutboxEntry]:
+        # The attempt is journaled before the broadcast, so an entry interrupted by a crash stays marked inflight.
+        now = self._clock()
+        with self._lock:
+            dueEntries = [
+                entry for entry in self._entries.values()
+                if entry.state == HiveOutboxEntry.PENDING and entry.nextAttemptAt <= now
+            ]
+            interruptedEntries = [entry for entry in self._entries.values() if entry.state == HiveOutboxEntry.INFLIGHT]
+
+            for entry in interruptedEntries:
+                entry.previouslyAttempted = True
+            for entry in dueEntries:
+                entry.previouslyAttempted = entry.attempts > 0
+                entry.state = HiveOutboxEntry.INFLIGHT
+                entry.attempts += 1
+                self._appendRecord({'op': 'attempt', 'key': entry.key})
+
+        return interruptedEntries + dueEntries
+
+    def markDone(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return
+
+            del self._entries[key]
+            self._completedKeys.add(key)
+            self._appendRecord({'op': 'done', 'key': key, 'at': self._clock()})
+
+    def markFailed(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return
+
+            entry = self._entries[key]
+            if entry.attempts >= HiveOutbox.MAX_ATTEMPTS:
+                outboxLogger.logger().warning('Hive outbox gives up on {key} after {attempts} attempts.'.format(key=key, attempts=entry.attempts))
+                del self._entries[key]
+                self._appendRecord({'op': 'abandon', 'key': key})
+                return
+
+            entry.state = HiveOutboxEntry.PENDING
+            entry.nextAttemptAt = self._clock() + min(
+                HiveOutbox.MAX_RETRY_DELAY_IN_SECONDS,
+                HiveOutbox.BASE_RETRY_DELAY_IN_SECONDS * 2 ** (entry.attempts - 1)
+            )
+            self._appendRecord({'op': 'retry', 'key': key, 'nextAttemptAt': entry.nextAttemptAt})
+
+    def release(self, key: str):
+        # Hands a taken entry back without broadcasting it, it is due again on the next take.
+        with self._lock:
+            if key not in self._entries:
+                return
+
+            self._entries[key].state = HiveOutboxEntry.PENDING
+            self._appendRecord({'op': 'release', 'key': key})
+
+    def compact(self):
+        if self._path is None:
+            return
+
+        with self._lock:
+            temporaryPath = '{path}.tmp'.format(path=self._path)
+            with open(temporaryPath, 'w') as f:
+                for key, completedAt in self._completedKeys.toList():
+                    f.write(json.dumps({'op': 'done', 'key': key, 'at': completedAt}) + '\n')
+                for entry in self._entries.values():
+                    f.write(json.dumps({'op': 'enqueue', 'entry': entry.toDict()}) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(temporaryPath, self._path)
+            self._recordsSinceCompaction = 0
+
+    def _appendRecord(self, record: dict):
+        if self._path is None:
+            return
+
+        with open(self._path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._recordsSinceCompaction += 1
+        if self._recordsSinceCompaction >= HiveOutbox.COMPACTION_THRESHOLD_IN_RECORDS:
+            self.compact()
+
+    def _replayJournal(self) -> list:
+        completedKeys = []
+        if self._path is None:
+            return completedKeys
+
+        try:
+            with open(self._path, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return completedKeys
+
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash may leave the last line half written.
+                continue
+
+            if record['op'] == 'enqueue':
+                entry = HiveOutboxEntry.fromDict(record['entry'])
+                self._entries[entry.key] = entry
+            elif record['key'] not in self._entries:
+                if record['op'] == 'done':
+                    completedKeys.append([record['key'], record['at']])
+            elif record['op'] == 'attempt':
+                self._entries[record['key']].state = HiveOutboxEntry.INFLIGHT
+                self._entries[record['key']].attempts += 1
+            elif record['op'] == 'release':
+                self._entries[record['key']].state = HiveOutboxEntry.PENDING
+            elif record['op'] == 'retry':
+                self._entries[record['key']].state = HiveOutboxEntry.PENDING
+                self._entries[record['key']].nextAttemptAt = record['nextAttemptAt']
+            elif record['op'] == 'done':
+                del self._entries[record['key']]
+                completedKeys.append([record['key'], record['at']])
+            elif record['op'] == 'abandon':
+                del self._entries[record['key']]
+
+        return completedKeys
@@ -0,0 +1,180 @@
+import json
+import urllib.request
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import Any, List, Optional
+
+
+class HiveRpcError(Exception):
+    pass
+
+
+class HiveRpcTransport(ABC):
+    @abstractmethod
+    def send(self, payload: list) -> list:
+        pass
+
+
+class HttpHiveRpcTransport(HiveRpcTransport):
+    _url: str
+    _timeout: float
+
+    def __init__(self, url: str, timeout: float = 30.0):
+        self._url = url
+        self._timeout = timeout
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def send(self, payload: list) -> list:
+        request = urllib.request.Request(
+            self._url,
+            data=json.dumps(payload).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+
+
+class HiveRpcCall:
+    _requestId: int
+    _method: str
+    _params: Any
+    _result: Any
+    _error: Optional[str]
+    _done: bool
+
+    def __init__(self, requestId: int, method: str, params: Any):
+        self._requestId = requestId
+        self._method = method
+        self._params = params
+        self._result = None
+        self._error = None
+        self._done = False
+
+    @property
+    def requestId(self) -> int:
+        return self._requestId
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def params(self) -> Any:
+        return self._params
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    @property
+    def failed(self) -> bool:
+        return self._done and self._error is not None
+
+    @property
+    def error(self) -> Optional[str]:
+        return self._error
+
+    @property
+    def result(self) -> Any:
+        if not self._done:
+            raise HiveRpcError('{method} was not sent yet.'.format(method=self._method))
+        if self._error is not None:
+            raise HiveRpcError('{method} failed: {error}'.format(method=self._method, error=self._error))
+
+        return self._result
+
+    def toJsonRpc(self) -> dict:
+        return {'jsonrpc': '2.0', 'id': self._requestId, 'method': self._method, 'params': self._params}
+
+    def resolve(self, result: Any):
+        self._result = result
+        self._done = True
+
+    def reject(self, error: str):
+        self._error = error
+        self._done = True
+
+
+class HiveRpcBatcher:
+    DEFAULT_MAX_BATCH_SIZE: int = 50
+
+    _transport: HiveRpcTransport
+    _maxBatchSize: int
+    _pendingCalls: List[HiveRpcCall]
+    _nextRequestId: int
+
+    def __init__(self, transport: HiveRpcTransport, maxBatchSize: int = DEFAULT_MAX_BATCH_SIZE):
+        self._transport = transport
+        self._maxBatchSize = max(1, maxBatchSize)
+        self._pendingCalls = []
+        self._nextRequestId = 1
+
+    @property
+    def transport(self) -> HiveRpcTransport:
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport: HiveRpcTransport):
+        self._transport = transport
+
+    def queue(self, method: str, params: Any) -> HiveRpcCall:
+        call = HiveRpcCall(self._nextRequestId, method, params)
+        self._nextRequestId += 1
+        self._pendingCalls.append(call)
+
+        return call
+
+    def queueActiveVotes(self, author: str, permlink: str) -> HiveRpcCall:
+        return self.queue('condenser_api.get_active_votes', [author, permlink])
+
+    def queueDiscussion(self, author: str, permlink: str) -> HiveRpcCall:
+        return self.queue('bridge.get_discussion', {'author': author, 'permlink': permlink})
+
+    def queueContentReplies(self, author: str, permlink: str) -> HiveRpcCall:
+        return self.queue('condenser_api.get_content_replies', [author, permlink])
+
+    def call(self, method: str, params: Any) -> Any:
+        rpcCall = self.queue(method, params)
+        self.flush()
+
+        return rpcCall.result
+
+    def flush(self, executor: Optional[Executor] = None):
+        calls = self._pendingCalls
+        self._pendingCalls = []
+        batches = [calls[i:i + self._maxBatchSize] for i in range(0, len(calls), self._maxBatchSize)]
+
+        if executor is None or len(batches) < 2:
+            for batch in batches:
+                self._sendBatch(batch)
+            return
+
+        list(executor.map(self._sendBatch, batches))
+
+    def _sendBatch(self, batch: List[HiveRpcCall]):
+        try:
+            responses = self._transport.send([call.toJsonRpc() for call in batch])
+        except Exception as e:
+            for call in batch:
+                call.reject(str(e))
+            return
+
+        if isinstance(responses, dict):
+            responses = [responses]
+
+        responsesById = {}
+        for response in responses:
+            if isinstance(response, dict) and 'id' in response:
+                responsesById[response['id']] = response
+
+        for call in batch:
+            response = responsesById.get(call.requestId)
+            if response is None:
+                call.reject('No response received.')
+            elif 'error' in response:
+                call.reject(json.dumps(response['error']))
+            else:
+                call.resolve(response.get('result'))
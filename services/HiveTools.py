@@ -1,4 +1,7 @@
-from services.HiveNetwork import HiveComment
+from typing import Optional, List
+
+from services.HiveNetwork import HivePost
+from services.LinkExtraction import ExtractedLinks, HiveLinkExtractor
 
 
 class HivePostType:
@@ -14,6 +17,65 @@ class HivePostType:
         return self._postType
 
 
+class HivePostAnalysis:
+    _post: HivePost
+    _lowerTitle: str
+    _lowerBody: str
+    _tags: list
+    _postType: Optional[int]
+    _links: Optional[ExtractedLinks]
+
+    def __init__(self, post: HivePost):
+        self._post = post
+        self._lowerTitle = post.title.lower()
+        self._lowerBody = post.body.lower()
+        self._tags = post.tags
+        self._postType = None
+        self._links = None
+
+    @property
+    def post(self) -> HivePost:
+        return self._post
+
+    @property
+    def title(self) -> str:
+        return self._post.title
+
+    @property
+    def body(self) -> str:
+        return self._post.body
+
+    @property
+    def lowerTitle(self) -> str:
+        return self._lowerTitle
+
+    @property
+    def lowerBody(self) -> str:
+        return self._lowerBody
+
+    @property
+    def tags(self) -> list:
+        return self._tags
+
+    @property
+    def postType(self) -> int:
+        if self._postType is None:
+            self._postType = HivePostIdentifier.identifyPostType(self)
+
+        return self._postType
+
+    @property
+    def links(self) -> ExtractedLinks:
+        if self._links is None:
+            self._links = HiveLinkExtractor.extract(self._post.body)
+
+        return self._links
+
+    @property
+    def urls(self) -> List[str]:
+        return self.links.urls
+
+
 class HivePostIdentifier:
     UNKOWN_POST_TYPE: int = 0
     CONTEST_POST_TYPE: int = 1
@@ -22,33 +84,38 @@ class HivePostIdentifier:
     NO_LIL_TABLE_LIL_POST_TYPE: int = 4
 
     @staticmethod
-    def getPostType(post: HiveComment) -> int:
-        title = post.title.lower()
-        body = post.body.lower()
+    def getPostType(post: HivePost) -> int:
+        return HivePostAnalysis(post).postType
+
+    @staticmethod
+    def identifyPostType(analysis: HivePostAnalysis) -> int:
+        title = analysis.lowerTitle
+        body = analysis.lowerBody
+        tags = analysis.tags
 
-        if 'tutorial' in title or 'lmacschool' in post.cachedTags:
+        if 'tutorial' in title or 'lmacschool' in tags:
             return HivePostIdentifier.TUTORIAL_POST_TYPE
 
-        if title.startswith('lil:') and '<table class="lil">' not in post.body:
+        if title.startswith('lil:') and '<table class="lil">' not in analysis.body:
             return HivePostIdentifier.NO_LIL_TABLE_LIL_POST_TYPE
 
-        if title.startswith('lil') and 'lil' in post.cachedTags and '<table class="lil">' not in post.body:
+        if title.startswith('lil') and 'lil' in tags and '<table class="lil">' not in analysis.body:
             return HivePostIdentifier.NO_LIL_TABLE_LIL_POST_TYPE
 
-        if title.startswith('lil') and 'lil' in post.cachedTags and '<table class="lil">' in post.body:
+        if title.startswith('lil') and 'lil' in tags and '<table class="lil">' in analysis.body:
             return HivePostIdentifier.LIL_POST_TYPE
 
-        if 'let\'s make a collage' in body and 'round' in body and ('letsmakeacollage' in post.cachedTags or 'lmac' in post.cachedTags):
+        if 'let\'s make a collage' in body and 'round' in body and ('letsmakeacollage' in tags or 'lmac' in tags):
             return HivePostIdentifier.CONTEST_POST_TYPE
 
-        if 'lmac' in title and 'lil' not in title and 'lil' not in post.cachedTags and 'letsmakeacollage' in post.cachedTags:
+        if 'lmac' in title and 'lil' not in title and 'lil' not in tags and 'letsmakeacollage' in tags:
             return HivePostIdentifier.CONTEST_POST_TYPE
 
-        if ('letsmakeacollage' in post.cachedTags or 'lmac' in post.cachedTags) and (
+        if ('letsmakeacollage' in tags or 'lmac' in tags) and (
                 'round' in title or 'contest' in title or 'collage' in title or 'rondo' in title or 'concurso' in title or 'lmac special' in title or 'prize pool' in title):
             return HivePostIdentifier.CONTEST_POST_TYPE
 
-        if 'letsmakeacollage' in post.cachedTags and 'let\'s make a collage' in title:
+        if 'letsmakeacollage' in tags and 'let\'s make a collage' in title:
             return HivePostIdentifier.CONTEST_POST_TYPE
 
         if 'to LMAC #' in title or 'let\'s make a collage round' in title:
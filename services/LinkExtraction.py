@@ -0,0 +1,91 @@
+import re
+from typing import Iterable, List, Tuple
+
+
+class ExtractedLinks:
+    _urls: List[str]
+    _imageSources: List[str]
+    _hiveReferences: List[Tuple[str, str]]
+
+    def __init__(self, urls: List[str], imageSources: List[str], hiveReferences: List[Tuple[str, str]]):
+        self._urls = urls
+        self._imageSources = imageSources
+        self._hiveReferences = hiveReferences
+
+    @property
+    def urls(self) -> List[str]:
+        return self._urls
+
+    @property
+    def imageSources(self) -> List[str]:
+        return self._imageSources
+
+    @property
+    def hiveReferences(self) -> List[Tuple[str, str]]:
+        return self._hiveReferences
+
+    def hasHiveReferenceTo(self, authors: Iterable[str]) -> bool:
+        authors = set(authors)
+        for author, permlink in self._hiveReferences:
+            if author in authors:
+                return True
+
+        return False
+
+
+class HiveLinkExtractor:
+    # Every alternative starts with a literal and uses a single character class without nested
+    # quantifiers, so each match costs time linear in its length and the whole scan is linear.
+    TOKEN_REGEX = re.compile(
+        r'(?P<url>https?:(?://|\\\\)[^\s"\'<>\[\]{}|\\^`]*)'
+        r'|/@(?P<author>[a-zA-Z0-9][a-zA-Z0-9\-\.]{1,15})/(?P<permlink>[a-zA-Z0-9_\-]*)'
+    )
+    # The permlink may be empty, a profile link such as /@lmac/ references its author as well.
+    HIVE_REFERENCE_REGEX = re.compile(r'/@([a-zA-Z0-9][a-zA-Z0-9\-\.]{1,15})/([a-zA-Z0-9_\-]*)')
+    TRAILING_PUNCTUATION = '.,;:!?*'
+    IMAGE_ALT_TEXT_LOOKBEHIND: int = 300
+
+    @staticmethod
+    def extract(text: str) -> ExtractedLinks:
+        urls = []
+        imageSources = []
+        hiveReferences = []
+
+        for match in HiveLinkExtractor.TOKEN_REGEX.finditer(text):
+            if match.group('url') is None:
+                hiveReferences.append((match.group('author').lower(), match.group('permlink')))
+                continue
+
+            url = HiveLinkExtractor._trimUrl(match.group('url'))
+            urls.append(url)
+            if HiveLinkExtractor._isImageSource(text, match.start()):
+                imageSources.append(url)
+            for author, permlink in HiveLinkExtractor.HIVE_REFERENCE_REGEX.findall(url):
+                hiveReferences.append((author.lower(), permlink))
+
+        return ExtractedLinks(urls, imageSources, hiveReferences)
+
+    @staticmethod
+    def _trimUrl(url: str) -> str:
+        end = len(url.rstrip(HiveLinkExtractor.TRAILING_PUNCTUATION))
+        unbalancedParentheses = url.count(')', 0, end) - url.count('(', 0, end)
+        # A closing parenthesis without an opening one belongs to the surrounding markdown.
+        while unbalancedParentheses > 0 and end > 0 and url[end - 1] == ')':
+            end -= 1
+            unbalancedParentheses -= 1
+            while end > 0 and url[end - 1] in HiveLinkExtractor.TRAILING_PUNCTUATION:
+                end -= 1
+
+        return url[:end]
+
+    @staticmethod
+    def _isImageSource(text: str, urlStart: int) -> bool:
+        prefix = text[max(0, urlStart - 6):urlStart].lower()
+        if prefix.endswith('src="') or prefix.endswith("src='") or prefix.endswith('src='):
+            return True
+
+        if not prefix.endswith(']('):
+            return False
+
+        altTextStart = text.rfind('![', max(0, urlStart - HiveLinkExtractor.IMAGE_ALT_TEXT_LOOKBEHIND), urlStart)
+        return altTextStart >= 0 and text.find('](', altTextStart, urlStart) == urlStart - 2
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+from services.HiveRpcBatcher import HiveRpcTransport
+
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Metrics:
+    PROMETHEUS_PREFIX: str = 'watchdog_'
+
+    _instance = None
+    _lock: threading.Lock
+    _cycleValues: Dict[MetricKey, float]
+    _totalValues: Dict[MetricKey, float]
+    _cycleStartedAt: float
+    _lastCycleSummary: dict
+    _httpServer: Optional[ThreadingHTTPServer]
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Metrics, cls).__new__(cls)
+            cls._lock = threading.Lock()
+            cls._cycleValues = {}
+            cls._totalValues = {}
+            cls._cycleStartedAt = time.time()
+            cls._lastCycleSummary = {}
+            cls._httpServer = None
+
+        return cls._instance
+
+    def startCycle(self):
+        with self._lock:
+            self._cycleValues = {}
+            self._cycleStartedAt = time.time()
+
+    def increment(self, metric: str, labels: dict, amount: float = 1.0):
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._cycleValues[key] = self._cycleValues.get(key, 0.0) + amount
+            self._totalValues[key] = self._totalValues.get(key, 0.0) + amount
+
+    def recordDuration(self, metric: str, labels: dict, seconds: float, count: int = 1):
+        # Batched work passes the number of items it covered, so sum / count stays a per item average.
+        self.increment('{metric}_seconds_sum'.format(metric=metric), labels, seconds)
+        self.increment('{metric}_seconds_count'.format(metric=metric), labels, count)
+
+    @contextmanager
+    def measure(self, metric: str, labels: dict):
+        startedAt = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.recordDuration(metric, labels, time.perf_counter() - startedAt)
+
+    def measurePhase(self, phase: str):
+        return self.measure('phase', {'phase': phase})
+
+    def recordCacheLookup(self, cache: str, hit: bool):
+        self.increment('cache_lookups_total', {'cache': cache, 'result': 'hit' if hit else 'miss'})
+
+    def recordRpcCall(self, method: str, requestBytes: int, responseBytes: int):
+        self.increment('rpc_calls_total', {'method': method})
+        self.increment('rpc_request_bytes_total', {'method': method}, requestBytes)
+        self.increment('rpc_response_bytes_total', {'method': method}, responseBytes)
+
+    def finishCycle(self) -> dict:
+        with self._lock:
+            cycleValues = dict(self._cycleValues)
+            durationInSeconds = time.time() - self._cycleStartedAt
+
+        summary = {
+            'cycleStartedAt': self._cycleStartedAt,
+            'cycleDurationInSeconds': durationInSeconds,
+            'metrics': {},
+            'cacheHitRatios': {}
+        }
+        for (metric, labels), value in sorted(cycleValues.items()):
+            summary['metrics'].setdefault(metric, []).append({'labels': dict(labels), 'value': value})
+
+        cacheLookups: Dict[str, list] = {}
+        for (metric, labels), value in cycleValues.items():
+            if metric != 'cache_lookups_total':
+                continue
+            labels = dict(labels)
+            hitsAndMisses = cacheLookups.setdefault(labels['cache'], [0.0, 0.0])
+            hitsAndMisses[0 if labels['result'] == 'hit' else 1] += value
+        for cache, (hits, misses) in cacheLookups.items():
+            summary['cacheHitRatios'][cache] = hits / (hits + misses) if hits + misses > 0 else 0.0
+
+        self._lastCycleSummary = summary
+
+        return summary
+
+    def toPrometheusText(self) -> str:
+        with self._lock:
+            totalValues = dict(self._totalValues)
+
+        lines = []
+        for (metric, labels), value in sorted(totalValues.items()):
+            labelText = ','.join('{name}="{value}"'.format(name=name, value=str(labelValue).replace('"', '\\"')) for name, labelValue in labels)
+            lines.append('{prefix}{metric}{{{labels}}} {value}'.format(prefix=Metrics.PROMETHEUS_PREFIX, metric=metric, labels=labelText, value=value))
+
+        if 'cycleDurationInSeconds' in self._lastCycleSummary:
+            lines.append('{prefix}last_cycle_duration_seconds {value}'.format(
+                prefix=Metrics.PROMETHEUS_PREFIX,
+                value=self._lastCycleSummary['cycleDurationInSeconds']
+            ))
+
+        return '\n'.join(lines) + '\n'
+
+    def export(self, jsonPath: Optional[str], prometheusPath: Optional[str]):
+        if jsonPath:
+            Metrics._writeAtomically(jsonPath, json.dumps(self._lastCycleSummary, indent=4))
+        if prometheusPath:
+            Metrics._writeAtomically(prometheusPath, self.toPrometheusText())
+
+    def startHttpExporter(self, port: int):
+        if self._httpServer is not None:
+            return
+
+        metrics = self
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, contentType = metrics.toPrometheusText(), 'text/plain; version=0.0.4'
+                elif self.path == '/summary':
+                    body, contentType = json.dumps(metrics._lastCycleSummary), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+
+                encodedBody = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', contentType)
+                self.send_header('Content-Length', str(len(encodedBody)))
+                self.end_headers()
+                self.wfile.write(encodedBody)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpServer = ThreadingHTTPServer(('127.0.0.1', port), MetricsRequestHandler)
+        threading.Thread(target=self._httpServer.serve_forever, daemon=True).start()
+
+    def instrumentBeemRpc(self, rpc):
+        # beem funnels every call of a Hive instance through rpcexec, so wrapping it covers all beem objects.
+        originalRpcexec = rpc.rpcexec
+
+        def meteredRpcexec(payload):
+            startedAt = time.perf_counter()
+            result = None
+            try:
+                result = originalRpcexec(payload)
+                return result
+            finally:
+                method = Metrics._getRpcMethodName(payload)
+                self.recordDuration('rpc_node', {'node': str(rpc.url)}, time.perf_counter() - startedAt)
+                self.recordRpcCall(method, len(json.dumps(payload, default=str)), len(json.dumps(result, default=str)) if result is not None else 0)
+
+        rpc.rpcexec = meteredRpcexec
+
+    @staticmethod
+    def _getRpcMethodName(payload) -> str:
+        if isinstance(payload, list):
+            return 'batch'
+
+        method = payload.get('method', 'unknown')
+        params = payload.get('params')
+        # Appbase calls arrive as call(api, method, args).
+        if method == 'call' and isinstance(params, list) and len(params) >= 2:
+            return '{api}.{method}'.format(api=params[0], method=params[1])
+
+        return method
+
+    @staticmethod
+    def _writeAtomically(path: str, content: str):
+        temporaryPath = '{path}.tmp'.format(path=path)
+        with open(temporaryPath, 'w') as f:
+            f.write(content)
+
+        os.replace(temporaryPath, path)
+
+
+class MeteredHiveRpcTransport(HiveRpcTransport):
+    _transport: HiveRpcTransport
+
+    def __init__(self, transport: HiveRpcTransport):
+        self._transport = transport
+
+    def send(self, payload: list) -> list:
+        response = self._transport.send(payload)
+
+        responseBytesById = {entry.get('id'): len(json.dumps(entry)) for entry in response if isinstance(entry, dict)}
+        for call in payload:
+            Metrics().recordRpcCall(call['method'], len(json.dumps(call)), responseBytesById.get(call['id'], 0))
+
+        return response
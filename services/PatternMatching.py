@@ -0,0 +1,61 @@
+import re
+from typing import Dict, List, Optional, Pattern
+
+
+class MultiPatternMatcher:
+    # Recognizes the common blacklist shape ^(?:http|https)\:\/\/(?:\w*\.)?domain\.com\/...
+    DOMAIN_RULE_REGEX = re.compile(
+        r'^\^\(\?:http\|https\)\\:\\/\\/(?:\(\?:\\w\*\\\.\)\?)?(?P<domain>(?:[A-Za-z0-9_]|\\\.|\\-|-)+)\\/'
+    )
+
+    _patterns: List[str]
+    _compiledPatterns: List[Pattern]
+    _rulesByDomain: Dict[str, List[int]]
+    _otherRules: List[int]
+
+    def __init__(self, patterns: List[str], flags: int = 0):
+        self._patterns = list(patterns)
+        self._compiledPatterns = [re.compile(pattern, flags) for pattern in self._patterns]
+        self._rulesByDomain = {}
+        self._otherRules = []
+
+        for index, pattern in enumerate(self._patterns):
+            domainMatch = MultiPatternMatcher.DOMAIN_RULE_REGEX.match(pattern)
+            if domainMatch is None or flags & re.IGNORECASE:
+                self._otherRules.append(index)
+                continue
+
+            domain = domainMatch.group('domain').replace('\\.', '.').replace('\\-', '-')
+            self._rulesByDomain.setdefault(domain, []).append(index)
+
+    @property
+    def patterns(self) -> List[str]:
+        return self._patterns
+
+    def findMatchingPattern(self, text: str) -> Optional[str]:
+        # Domain rules are only evaluated when a suffix of the url host names their domain;
+        # every candidate is still confirmed with its original regex.
+        candidates = list(self._otherRules)
+        for domain in self._hostSuffixes(text):
+            candidates.extend(self._rulesByDomain.get(domain, []))
+
+        for index in sorted(candidates):
+            if self._compiledPatterns[index].search(text):
+                return self._patterns[index]
+
+        return None
+
+    def matches(self, text: str) -> bool:
+        return self.findMatchingPattern(text) is not None
+
+    @staticmethod
+    def _hostSuffixes(url: str) -> List[str]:
+        schemeEnd = url.find('://')
+        if schemeEnd < 0:
+            return []
+
+        hostEnd = url.find('/', schemeEnd + 3)
+        host = url[schemeEnd + 3:] if hostEnd < 0 else url[schemeEnd + 3:hostEnd]
+        labels = host.split('.')
+
+        return ['.'.join(labels[index:]) for index in range(len(labels))]
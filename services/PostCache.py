@@ -0,0 +1,165 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Optional, Callable, List, Tuple
+
+from services.Metrics import Metrics
+
+
+class PostCacheEntry:
+    _activeVotes: Optional[list]
+    _replyAuthors: Optional[list]
+    _isVolatileDataFinal: bool
+
+    def __init__(self, activeVotes: Optional[list], replyAuthors: Optional[list], isVolatileDataFinal: bool):
+        self._activeVotes = activeVotes
+        self._replyAuthors = replyAuthors
+        self._isVolatileDataFinal = isVolatileDataFinal
+
+    @property
+    def activeVotes(self) -> Optional[list]:
+        return self._activeVotes
+
+    @property
+    def replyAuthors(self) -> Optional[list]:
+        return self._replyAuthors
+
+    @property
+    def isVolatileDataFinal(self) -> bool:
+        return self._isVolatileDataFinal
+
+
+class PostCache:
+    DEFAULT_PATH: str = 'postCache.sqlite'
+    DEFAULT_VOLATILE_TTL_IN_SECONDS: int = 1800
+
+    _instance = None
+    _connection: Optional[sqlite3.Connection]
+    _lock: threading.Lock
+    _path: str
+    _volatileTtlInSeconds: int
+    _clock: Callable[[], float]
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(PostCache, cls).__new__(cls)
+            cls._connection = None
+            cls._lock = threading.Lock()
+            cls._path = PostCache.DEFAULT_PATH
+            cls._volatileTtlInSeconds = PostCache.DEFAULT_VOLATILE_TTL_IN_SECONDS
+            cls._clock = time.time
+
+        return cls._instance
+
+    def open(self, path: str, volatileTtlInSeconds: int = DEFAULT_VOLATILE_TTL_IN_SECONDS):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+            self._path = path
+            self._volatileTtlInSeconds = volatileTtlInSeconds
+
+    def lookup(self, authorperm: str, lastUpdate: str, cashoutTimestamp: int) -> Optional[PostCacheEntry]:
+        # Votes and replies change without touching last_update, so they are only trusted after the
+        # payout or while they are younger than the volatile ttl.
+        with self._lock:
+            row = self._getConnection().execute(
+                'SELECT lastUpdate, activeVotes, votesFetchedAt, replyAuthors, repliesFetchedAt FROM posts WHERE authorperm = ?',
+                (authorperm,)
+            ).fetchone()
+
+        if row is None:
+            Metrics().recordCacheLookup('postCache', False)
+            return None
+
+        storedLastUpdate, activeVotes, votesFetchedAt, replyAuthors, repliesFetchedAt = row
+        if storedLastUpdate != lastUpdate:
+            Metrics().recordCacheLookup('postCache', False)
+            self.invalidate(authorperm)
+            return None
+
+        # Votes and replies may be stored by different cycles, so each of them is judged by its own fetch time.
+        now = self._clock()
+        areVotesFinal = self._isFinal(votesFetchedAt, cashoutTimestamp, now)
+        areRepliesFinal = self._isFinal(repliesFetchedAt, cashoutTimestamp, now)
+        areVotesFresh = activeVotes is not None and (areVotesFinal or now - votesFetchedAt < self._volatileTtlInSeconds)
+        areRepliesFresh = replyAuthors is not None and (areRepliesFinal or now - repliesFetchedAt < self._volatileTtlInSeconds)
+        Metrics().recordCacheLookup('postCache', areVotesFresh and areRepliesFresh)
+
+        return PostCacheEntry(
+            json.loads(activeVotes) if areVotesFresh else None,
+            json.loads(replyAuthors) if areRepliesFresh else None,
+            areVotesFinal and areRepliesFinal
+        )
+
+    @staticmethod
+    def _isFinal(fetchedAt: Optional[float], cashoutTimestamp: int, now: float) -> bool:
+        return fetchedAt is not None and cashoutTimestamp <= now and fetchedAt > cashoutTimestamp
+
+    def lookupReplyAuthorsIgnoringAge(self, authorperm: str) -> list:
+        # Replies are append-only in practice, so even outdated reply authors prove a reply exists.
+        with self._lock:
+            row = self._getConnection().execute(
+                'SELECT replyAuthors FROM posts WHERE authorperm = ?',
+                (authorperm,)
+            ).fetchone()
+
+        return json.loads(row[0]) if row is not None and row[0] else []
+
+    def store(self, authorperm: str, lastUpdate: str, activeVotes: Optional[list] = None, replyAuthors: Optional[list] = None):
+        self.storeMany([(authorperm, lastUpdate, activeVotes, replyAuthors)])
+
+    def storeMany(self, entries: List[Tuple[str, str, Optional[list], Optional[list]]]):
+        if len(entries) == 0:
+            return
+
+        fetchedAt = self._clock()
+        rows = [
+            (
+                authorperm,
+                lastUpdate,
+                json.dumps(activeVotes, default=str) if activeVotes is not None else None,
+                fetchedAt if activeVotes is not None else None,
+                json.dumps(replyAuthors) if replyAuthors is not None else None,
+                fetchedAt if replyAuthors is not None else None
+            )
+            for authorperm, lastUpdate, activeVotes, replyAuthors in entries
+        ]
+
+        with self._lock:
+            connection = self._getConnection()
+            connection.executemany(
+                'INSERT INTO posts (authorperm, lastUpdate, activeVotes, votesFetchedAt, replyAuthors, repliesFetchedAt) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(authorperm) DO UPDATE SET lastUpdate = excluded.lastUpdate, '
+                'activeVotes = COALESCE(excluded.activeVotes, posts.activeVotes), '
+                'votesFetchedAt = COALESCE(excluded.votesFetchedAt, posts.votesFetchedAt), '
+                'replyAuthors = COALESCE(excluded.replyAuthors, posts.replyAuthors), '
+                'repliesFetchedAt = COALESCE(excluded.repliesFetchedAt, posts.repliesFetchedAt)',
+                rows
+            )
+            connection.commit()
+
+    def invalidate(self, authorperm: str):
+        with self._lock:
+            connection = self._getConnection()
+            connection.execute('DELETE FROM posts WHERE authorperm = ?', (authorperm,))
+            connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _getConnection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS posts ('
+                'authorperm TEXT PRIMARY KEY, lastUpdate TEXT, activeVotes TEXT, votesFetchedAt REAL, replyAuthors TEXT, repliesFetchedAt REAL)'
+            )
+            self._connection.commit()
+
+        return self._connection
@@ -1,60 +1,184 @@
 import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set, Tuple
+
+
+class RegistryBackend(ABC):
+    @staticmethod
+    def fromSettings(settings: dict) -> 'RegistryBackend':
+        if settings['backend'] == 'sqlite':
+            return SqliteRegistryBackend(settings['path'], settings['legacyJsonPath'])
+
+        # 'path' names the database, the JSON backend keeps using the registry.json the sqlite backend migrates from.
+        return JsonFileRegistryBackend(settings['legacyJsonPath'])
+
+    @abstractmethod
+    def loadAll(self) -> dict:
+        pass
+
+    @abstractmethod
+    def saveChanges(self, realms: dict, changedKeys: Set[Tuple[str, str]]):
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonFileRegistryBackend(RegistryBackend):
+    _path: str
+
+    def __init__(self, path: str = 'registry.json'):
+        self._path = path
+
+    def loadAll(self) -> dict:
+        try:
+            with open(self._path, 'r') as f:
+                return json.load(f)
+
+        except FileNotFoundError:
+            return {}
+
+    def saveChanges(self, realms: dict, changedKeys: Set[Tuple[str, str]]):
+        # Write a sibling file and swap it in, so a crash leaves either the old or the new registry.
+        temporaryPath = '{path}.tmp'.format(path=self._path)
+        with open(temporaryPath, 'w') as f:
+            json.dump(realms, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temporaryPath, self._path)
+
+
+class SqliteRegistryBackend(RegistryBackend):
+    _path: str
+    _legacyJsonPath: Optional[str]
+    _connection: sqlite3.Connection
+    _migrationPending: bool
+
+    def __init__(self, path: str = 'registry.sqlite', legacyJsonPath: Optional[str] = 'registry.json'):
+        self._path = path
+        self._legacyJsonPath = legacyJsonPath
+        self._migrationPending = False
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS properties ('
+            'realm TEXT NOT NULL, propertyKey TEXT NOT NULL, propertyValue TEXT NOT NULL, PRIMARY KEY (realm, propertyKey))'
+        )
+        self._connection.commit()
+
+    def loadAll(self) -> dict:
+        realms = {}
+        for realm, propertyKey, propertyValue in self._connection.execute(
+                'SELECT realm, propertyKey, propertyValue FROM properties'):
+            if realm not in realms.keys():
+                realms[realm] = {}
+            realms[realm][propertyKey] = json.loads(propertyValue)
+
+        if len(realms) == 0 and self._legacyJsonPath is not None:
+            realms = JsonFileRegistryBackend(self._legacyJsonPath).loadAll()
+            self._migrationPending = len(realms) > 0
+
+        return realms
+
+    def saveChanges(self, realms: dict, changedKeys: Set[Tuple[str, str]]):
+        # The legacy registry is copied with the first write, so simulated runs and read-only workers never touch the store.
+        if self._migrationPending:
+            changedKeys = {(realm, propertyKey) for realm in realms.keys() for propertyKey in realms[realm].keys()}
+
+        rows = [
+            (realm, propertyKey, json.dumps(realms[realm][propertyKey]))
+            for realm, propertyKey in changedKeys
+        ]
+
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO properties (realm, propertyKey, propertyValue) VALUES (?, ?, ?) '
+                'ON CONFLICT(realm, propertyKey) DO UPDATE SET propertyValue = excluded.propertyValue',
+                rows
+            )
+        self._migrationPending = False
+
+    def close(self):
+        self._connection.close()
 
 
 class RegistryHandler:
     _realms: dict
-    _dirty: bool
+    _changedKeys: Set[Tuple[str, str]]
     _instance = None
     _simulate: bool
+    _backend: RegistryBackend
+    _lock: threading.RLock
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(RegistryHandler, cls).__new__(cls)
             cls._realms = {}
-            cls._dirty = False
+            cls._changedKeys = set()
+            cls._lock = threading.RLock()
+            cls._backend = JsonFileRegistryBackend()
             cls._tryLoad(cls._instance)
             cls._simulate = False
 
         return cls._instance
 
+    def configureBackend(self, backend: RegistryBackend):
+        # Properties changed before the switch survive and are written to the new backend on the next checkpoint.
+        with self._lock:
+            changes: Dict[Tuple[str, str], object] = {
+                (realm, propertyKey): self._realms[realm][propertyKey] for realm, propertyKey in self._changedKeys
+            }
+            self._backend.close()
+            self._backend = backend
+            self._realms = {}
+            self._tryLoad()
+
+            for (realm, propertyKey), propertyValue in changes.items():
+                self.setProperty(realm, propertyKey, propertyValue)
+
     def setSimulationMode(self, simulate: bool):
         self._simulate = simulate
 
     def setProperty(self, realm: str, propertyKey: str, propertyValue):
-        if realm not in self._realms.keys():
-            self._realms[realm] = {}
+        with self._lock:
+            if realm not in self._realms.keys():
+                self._realms[realm] = {}
 
-        self._realms[realm][propertyKey] = propertyValue
-        self._dirty = True
+            self._realms[realm][propertyKey] = propertyValue
+            self._changedKeys.add((realm, propertyKey))
 
     def getProperty(self, realm: str, propertyKey: str, defaultValue=None):
-        if realm not in self._realms.keys():
-            return defaultValue
+        with self._lock:
+            if realm not in self._realms.keys():
+                return defaultValue
 
-        return self._realms[realm][propertyKey]
+            return self._realms[realm].get(propertyKey, defaultValue)
 
     def _tryLoad(self):
-        data = None
+        data = self._backend.loadAll()
 
-        try:
-            with open('registry.json', 'r') as f:
-                data = json.load(f)
+        if data is not None:
+            self._realms = data
 
-        except FileNotFoundError:
+    def checkpoint(self):
+        if self._simulate:
             return
 
-        if data is not None:
-            self._realms = data
+        with self._lock:
+            if len(self._changedKeys) == 0:
+                return
+
+            self._backend.saveChanges(self._realms, self._changedKeys)
+            self._changedKeys = set()
 
     def saveAll(self):
         if self._simulate:
             print('Save:\n{registry}'.format(registry=self._realms))
             return
 
-        if not self._dirty:
-            return
-
-        self._dirty = False
-
-        with open('registry.json', 'w') as f:
-            json.dump(self._realms, f)
+        self.checkpoint()
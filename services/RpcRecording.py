@@ -0,0 +1,90 @@
+import json
+import threading
+from typing import Dict, List, Optional
+
+from services.HiveRpcBatcher import HiveRpcTransport
+
+
+class RpcRecorder:
+    _exchanges: List[dict]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._exchanges = []
+        self._lock = threading.Lock()
+
+    @property
+    def exchanges(self) -> List[dict]:
+        return self._exchanges
+
+    def record(self, method: str, params, result=None, error=None):
+        with self._lock:
+            self._exchanges.append({'method': method, 'params': params, 'result': result, 'error': error})
+
+    def instrumentBeemRpc(self, rpc):
+        # Captures the calls beem objects make themselves, next to the batched calls of the HiveHandler.
+        originalRpcexec = rpc.rpcexec
+
+        def recordingRpcexec(payload):
+            result = originalRpcexec(payload)
+            if isinstance(payload, dict):
+                self.record(payload.get('method'), payload.get('params'), json.loads(json.dumps(result, default=str)))
+            return result
+
+        rpc.rpcexec = recordingRpcexec
+
+    def save(self, path: str):
+        with self._lock:
+            with open(path, 'w') as f:
+                json.dump({'exchanges': self._exchanges}, f)
+
+
+class RecordingHiveRpcTransport(HiveRpcTransport):
+    _transport: HiveRpcTransport
+    _recorder: RpcRecorder
+
+    def __init__(self, transport: HiveRpcTransport, recorder: RpcRecorder):
+        self._transport = transport
+        self._recorder = recorder
+
+    def send(self, payload: list) -> list:
+        response = self._transport.send(payload)
+
+        responsesById = {entry.get('id'): entry for entry in response if isinstance(entry, dict)}
+        for call in payload:
+            entry = responsesById.get(call['id'], {})
+            self._recorder.record(call['method'], call['params'], entry.get('result'), entry.get('error'))
+
+        return response
+
+
+class ReplayHiveRpcTransport(HiveRpcTransport):
+    _responses: Dict[str, dict]
+
+    def __init__(self, exchanges: List[dict]):
+        # The newest recording of a call wins, like a node would answer with the latest state.
+        self._responses = {}
+        for exchange in exchanges:
+            self._responses[ReplayHiveRpcTransport._createKey(exchange['method'], exchange['params'])] = exchange
+
+    @staticmethod
+    def load(path: str) -> 'ReplayHiveRpcTransport':
+        with open(path, 'r') as f:
+            return ReplayHiveRpcTransport(json.load(f)['exchanges'])
+
+    def send(self, payload: list) -> list:
+        response = []
+        for call in payload:
+            exchange: Optional[dict] = self._responses.get(ReplayHiveRpcTransport._createKey(call['method'], call['params']))
+            if exchange is None:
+                response.append({'jsonrpc': '2.0', 'id': call['id'], 'error': {'code': -32000, 'message': 'Call was not recorded.'}})
+            elif exchange['error'] is not None:
+                response.append({'jsonrpc': '2.0', 'id': call['id'], 'error': exchange['error']})
+            else:
+                response.append({'jsonrpc': '2.0', 'id': call['id'], 'result': exchange['result']})
+
+        return response
+
+    @staticmethod
+    def _createKey(method: str, params) -> str:
+        return '{method}:{params}'.format(method=method, params=json.dumps(params, sort_keys=True))
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+
+class SeenSet:
+    _entries: OrderedDict
+    _capacity: int
+    _maxAgeInSeconds: Optional[float]
+    _clock: Callable[[], float]
+
+    def __init__(self, capacity: int, maxAgeInSeconds: Optional[float] = None, clock: Callable[[], float] = time.time):
+        self._entries = OrderedDict()
+        self._capacity = max(1, capacity)
+        self._maxAgeInSeconds = maxAgeInSeconds
+        self._clock = clock
+
+    @staticmethod
+    def fromList(entries: list, capacity: int, maxAgeInSeconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.time) -> 'SeenSet':
+        seenSet = SeenSet(capacity, maxAgeInSeconds, clock)
+        now = clock()
+        for entry in entries:
+            # Older registries stored plain keys without a timestamp.
+            if isinstance(entry, str):
+                seenSet._insert(entry, now)
+            else:
+                seenSet._insert(entry[0], entry[1])
+        seenSet._evict()
+
+        return seenSet
+
+    def __contains__(self, key: str) -> bool:
+        self._expire()
+        return key in self._entries
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._entries)
+
+    def add(self, key: str):
+        self._insert(key, self._clock())
+        self._evict()
+
+    def toList(self) -> list:
+        self._expire()
+        return [[key, seenAt] for key, seenAt in self._entries.items()]
+
+    def _insert(self, key: str, seenAt: float):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = seenAt
+
+    def _evict(self):
+        while len(self._entries) > self._capacity:
+            self._entries.popitem(last=False)
+        self._expire()
+
+    def _expire(self):
+        if self._maxAgeInSeconds is None:
+            return
+
+        oldestAllowed = self._clock() - self._maxAgeInSeconds
+        while len(self._entries) > 0:
+            key, seenAt = next(iter(self._entries.items()))
+            if seenAt >= oldestAllowed:
+                break
+            self._entries.popitem(last=False)
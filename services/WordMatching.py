@@ -0,0 +1,89 @@
+import re
+from collections import deque
+from typing import Dict, List, Set
+
+
+class AhoCorasickMatcher:
+    WHITESPACE_REGEX = re.compile(r'\s+')
+
+    _goto: List[Dict[str, int]]
+    _fail: List[int]
+    _outputs: List[List[int]]
+    _terms: List[str]
+    _termLengths: List[int]
+
+    def __init__(self, terms: List[str]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self._terms = []
+        self._termLengths = []
+
+        for term in terms:
+            normalizedTerm = self.normalize(term)
+            if len(normalizedTerm) == 0:
+                continue
+            self._terms.append(term)
+            self._termLengths.append(len(normalizedTerm))
+            self._addTerm(normalizedTerm, len(self._terms) - 1)
+
+        self._buildFailureLinks()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        # Phrases match across any run of whitespace, and matching is case insensitive.
+        return AhoCorasickMatcher.WHITESPACE_REGEX.sub(' ', text.lower()).strip()
+
+    def findTerms(self, text: str) -> List[str]:
+        text = self.normalize(text)
+        foundTerms: Set[int] = set()
+        state = 0
+
+        for position, character in enumerate(text):
+            while state != 0 and character not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(character, 0)
+
+            for termIndex in self._outputs[state]:
+                if termIndex in foundTerms:
+                    continue
+                if self._isWordBoundary(text, position - self._termLengths[termIndex] + 1, position + 1):
+                    foundTerms.add(termIndex)
+
+        return [self._terms[termIndex] for termIndex in sorted(foundTerms)]
+
+    def _addTerm(self, term: str, termIndex: int):
+        state = 0
+        for character in term:
+            if character not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][character] = len(self._goto) - 1
+            state = self._goto[state][character]
+
+        self._outputs[state].append(termIndex)
+
+    def _buildFailureLinks(self):
+        queue: deque = deque()
+        for character, nextState in self._goto[0].items():
+            queue.append(nextState)
+
+        while len(queue) > 0:
+            state = queue.popleft()
+            for character, nextState in self._goto[state].items():
+                queue.append(nextState)
+
+                failState = self._fail[state]
+                while failState != 0 and character not in self._goto[failState]:
+                    failState = self._fail[failState]
+                self._fail[nextState] = self._goto[failState].get(character, 0)
+
+                self._outputs[nextState] = self._outputs[nextState] + self._outputs[self._fail[nextState]]
+
+    @staticmethod
+    def _isWordBoundary(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end] if end < len(text) else ' '
+
+        return not (before.isalnum() or before == '_') and not (after.isalnum() or after == '_')
@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from services.AuthorStatistics import AuthorStatistics
+from services.Registry import RegistryHandler
+
+
+class HiveUsageRecorder:
+    # Stands in for beem Account and fails when one Hive instance is used by two threads at once.
+    def __init__(self):
+        self.busyHives = set()
+        self.usedHives = set()
+        self.sharedUse = False
+        self._lock = threading.Lock()
+
+    def createAccount(self, author: str, blockchain_instance):
+        recorder = self
+
+        class Account:
+            def blog_history(self):
+                with recorder._lock:
+                    recorder.sharedUse = recorder.sharedUse or blockchain_instance in recorder.busyHives
+                    recorder.busyHives.add(blockchain_instance)
+                    recorder.usedHives.add(blockchain_instance)
+                time.sleep(0.01)
+                with recorder._lock:
+                    recorder.busyHives.discard(blockchain_instance)
+                return []
+
+            def comment_history(self):
+                return []
+
+        return Account()
+
+
+class AuthorStatisticsTest(unittest.TestCase):
+    def setUp(self):
+        RegistryHandler().setSimulationMode(True)
+        self.recorder = HiveUsageRecorder()
+        self.createdHives = []
+        self.mainHive = object()
+
+    def tearDown(self):
+        RegistryHandler().setSimulationMode(False)
+
+    def _createHive(self):
+        hive = object()
+        self.createdHives.append(hive)
+        return hive
+
+    def test_prefetchWorkersNeverShareHiveInstance(self):
+        authorStatistics = AuthorStatistics(self.mainHive, self._createHive, 'hive-174695', 4)
+
+        with mock.patch('services.AuthorStatistics.Account', self.recorder.createAccount):
+            authorStatistics.prefetch(['author-{index}'.format(index=index) for index in range(20)])
+            authorStatistics.finishCycle()
+            authorStatistics.prefetch(['author-{index}'.format(index=index) for index in range(20)])
+
+        self.assertFalse(self.recorder.sharedUse)
+        self.assertEqual(4, len(self.createdHives))
+        self.assertNotIn(self.mainHive, self.recorder.usedHives)
+
+    def test_statisticsOutsidePrefetchUseMainHive(self):
+        authorStatistics = AuthorStatistics(self.mainHive, self._createHive, 'hive-174695', 4)
+
+        with mock.patch('services.AuthorStatistics.Account', self.recorder.createAccount):
+            statistics = authorStatistics.getStatistics('alice')
+
+        self.assertEqual(0, statistics['posts'])
+        self.assertEqual({self.mainHive}, self.recorder.usedHives)
+        self.assertEqual([], self.createdHives)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import time
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from services.Discord import DiscordMessage
+from services.DiscordDelivery import DiscordDeliveryEngine, DiscordDeliveryError, DiscordSender, RestDiscordSender, \
+    WebhookDiscordSender
+
+
+class RecordingDiscordSender(DiscordSender):
+    def __init__(self, failingChannelIds=()):
+        self.sent = []
+        self.failingChannelIds = set(failingChannelIds)
+
+    async def send(self, channelId: int, content: str):
+        if channelId in self.failingChannelIds:
+            raise DiscordDeliveryError('Channel {channelId} is down.'.format(channelId=channelId))
+
+        self.sent.append((channelId, content))
+
+
+class DiscordApiStub:
+    # Answers like the Discord message route and records when each request arrived.
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append((time.monotonic(), request.path, request.headers.get('Authorization'), body['content']))
+        if len(self.responses) > 0:
+            status, payload, headers = self.responses.pop(0)
+            return web.json_response(payload, status=status, headers=headers)
+
+        return web.json_response({'id': str(len(self.requests))})
+
+
+class DiscordDeliveryEngineTest(unittest.IsolatedAsyncioTestCase):
+    def test_coalescesConsecutiveMessagesPerChannel(self):
+        contentsByChannel = DiscordDeliveryEngine.coalesce([
+            DiscordMessage('first', 1), DiscordMessage('other', 2), DiscordMessage('second', 1)
+        ])
+
+        self.assertEqual({1: ['first\nsecond'], 2: ['other']}, contentsByChannel)
+
+    def test_splitsOversizedMessagesAtLineBreaks(self):
+        contentsByChannel = DiscordDeliveryEngine.coalesce([DiscordMessage('a' * 6 + '\n' + 'b' * 6, 1), DiscordMessage('c', 1)], 10)
+
+        self.assertEqual({1: ['aaaaaa', 'bbbbbb\nc']}, contentsByChannel)
+
+    async def test_returnsOnlyUndeliveredMessagesOfFailedChannels(self):
+        sender = RecordingDiscordSender(failingChannelIds=[2])
+
+        undelivered = await DiscordDeliveryEngine(sender).deliver([DiscordMessage('first', 1), DiscordMessage('other', 2)])
+
+        self.assertEqual([(1, 'first')], sender.sent)
+        self.assertEqual([(2, 'other')], undelivered)
+
+
+class RestDiscordSenderTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.api = DiscordApiStub()
+        application = web.Application()
+        application.router.add_post('/api/channels/{channelId}/messages', self.api.handle)
+        application.router.add_post('/webhooks/1/token', self.api.handle)
+        self.server = TestServer(application)
+        await self.server.start_server()
+        self.sender = RestDiscordSender('secret', str(self.server.make_url('/api')))
+        await self.sender.open()
+
+    async def asyncTearDown(self):
+        await self.sender.close()
+        await self.server.close()
+
+    async def test_sendsWithBotToken(self):
+        await self.sender.send(7, 'hello')
+
+        self.assertEqual([('/api/channels/7/messages', 'Bot secret', 'hello')], [request[1:] for request in self.api.requests])
+
+    async def test_retriesAfterRateLimitResponse(self):
+        self.api.responses.append((429, {'retry_after': 0.2, 'global': False}, {}))
+
+        await self.sender.send(7, 'hello')
+
+        self.assertEqual(2, len(self.api.requests))
+        self.assertGreaterEqual(self.api.requests[1][0] - self.api.requests[0][0], 0.2)
+
+    async def test_waitsForEmptyRouteBucket(self):
+        self.api.responses.append((200, {'id': '1'}, {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '0.2'}))
+
+        await self.sender.send(7, 'first')
+        await self.sender.send(8, 'other channel')
+        await self.sender.send(7, 'second')
+
+        # Only the exhausted channel waits, the other one is sent right away.
+        self.assertLess(self.api.requests[1][0] - self.api.requests[0][0], 0.2)
+        self.assertGreaterEqual(self.api.requests[2][0] - self.api.requests[0][0], 0.2)
+
+    async def test_globalRateLimitHoldsAllChannels(self):
+        self.api.responses.append((429, {'retry_after': 0.2, 'global': True}, {}))
+
+        await self.sender.send(7, 'first')
+        await self.sender.send(8, 'other channel')
+
+        self.assertGreaterEqual(self.api.requests[2][0] - self.api.requests[0][0], 0.2)
+
+    async def test_rejectedMessagesRaise(self):
+        self.api.responses.append((403, {'message': 'Missing Access'}, {}))
+
+        with self.assertRaises(DiscordDeliveryError):
+            await self.sender.send(7, 'hello')
+
+    async def test_webhookSenderPostsWithoutBotToken(self):
+        sender = WebhookDiscordSender({1: str(self.server.make_url('/webhooks/1/token'))})
+        await sender.open()
+        try:
+            await sender.send(1, 'hello')
+        finally:
+            await sender.close()
+
+        self.assertEqual([('/webhooks/1/token', None, 'hello')], [request[1:] for request in self.api.requests])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import unittest
+
+from services.HiveBlockStream import HiveBlockStream
+from services.HiveRpcBatcher import HiveRpcBatcher
+from services.RpcRecording import ReplayHiveRpcTransport
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'fixtures', 'hiveBlockStream.json')
+
+# Blocks 990 to 1000 of the fixture start at 2022-01-01T00:00:00, alice posts in block 991 and dave in block 996.
+ALICE_POSTED_AT = 1640995203
+DAVE_POSTED_AT = 1640995218
+MINIMUM_AGE_IN_SECONDS = 30
+
+
+class HiveBlockStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.blockStream = self._createBlockStream()
+
+    def _createBlockStream(self) -> HiveBlockStream:
+        return HiveBlockStream(
+            HiveRpcBatcher(ReplayHiveRpcTransport.load(FIXTURE_PATH)),
+            'hive-174695',
+            MINIMUM_AGE_IN_SECONDS,
+            blocksPerRequest=5,
+            clock=lambda: self.now
+        )
+
+    def test_readsFromMinimumAgeBeforeLastIrreversibleBlock(self):
+        self.now = ALICE_POSTED_AT
+
+        self.assertEqual([], self.blockStream.poll())
+        self.assertEqual(1001, self.blockStream.nextBlockNum)
+
+    def test_schedulesOnlyRootPostsOfTheCommunityOnce(self):
+        self.blockStream.readNewBlocks()
+
+        # The reply, the other community and the edit of alice's post are not scheduled.
+        self.assertEqual(2, self.blockStream.scheduledPostsCount)
+
+    def test_postsBecomeDueAtMinimumAge(self):
+        self.now = ALICE_POSTED_AT + MINIMUM_AGE_IN_SECONDS - 1
+        self.assertEqual([], self.blockStream.poll())
+
+        self.now = ALICE_POSTED_AT + MINIMUM_AGE_IN_SECONDS
+        self.assertEqual([('alice', 'collage-1')], self.blockStream.popDuePosts())
+
+        self.now = DAVE_POSTED_AT + MINIMUM_AGE_IN_SECONDS
+        self.assertEqual([('dave', 'lil-2')], self.blockStream.popDuePosts())
+        self.assertEqual(0, self.blockStream.scheduledPostsCount)
+
+    def test_retriedPostsAreDueOnNextPoll(self):
+        self.blockStream.readNewBlocks()
+        self.now = DAVE_POSTED_AT + MINIMUM_AGE_IN_SECONDS
+        duePosts = self.blockStream.popDuePosts()
+
+        self.blockStream.retryPosts(duePosts)
+
+        self.assertEqual(duePosts, self.blockStream.popDuePosts())
+
+    def test_stateSurvivesRestart(self):
+        self.blockStream.readNewBlocks()
+        state = self.blockStream.exportState()
+
+        restoredBlockStream = self._createBlockStream()
+        restoredBlockStream.restoreState(state)
+        self.now = DAVE_POSTED_AT + MINIMUM_AGE_IN_SECONDS
+
+        self.assertEqual(1001, restoredBlockStream.nextBlockNum)
+        self.assertEqual([('alice', 'collage-1'), ('dave', 'lil-2')], restoredBlockStream.popDuePosts())
+
+    def test_readCommunityPostsReturnsFirstSightings(self):
+        sightings = self.blockStream.readCommunityPosts(990, 1000)
+
+        self.assertEqual([(ALICE_POSTED_AT, 'alice', 'collage-1'), (DAVE_POSTED_AT, 'dave', 'lil-2')], sightings)
+        self.assertEqual(0, self.blockStream.scheduledPostsCount)
+
+
+if __name__ == '__main__':
+    unittest.main()
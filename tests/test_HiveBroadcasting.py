@@ -0,0 +1,48 @@
+import unittest
+
+from services.HiveBroadcasting import HiveBroadcaster, TokenBucket, VirtualClock
+from services.HiveNetwork import QueuedHiveMessage, QueuedPostToMute
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_waitsForNextToken(self):
+        clock = VirtualClock()
+        bucket = TokenBucket(1 / 3.0, clock=clock.time, sleep=clock.sleep)
+
+        self.assertEqual(0.0, bucket.acquire())
+        self.assertAlmostEqual(3.0, bucket.acquire())
+        self.assertAlmostEqual(3.0, clock.time())
+
+
+class HiveBroadcasterTest(unittest.TestCase):
+    def test_simulatedBroadcastPacesLanesIndependently(self):
+        broadcaster = HiveBroadcaster(None, 'lilybee', 'hive-174695', True, 3.0, 3.0, 5)
+        broadcastOperations = []
+
+        with self.assertLogs('HiveBroadcasting', 'INFO') as logs:
+            statistics = broadcaster.broadcast(
+                [QueuedHiveMessage('collage-{index}'.format(index=index), 'alice', 'Please add @lmac.') for index in range(3)],
+                [QueuedPostToMute('bob', 'spam-{index}'.format(index=index), 'spam') for index in range(7)],
+                lambda operation, succeeded: broadcastOperations.append(succeeded)
+            )
+
+        # Three comments need two waits, seven mutes fit into two transactions.
+        self.assertEqual(10, statistics.operations)
+        self.assertEqual(5, statistics.transactions)
+        self.assertEqual(0, statistics.failures)
+        self.assertAlmostEqual(6.0, statistics.durationInSeconds)
+        self.assertEqual([True] * 10, broadcastOperations)
+        self.assertIn('Please add @lmac.', '\n'.join(logs.output))
+        self.assertIn('Mute hive post: bob/spam-6', '\n'.join(logs.output))
+
+    def test_replyOperationTargetsParentWithoutFetchingIt(self):
+        operation = HiveBroadcaster(None, 'lilybee', 'hive-174695', True).createReplyOperation('alice', 'collage-1', 'Please add @lmac.').json()
+
+        self.assertEqual('alice', operation['parent_author'])
+        self.assertEqual('collage-1', operation['parent_permlink'])
+        self.assertEqual('lilybee', operation['author'])
+        self.assertEqual('Please add @lmac.', operation['body'])
+
+
+if __name__ == '__main__':
+    unittest.main()
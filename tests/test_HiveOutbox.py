@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from services.HiveOutbox import HiveOutbox, HiveOutboxEntry
+
+
+class HiveOutboxTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'outbox.jsonl')
+        self.now = 1000.0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _openOutbox(self) -> HiveOutbox:
+        return HiveOutbox(self.path, lambda: self.now)
+
+    def _readRecords(self) -> list:
+        with open(self.path, 'r') as f:
+            return [json.loads(line) for line in f]
+
+    def test_enqueueIsIdempotent(self):
+        outbox = self._openOutbox()
+
+        self.assertTrue(outbox.enqueue(HiveOutboxEntry.COMMENT, 'alice', 'collage-1', 'lmac', 'Please add @lmac.'))
+        self.assertFalse(outbox.enqueue(HiveOutboxEntry.COMMENT, 'alice', 'collage-1', 'lmac', 'Please add @lmac.'))
+        self.assertEqual(1, outbox.openEntriesCount)
+
+    def test_completedEntriesAreNotEnqueuedAgainAfterRestart(self):
+        outbox = self._openOutbox()
+        outbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'collage-1', '', 'spam')
+        outbox.markDone(outbox.takeDueEntries()[0].key)
+
+        restartedOutbox = self._openOutbox()
+
+        self.assertFalse(restartedOutbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'collage-1', '', 'spam'))
+        self.assertEqual(0, restartedOutbox.openEntriesCount)
+
+    def test_interruptedEntriesAreReplayedAsPreviouslyAttempted(self):
+        outbox = self._openOutbox()
+        outbox.enqueue(HiveOutboxEntry.COMMENT, 'alice', 'collage-1', 'lmac', 'Please add @lmac.')
+        outbox.enqueue(HiveOutboxEntry.COMMENT, 'bob', 'lil-2', 'lil', 'Please add the LIL table.')
+        firstEntry, secondEntry = outbox.takeDueEntries()
+        outbox.markDone(secondEntry.key)
+        self.assertFalse(firstEntry.previouslyAttempted)
+
+        # The process dies while the first entry is being broadcast.
+        restartedOutbox = self._openOutbox()
+        entries = restartedOutbox.takeDueEntries()
+
+        self.assertEqual([firstEntry.key], [entry.key for entry in entries])
+        self.assertEqual(1, entries[0].attempts)
+        self.assertTrue(entries[0].previouslyAttempted)
+
+    def test_failedEntriesBackOffAndAreGivenUp(self):
+        outbox = self._openOutbox()
+        outbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'collage-1', '', 'spam')
+
+        entry = outbox.takeDueEntries()[0]
+        outbox.markFailed(entry.key)
+        self.assertEqual([], outbox.takeDueEntries())
+
+        self.now += HiveOutbox.BASE_RETRY_DELAY_IN_SECONDS
+        self.assertTrue(outbox.takeDueEntries()[0].previouslyAttempted)
+
+        for attempt in range(2, HiveOutbox.MAX_ATTEMPTS):
+            outbox.markFailed(entry.key)
+            self.now += HiveOutbox.MAX_RETRY_DELAY_IN_SECONDS
+            outbox.takeDueEntries()
+        outbox.markFailed(entry.key)
+
+        self.assertEqual(0, outbox.openEntriesCount)
+        self.assertEqual(0, self._openOutbox().openEntriesCount)
+
+    def test_releasedEntriesArePendingAfterRestart(self):
+        outbox = self._openOutbox()
+        outbox.enqueue(HiveOutboxEntry.COMMENT, 'alice', 'collage-1', 'lmac', 'Please add @lmac.')
+        outbox.release(outbox.takeDueEntries()[0].key)
+
+        entries = self._openOutbox().takeDueEntries()
+
+        self.assertEqual(1, len(entries))
+        self.assertEqual(HiveOutboxEntry.INFLIGHT, entries[0].state)
+        self.assertTrue(entries[0].previouslyAttempted)
+
+    def test_halfWrittenLastRecordIsSkipped(self):
+        outbox = self._openOutbox()
+        outbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'collage-1', '', 'spam')
+        with open(self.path, 'a') as f:
+            f.write('{"op": "enqueue", "entry": {"kind"')
+
+        self.assertEqual(1, self._openOutbox().openEntriesCount)
+
+    def test_compactionKeepsOpenEntriesAndCompletedKeys(self):
+        outbox = self._openOutbox()
+        outbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'collage-1', '', 'spam')
+        outbox.enqueue(HiveOutboxEntry.MUTE, 'bob', 'lil-2', '', 'spam')
+        doneEntry, failedEntry = outbox.takeDueEntries()
+        outbox.markDone(doneEntry.key)
+        outbox.markFailed(failedEntry.key)
+
+        outbox.compact()
+
+        self.assertEqual(['done', 'enqueue'], [record['op'] for record in self._readRecords()])
+        restartedOutbox = self._openOutbox()
+        self.assertEqual(1, restartedOutbox.openEntriesCount)
+        self.assertFalse(restartedOutbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'collage-1', '', 'spam'))
+
+    def test_journalIsCompactedAfterThreshold(self):
+        with mock.patch.object(HiveOutbox, 'COMPACTION_THRESHOLD_IN_RECORDS', 4):
+            outbox = self._openOutbox()
+            for index in range(3):
+                outbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'post-{index}'.format(index=index), '', 'spam')
+            for entry in outbox.takeDueEntries():
+                outbox.markDone(entry.key)
+
+        # Nine records were written, the compacted journal still replays to the same state.
+        self.assertLess(len(self._readRecords()), 9)
+        restartedOutbox = self._openOutbox()
+        self.assertEqual(0, restartedOutbox.openEntriesCount)
+        self.assertFalse(restartedOutbox.enqueue(HiveOutboxEntry.MUTE, 'alice', 'post-0', '', 'spam'))
+
+
+if __name__ == '__main__':
+    unittest.main()
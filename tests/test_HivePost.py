@@ -0,0 +1,73 @@
+import json
+import unittest
+
+from services.HiveNetwork import HivePost
+
+POST_JSON = {
+    'author': 'alice',
+    'permlink': 'collage-1',
+    'category': 'hive-174695',
+    'title': 'My collage',
+    'body': 'Sources: https://pixabay.com/photos/1/',
+    'json_metadata': json.dumps({'tags': ['LetsMakeACollage', 'art'], 'app': 'peakd/2022.01.1'}),
+    'beneficiaries': [{'account': 'lmac', 'weight': 2000}, {'account': 'lilybee', 'weight': 200}],
+    'created': '2022-01-01T00:00:03',
+    'last_update': '2022-01-01T01:00:00',
+    'cashout_time': '2022-01-08T12:00:00',
+    'stats': {'is_pinned': False}
+}
+
+
+class HivePostTest(unittest.TestCase):
+    def test_fromJsonReadsPostFields(self):
+        post = HivePost.fromJson(POST_JSON)
+
+        self.assertEqual('alice/collage-1', post.authorperm)
+        self.assertEqual('hive-174695', post.category)
+        self.assertEqual('My collage', post.title)
+        self.assertEqual(('letsmakeacollage', 'art'), post.tags)
+        self.assertEqual({'lmac': 2000, 'lilybee': 200}, dict(post.beneficiaries))
+        self.assertEqual(1640995203, post.createdTimestamp)
+        self.assertEqual(1641643200, post.cashoutTimestamp)
+        self.assertEqual('2022-01-01T01:00:00', post.lastUpdate)
+        self.assertFalse(post.isPinned)
+
+    def test_fromJsonToleratesBrokenMetadata(self):
+        post = HivePost.fromJson(dict(POST_JSON, json_metadata='{"tags": [', beneficiaries=[]))
+
+        self.assertEqual((), post.tags)
+        self.assertEqual({}, dict(post.beneficiaries))
+
+    def test_fromJsonReadsBridgeMetadata(self):
+        post = HivePost.fromJson(dict(POST_JSON, json_metadata={'tags': 'not a list'}, stats={'is_pinned': True}))
+
+        self.assertEqual((), post.tags)
+        self.assertTrue(post.isPinned)
+
+    def test_paidOutPostsCashOutSevenDaysAfterCreation(self):
+        post = HivePost.fromJson(dict(POST_JSON, cashout_time='1969-12-31T23:59:59'))
+
+        self.assertEqual(post.createdTimestamp + HivePost.PAYOUT_WINDOW_IN_SECONDS, post.cashoutTimestamp)
+
+    def test_postIsOnlyEnrichedWithPrefetchedData(self):
+        post = HivePost.fromJson(POST_JSON)
+        enrichedPost = post.withPrefetchedData([{'voter': 'bob', 'rshares': -5}], ['lilybee'])
+
+        self.assertFalse(post.isEnriched)
+        self.assertEqual({}, dict(post.votes))
+        self.assertTrue(enrichedPost.isEnriched)
+        self.assertEqual({'bob': -5}, dict(enrichedPost.votes))
+        self.assertEqual(('lilybee',), enrichedPost.replyAuthors)
+        self.assertEqual(post.bodyDigest, enrichedPost.bodyDigest)
+
+    def test_postIsImmutable(self):
+        post = HivePost.fromJson(POST_JSON)
+
+        with self.assertRaises(AttributeError):
+            post.title = 'Changed'
+        with self.assertRaises(TypeError):
+            post.beneficiaries['lmac'] = 10000
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from services.HiveRpcBatcher import HiveRpcBatcher, HiveRpcError, HiveRpcTransport, HttpHiveRpcTransport
+
+
+class StubHiveRpcTransport(HiveRpcTransport):
+    # Answers every request with its params unless a response is scripted for the method.
+    def __init__(self, responsesByMethod=None, error=None):
+        self.payloads = []
+        self.responsesByMethod = responsesByMethod or {}
+        self.error = error
+        self._lock = threading.Lock()
+
+    def send(self, payload: list) -> list:
+        with self._lock:
+            self.payloads.append(payload)
+        if self.error is not None:
+            raise self.error
+
+        responses = []
+        for request in reversed(payload):
+            response = self.responsesByMethod.get(request['method'], {'result': request['params']})
+            if response is not None:
+                responses.append(dict(response, jsonrpc='2.0', id=request['id']))
+
+        return responses
+
+
+class HiveRpcStubHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])).decode('utf-8'))
+        HiveRpcStubHandler.requests.append((self.headers['Content-Type'], payload))
+        body = json.dumps([{'jsonrpc': '2.0', 'id': request['id'], 'result': request['method']} for request in payload]).encode('utf-8')
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class HiveRpcBatcherTest(unittest.TestCase):
+    def test_splitsQueuedCallsIntoBatches(self):
+        transport = StubHiveRpcTransport()
+        batcher = HiveRpcBatcher(transport, 2)
+        calls = [batcher.queueActiveVotes('alice', 'collage-{index}'.format(index=index)) for index in range(5)]
+
+        batcher.flush()
+
+        self.assertEqual([2, 2, 1], [len(payload) for payload in transport.payloads])
+        self.assertEqual([['alice', 'collage-{index}'.format(index=index)] for index in range(5)], [call.result for call in calls])
+
+    def test_mapsOutOfOrderResponsesById(self):
+        transport = StubHiveRpcTransport()
+        batcher = HiveRpcBatcher(transport)
+        discussionCall = batcher.queueDiscussion('alice', 'collage-1')
+        repliesCall = batcher.queueContentReplies('bob', 'lil-2')
+
+        batcher.flush()
+
+        self.assertEqual({'author': 'alice', 'permlink': 'collage-1'}, discussionCall.result)
+        self.assertEqual(['bob', 'lil-2'], repliesCall.result)
+        self.assertEqual(
+            ['bridge.get_discussion', 'condenser_api.get_content_replies'],
+            [request['method'] for request in transport.payloads[0]]
+        )
+
+    def test_missingAndErrorResponsesOnlyFailTheirCalls(self):
+        transport = StubHiveRpcTransport({
+            'condenser_api.get_content_replies': None,
+            'bridge.get_discussion': {'error': {'code': -32602, 'message': 'Post not found.'}}
+        })
+        batcher = HiveRpcBatcher(transport)
+        votesCall = batcher.queueActiveVotes('alice', 'collage-1')
+        repliesCall = batcher.queueContentReplies('alice', 'collage-1')
+        discussionCall = batcher.queueDiscussion('alice', 'collage-1')
+
+        batcher.flush()
+
+        self.assertFalse(votesCall.failed)
+        self.assertEqual('No response received.', repliesCall.error)
+        self.assertTrue(discussionCall.failed)
+        self.assertEqual({'code': -32602, 'message': 'Post not found.'}, json.loads(discussionCall.error))
+        with self.assertRaises(HiveRpcError):
+            discussionCall.result
+
+    def test_transportErrorRejectsWholeBatch(self):
+        batcher = HiveRpcBatcher(StubHiveRpcTransport(error=OSError('Connection reset.')))
+        calls = [batcher.queueActiveVotes('alice', 'collage-1'), batcher.queueContentReplies('alice', 'collage-1')]
+
+        batcher.flush()
+
+        self.assertEqual(['Connection reset.'] * 2, [call.error for call in calls])
+
+    def test_unsentCallHasNoResult(self):
+        call = HiveRpcBatcher(StubHiveRpcTransport()).queueActiveVotes('alice', 'collage-1')
+
+        self.assertFalse(call.done)
+        with self.assertRaises(HiveRpcError):
+            call.result
+
+    def test_callAcceptsSingleResponseObject(self):
+        class SingleResponseTransport(HiveRpcTransport):
+            def send(self, payload: list) -> dict:
+                return {'jsonrpc': '2.0', 'id': payload[0]['id'], 'result': 42}
+
+        self.assertEqual(42, HiveRpcBatcher(SingleResponseTransport()).call('condenser_api.get_dynamic_global_properties', []))
+
+    def test_flushSendsBatchesThroughExecutor(self):
+        transport = StubHiveRpcTransport()
+        batcher = HiveRpcBatcher(transport, 3)
+        calls = [batcher.queueActiveVotes('alice', 'collage-{index}'.format(index=index)) for index in range(10)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            batcher.flush(executor)
+
+        self.assertEqual(10, sum(len(payload) for payload in transport.payloads))
+        self.assertTrue(all(call.done and not call.failed for call in calls))
+
+    def test_flushWithoutQueuedCallsSendsNothing(self):
+        transport = StubHiveRpcTransport()
+
+        HiveRpcBatcher(transport).flush()
+
+        self.assertEqual([], transport.payloads)
+
+
+class HttpHiveRpcTransportTest(unittest.TestCase):
+    def setUp(self):
+        HiveRpcStubHandler.requests = []
+        self.server = HTTPServer(('127.0.0.1', 0), HiveRpcStubHandler)
+        self.serverThread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.serverThread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.serverThread.join()
+
+    def test_postsBatchAsSingleJsonRequest(self):
+        transport = HttpHiveRpcTransport('http://127.0.0.1:{port}'.format(port=self.server.server_port), 5.0)
+        batcher = HiveRpcBatcher(transport)
+        votesCall = batcher.queueActiveVotes('alice', 'collage-1')
+        discussionCall = batcher.queueDiscussion('alice', 'collage-1')
+
+        batcher.flush()
+
+        self.assertEqual(1, len(HiveRpcStubHandler.requests))
+        contentType, payload = HiveRpcStubHandler.requests[0]
+        self.assertEqual('application/json', contentType)
+        self.assertEqual([votesCall.toJsonRpc(), discussionCall.toJsonRpc()], payload)
+        self.assertEqual('condenser_api.get_active_votes', votesCall.result)
+        self.assertEqual('bridge.get_discussion', discussionCall.result)
+
+    def test_unreachableNodeFailsCalls(self):
+        url = 'http://127.0.0.1:{port}'.format(port=self.server.server_port)
+        self.tearDown()
+        self.server = HTTPServer(('127.0.0.1', 0), HiveRpcStubHandler)
+        self.serverThread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.serverThread.start()
+        batcher = HiveRpcBatcher(HttpHiveRpcTransport(url, 5.0))
+        call = batcher.queueActiveVotes('alice', 'collage-1')
+
+        batcher.flush()
+
+        self.assertTrue(call.failed)
+        self.assertEqual([], HiveRpcStubHandler.requests)
+
+
+if __name__ == '__main__':
+    unittest.main()
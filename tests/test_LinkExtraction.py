@@ -0,0 +1,81 @@
+import json
+import unittest
+
+from monitoringSystem.agents.ContestLinkAgent import ContestLinkAgent
+from monitoringSystem.agents.LILBeneficiaryAgent import LILBeneficiaryAgent
+from services.HiveNetwork import HivePost
+from services.HiveTools import HivePostAnalysis
+from services.LinkExtraction import HiveLinkExtractor
+
+CONTEST_POST_JSON = {
+    'author': 'alice',
+    'permlink': 'collage-1',
+    'category': 'hive-174695',
+    'title': 'My collage',
+    'body': '',
+    'json_metadata': json.dumps({'tags': ['LetsMakeACollage', 'art']}),
+    'beneficiaries': [{'account': 'lmac', 'weight': 2000}],
+    'created': '2022-01-01T00:00:03',
+    'last_update': '2022-01-01T00:00:03',
+    'cashout_time': '2022-01-08T00:00:03',
+    'stats': {'is_pinned': False}
+}
+
+
+def createContestPostAnalysis(body: str) -> HivePostAnalysis:
+    return HivePostAnalysis(HivePost.fromJson(dict(CONTEST_POST_JSON, body=body)))
+
+
+class HiveLinkExtractorTest(unittest.TestCase):
+    def test_extractsUrlsImageSourcesAndReferences(self):
+        links = HiveLinkExtractor.extract(
+            'See (https://peakd.com/hive-174695/@lmac/round-1). ![collage](https://images.hive.blog/collage.png) and /@bob/lil-2'
+        )
+
+        self.assertEqual(['https://peakd.com/hive-174695/@lmac/round-1', 'https://images.hive.blog/collage.png'], links.urls)
+        self.assertEqual(['https://images.hive.blog/collage.png'], links.imageSources)
+        self.assertEqual([('lmac', 'round-1'), ('bob', 'lil-2')], links.hiveReferences)
+
+    def test_profileLinksReferenceTheirAuthor(self):
+        links = HiveLinkExtractor.extract('Join https://peakd.com/@lmac/ or ecency.com/@shaka/ today.')
+
+        self.assertEqual([('lmac', ''), ('shaka', '')], links.hiveReferences)
+
+
+class ContestLinkAgentTest(unittest.TestCase):
+    def setUp(self):
+        self.agent = ContestLinkAgent()
+        self.agent.onSetupRules({'moderators': ['lmac', 'shaka'], 'mandatoryContestHashtag': '#lmac'})
+
+    def test_contestPostLinkingRoundIsAccepted(self):
+        analysis = createContestPostAnalysis('My entry for https://peakd.com/hive-174695/@lmac/round-1')
+
+        self.assertEqual((None, None), self.agent.onSuspicionQuery(analysis.post, analysis))
+
+    def test_contestPostLinkingModeratorProfileIsAccepted(self):
+        for body in ['Thanks to https://peakd.com/@lmac/', 'Thanks to ecency.com/@shaka/']:
+            analysis = createContestPostAnalysis(body)
+
+            self.assertEqual((None, None), self.agent.onSuspicionQuery(analysis.post, analysis))
+
+    def test_contestPostWithoutLinkIsReported(self):
+        analysis = createContestPostAnalysis('My entry, see https://peakd.com/@bob/lil-2')
+
+        report, action = self.agent.onSuspicionQuery(analysis.post, analysis)
+
+        self.assertEqual('Contest link not found.', report.description)
+
+
+class LILBeneficiaryAgentTest(unittest.TestCase):
+    def test_proxiedLilImageRequiresBeneficiary(self):
+        analysis = createContestPostAnalysis(
+            '![lil](https://images.hive.blog/0x0/https://lmac.gallery/lil-gallery-image/1234.png)'
+        )
+
+        report, action = LILBeneficiaryAgent().onSuspicionQuery(analysis.post, analysis)
+
+        self.assertIn('https://lmac.gallery/lil-gallery-image/1234', report.description)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from services.PostCache import PostCache
+
+VOLATILE_TTL_IN_SECONDS = 1800
+CASHOUT_TIMESTAMP = 10 ** 6
+
+
+class PostCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        self.postCache = PostCache()
+        self.postCache.open(':memory:', VOLATILE_TTL_IN_SECONDS)
+        self.postCache._clock = lambda: self.now
+
+    def tearDown(self):
+        self.postCache.close()
+        del self.postCache._clock
+
+    def test_votesAndRepliesAreFreshWithinTtl(self):
+        self.postCache.store('alice/collage-1', '2022-01-01T00:00:00', [{'voter': 'bob', 'rshares': 5}], ['carol'])
+        self.now += VOLATILE_TTL_IN_SECONDS - 1
+
+        entry = self.postCache.lookup('alice/collage-1', '2022-01-01T00:00:00', CASHOUT_TIMESTAMP)
+
+        self.assertEqual([{'voter': 'bob', 'rshares': 5}], entry.activeVotes)
+        self.assertEqual(['carol'], entry.replyAuthors)
+
+    def test_repliesOnlyWriteDoesNotRefreshVotes(self):
+        self.postCache.store('alice/collage-1', '2022-01-01T00:00:00', [{'voter': 'bob', 'rshares': 5}], ['carol'])
+        self.now += VOLATILE_TTL_IN_SECONDS
+        self.postCache.store('alice/collage-1', '2022-01-01T00:00:00', replyAuthors=['carol', 'dave'])
+
+        entry = self.postCache.lookup('alice/collage-1', '2022-01-01T00:00:00', CASHOUT_TIMESTAMP)
+
+        self.assertIsNone(entry.activeVotes)
+        self.assertEqual(['carol', 'dave'], entry.replyAuthors)
+
+    def test_dataFetchedAfterPayoutStaysFinal(self):
+        self.now = CASHOUT_TIMESTAMP + 1
+        self.postCache.store('alice/collage-1', '2022-01-01T00:00:00', [], ['carol'])
+        self.now += 30 * 86400
+
+        entry = self.postCache.lookup('alice/collage-1', '2022-01-01T00:00:00', CASHOUT_TIMESTAMP)
+
+        self.assertEqual([], entry.activeVotes)
+        self.assertTrue(entry.isVolatileDataFinal)
+
+    def test_editedPostIsInvalidated(self):
+        self.postCache.store('alice/collage-1', '2022-01-01T00:00:00', [], ['carol'])
+
+        self.assertIsNone(self.postCache.lookup('alice/collage-1', '2022-01-02T00:00:00', CASHOUT_TIMESTAMP))
+        self.assertEqual([], self.postCache.lookupReplyAuthorsIgnoringAge('alice/collage-1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
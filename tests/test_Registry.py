@@ -0,0 +1,55 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from services.Registry import SqliteRegistryBackend
+
+
+class SqliteRegistryBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'registry.sqlite')
+        self.legacyJsonPath = os.path.join(self.directory.name, 'registry.json')
+        with open(self.legacyJsonPath, 'w') as f:
+            json.dump({'TagScan': {'cursor': 'alice/collage-1'}, 'AuthorStatistics': {'authors': {}}}, f)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _readRows(self) -> list:
+        connection = sqlite3.connect(self.path)
+        try:
+            return sorted(connection.execute('SELECT realm, propertyKey, propertyValue FROM properties'))
+        finally:
+            connection.close()
+
+    def test_loadingLegacyRegistryDoesNotWrite(self):
+        backend = SqliteRegistryBackend(self.path, self.legacyJsonPath)
+
+        realms = backend.loadAll()
+        backend.close()
+
+        self.assertEqual('alice/collage-1', realms['TagScan']['cursor'])
+        self.assertEqual([], self._readRows())
+
+    def test_firstWriteMigratesLegacyRegistry(self):
+        backend = SqliteRegistryBackend(self.path, self.legacyJsonPath)
+        realms = backend.loadAll()
+        realms['TagScan']['cursor'] = 'bob/lil-2'
+
+        backend.saveChanges(realms, {('TagScan', 'cursor')})
+        backend.close()
+
+        self.assertEqual([
+            ('AuthorStatistics', 'authors', '{}'),
+            ('TagScan', 'cursor', '"bob/lil-2"')
+        ], self._readRows())
+        reopenedBackend = SqliteRegistryBackend(self.path, None)
+        self.assertEqual('bob/lil-2', reopenedBackend.loadAll()['TagScan']['cursor'])
+        reopenedBackend.close()
+
+
+if __name__ == '__main__':
+    unittest.main()